@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the metadata CLIs.
+
+Shell loops call list_channel.py, fetch_youtube.py and claude_extract.py
+thousands of times, and many of those calls do no real work: --help, an
+argument error, or a rerun with nothing left to fetch or extract. yt-dlp and
+the Anthropic SDK are imported only when a run needs them; this benchmark
+guards that. For each script and cheap path it:
+
+- runs the script under ``python -X importtime`` and fails if yt_dlp or
+  anthropic was imported;
+- times --runs invocations and fails if the median startup overhead (the
+  time over a bare ``python -c pass``) exceeds --budget-ms.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --runs 20 --budget-ms 100
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+_LIST_CHANNEL_DIR = _HERE.parent / "list-channel"
+
+DEFAULT_RUNS = 10
+DEFAULT_BUDGET_MS = 150.0
+
+# Modules that must not load on a cheap path
+HEAVY_MODULES = ("yt_dlp", "anthropic")
+
+_VIDEO_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+_CHANNEL = "@bench"
+
+
+def _write_fixtures(tmp: Path) -> None:
+    """Create inputs for the no-op runs: everything is already fetched, extracted or cataloged."""
+    (tmp / "urls.txt").write_text(_VIDEO_URL + "\n", encoding="utf-8")
+    (tmp / "youtube-data.json").write_text(
+        json.dumps([{"url": _VIDEO_URL, "title": "Bench", "transcript": None}]), encoding="utf-8"
+    )
+    (tmp / "videos.json").write_text(json.dumps([{"youtubeUrl": _VIDEO_URL}]), encoding="utf-8")
+
+    sys.path.insert(0, str(_LIST_CHANNEL_DIR))
+    import catalog
+    from list_channel import normalize_channel_url
+
+    video = {
+        "id": "dQw4w9WgXcQ",
+        "url": _VIDEO_URL,
+        "title": "Bench",
+        "duration": 600,
+        "upload_date": "20240101",
+        "channel": "Bench",
+    }
+    with closing(catalog.connect(tmp / "catalog.db")) as conn:
+        catalog.replace_channel(conn, normalize_channel_url(_CHANNEL), [video])
+
+
+def _scenarios(tmp: Path) -> list[tuple[str, Path, list[str]]]:
+    """(label, script, arguments) of each cheap path."""
+    list_channel = _LIST_CHANNEL_DIR / "list_channel.py"
+    fetch = _HERE / "fetch_youtube.py"
+    extract = _HERE / "claude_extract.py"
+    return [
+        ("--help", list_channel, ["--help"]),
+        ("argument error", list_channel, [_CHANNEL, "--after", "not-a-date"]),
+        ("catalog hit", list_channel, [_CHANNEL, "--catalog", str(tmp / "catalog.db")]),
+        ("--help", fetch, ["--help"]),
+        ("argument error", fetch, []),
+        ("nothing to fetch", fetch,
+         ["--file", str(tmp / "urls.txt"), "--output", str(tmp / "youtube-data.json"), "--append"]),
+        ("--help", extract, ["--help"]),
+        ("argument error", extract, []),
+        ("nothing to extract", extract,
+         ["--input", str(tmp / "youtube-data.json"), "--output", str(tmp / "videos.json"), "--append"]),
+    ]
+
+
+def _median_ms(command: list[str], runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def _top_level_imports(command: list[str]) -> dict[str, float]:
+    """Run a command under -X importtime and return top-level module -> cumulative ms."""
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; nested names are indented
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        imports[name.strip()] = int(cumulative) / 1000
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the metadata CLIs start fast on paths that do no real work.",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=DEFAULT_RUNS,
+        help=f"Timed invocations per path; the median is reported (default: {DEFAULT_RUNS}).",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        metavar="MS",
+        help="Maximum median startup time over a bare interpreter, in milliseconds "
+        f"(default: {DEFAULT_BUDGET_MS:g}).",
+    )
+    args = parser.parse_args()
+    if args.runs < 1:
+        parser.error("--runs must be at least 1.")
+
+    baseline = _median_ms([sys.executable, "-c", "pass"], args.runs)
+    print(f"Bare interpreter: {baseline:.1f} ms (median of {args.runs})\n", file=sys.stderr)
+    print(
+        f"{'script':<18} {'path':<20} {'median ms':>10} {'overhead ms':>12}  "
+        f"{'slowest import':<28} result",
+        file=sys.stderr,
+    )
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_fixtures(Path(tmp))
+        for label, script, script_args in _scenarios(Path(tmp)):
+            command = [sys.executable, str(script), *script_args]
+            imports = _top_level_imports(command)
+            heavy = [name for name in HEAVY_MODULES if name in imports]
+            median = _median_ms(command, args.runs)
+            overhead = median - baseline
+
+            slowest = max(imports.items(), key=lambda item: item[1], default=None)
+            slowest_text = f"{slowest[0]} ({slowest[1]:.1f} ms)" if slowest else "-"
+            problems = []
+            if heavy:
+                problems.append(f"imports {', '.join(heavy)}")
+            if overhead > args.budget_ms:
+                problems.append(f"over {args.budget_ms:g} ms budget")
+            result = "; ".join(problems) or "ok"
+            if problems:
+                failures.append(f"{script.name} {label}: {result}")
+            print(
+                f"{script.name:<18} {label:<20} {median:>10.1f} {overhead:>12.1f}  "
+                f"{slowest_text:<28} {result}",
+                file=sys.stderr,
+            )
+
+    if failures:
+        print(f"\n{len(failures)} path(s) failed:", file=sys.stderr)
+        for failure in failures:
+            print(f"  - {failure}", file=sys.stderr)
+        sys.exit(1)
+    print("\nAll paths within budget.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
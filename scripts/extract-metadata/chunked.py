@@ -0,0 +1,128 @@
+"""
+Map-reduce helpers for transcripts too long for a single extraction call.
+
+Instead of truncating a long livestream transcript, claude_extract.py --chunked
+splits it into overlapping segments, asks a cheap model to quote candidate
+evidence (location, date, participants, constitutional concepts) from each
+segment in parallel, and then runs one consolidation call with the standard
+prompt in which the quoted evidence stands in for the full transcript.
+
+This module holds the pure parts: splitting, the per-segment prompt, and
+merging segment evidence into a prompt section.
+"""
+
+import json
+
+DEFAULT_CHUNK_THRESHOLD = 120_000
+CHUNK_CHARS = 40_000
+CHUNK_OVERLAP = 2_000
+CHUNK_MAX_TOKENS = 1024
+
+# Evidence categories requested from each segment, in prompt order
+EVIDENCE_KEYS = ("location", "date", "participants", "amendments")
+_MAX_QUOTES_PER_KEY = 12
+
+_CHUNK_PROMPT_TEMPLATE = """\
+You are helping extract metadata for AccountabilityAtlas, a platform that catalogs videos \
+documenting encounters between citizens and government/law enforcement in the United States.
+
+The transcript of the video below is too long to analyze at once. This is segment \
+{{index}} of {{count}}. Quote, verbatim and briefly, any evidence in this segment about:
+
+- **location**: where the encounter takes place (place or building names, street addresses, \
+cities, states, landmarks)
+- **date**: when the encounter took place (absolute dates, or relative dates like "yesterday")
+- **participants**: who the publisher interacts with (police, deputies, government \
+employees, business owners or employees, security guards, other citizens)
+- **amendments**: constitutional concepts (filming in public, speech or protest, \
+identification demands, searches, detentions, weapons, remaining silent, due process)
+
+<video_title>
+{{title}}
+</video_title>
+
+<transcript_segment>
+{{segment}}
+</transcript_segment>
+
+Output ONLY a JSON object with at most 10 short quotes per key, using empty arrays when a \
+segment has nothing relevant. Do NOT include markdown code fences or any other text.
+
+{"location": [], "date": [], "participants": [], "amendments": []}"""
+
+
+def needs_chunking(transcript: str | None, threshold: int = DEFAULT_CHUNK_THRESHOLD) -> bool:
+    """Whether a transcript is long enough to extract in chunks."""
+    return bool(transcript) and len(transcript) > threshold
+
+
+def split_transcript(
+    transcript: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP
+) -> list[str]:
+    """Split a transcript into overlapping segments, cutting at whitespace where possible.
+
+    The overlap keeps a sentence that straddles a boundary intact in at least
+    one segment.
+    """
+    segments = []
+    start = 0
+    length = len(transcript)
+    while start < length:
+        end = min(start + chunk_chars, length)
+        if end < length:
+            # Back up to the last space in the final 10% of the window
+            cut = transcript.rfind(" ", end - chunk_chars // 10, end)
+            if cut > start:
+                end = cut
+        segments.append(transcript[start:end].strip())
+        if end >= length:
+            break
+        start = max(end - overlap, start + 1)
+        # Start the next segment on a word boundary
+        space = transcript.find(" ", start, end)
+        if space != -1:
+            start = space + 1
+    return [s for s in segments if s]
+
+
+def build_chunk_message(title: str, segment: str, index: int, count: int) -> str:
+    """Build the evidence-extraction prompt for one transcript segment."""
+    return (
+        _CHUNK_PROMPT_TEMPLATE
+        .replace("{{index}}", str(index))
+        .replace("{{count}}", str(count))
+        .replace("{{title}}", title or "")
+        .replace("{{segment}}", segment)
+    )
+
+
+def merge_evidence(segment_evidence: list[dict]) -> dict[str, list[str]]:
+    """Combine per-segment evidence, dropping duplicate quotes (which overlaps produce)."""
+    merged: dict[str, list[str]] = {key: [] for key in EVIDENCE_KEYS}
+    seen: dict[str, set[str]] = {key: set() for key in EVIDENCE_KEYS}
+    for evidence in segment_evidence:
+        for key in EVIDENCE_KEYS:
+            quotes = evidence.get(key)
+            if not isinstance(quotes, list):
+                continue
+            for quote in quotes:
+                if not isinstance(quote, str):
+                    continue
+                quote = quote.strip()
+                normalized = quote.lower()
+                if not quote or normalized in seen[key] or len(merged[key]) >= _MAX_QUOTES_PER_KEY:
+                    continue
+                seen[key].add(normalized)
+                merged[key].append(quote)
+    return merged
+
+
+def build_evidence_section(evidence: dict[str, list[str]], segment_count: int) -> str:
+    """Build the XML-tagged evidence section that replaces the full transcript in the prompt."""
+    return (
+        "\n<transcript_evidence>\n"
+        f"The transcript was too long to include in full. These verbatim quotes were extracted "
+        f"from its {segment_count} segments:\n"
+        + json.dumps(evidence, indent=2, ensure_ascii=False)
+        + "\n</transcript_evidence>\n"
+    )
@@ -11,27 +11,67 @@ Usage:
     python claude_extract.py --input youtube-data.json --output videos.json --batch
     python claude_extract.py --input youtube-data.json --output videos.json --append
     python claude_extract.py --input youtube-data.json --output videos.json --model claude-sonnet-4-20250514
+    python claude_extract.py --input youtube-data.json --output videos.json --metrics metrics.json
+    python claude_extract.py --input youtube-data.json --output videos.json --preclassify
+    python claude_extract.py --input youtube-data.json --output videos.json --local-extract hints
+    python claude_extract.py --input youtube-data.json --output videos.json --concurrency 8 --hedge
+    python claude_extract.py --input youtube-data.json --output videos.json --chunked
+    python claude_extract.py --input youtube-data.json --output videos.json --deadline 6h -c 8
+    python claude_extract.py --input youtube-data.json --output videos.shard-0.json --shard 0/4
+    python claude_extract.py --input youtube-data.json --output videos.json --dedupe
+    python claude_extract.py --input videos.db --output videos.db --append
+    python claude_extract.py --input youtube-data.json --output videos.json --append --reextract changed.txt
+    python claude_extract.py --input youtube-data.json --output videos.json --append --priority
+    python claude_extract.py --input youtube-data.json --output videos.json --append --compact
 """
 
+from __future__ import annotations
+
 import argparse
+import itertools
 import json
+import os
 import sys
+import tempfile
+import threading
 import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import replace
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-
-try:
+from typing import TYPE_CHECKING
+
+import chunked
+import dedupe
+import local_extract
+import preclassify
+import priority
+import record_store
+import router
+import shards
+import video_record
+from executor import DEFAULT_CALL_TIMEOUT, DEFAULT_MAX_RETRIES, RequestExecutor, import_anthropic
+from json_stream import iter_records
+from record_store import RecordStore
+from telemetry import ExtractionTelemetry
+from video_record import Confidence, Location, VideoEntry
+
+if TYPE_CHECKING:
+    # Imported on first use (see executor.import_anthropic) to keep startup fast
     import anthropic
-except ImportError:
-    print(
-        "Error: 'anthropic' package is not installed. "
-        "Run: pip install -r requirements.txt",
-        file=sys.stderr,
-    )
-    sys.exit(1)
-
 
 DEFAULT_MODEL = "claude-haiku-4-5-20251001"
 
+LOCAL_EXTRACT_MODES = ("off", "merge", "hints")
+
+# Parallel segment calls per video in --chunked mode
+_CHUNK_WORKERS = 8
+
+# --priority orders JSON inputs up to this many records exactly, in memory;
+# larger ones are read in rank groups, one pass over the file each
+_PRIORITY_EXACT_MAX = 2000
+_PRIORITY_TIERS = 4
+
 # --- Prompt building blocks ---
 # The prompt is decomposed into reusable parts so that both sequential and batch
 # modes share a single source of truth for classification instructions and
@@ -56,7 +96,7 @@ Here is the YouTube video information you need to analyze:
 <publication_date>
 {{published}}
 </publication_date>
-{{transcript_section}}"""
+{{transcript_section}}{{hints_section}}"""
 
 _TASK_LIST = """\
 1. **Constitutional amendments** involved in the encounter
@@ -266,7 +306,7 @@ text, no markdown formatting, and no code fences."""
 # --- Composed templates ---
 
 # Sequential mode: single user-only prompt (matches Java video-service structure).
-# The only addition is the optional {{transcript_section}}.
+# The only additions are the optional {{transcript_section}} and {{hints_section}}.
 USER_PROMPT_TEMPLATE = (
     _ROLE_PREAMBLE + "\n\n"
     + _VIDEO_DATA_TEMPLATE + "\n"
@@ -318,6 +358,7 @@ def _fill_template(
     description: str,
     published: str | None,
     transcript: str | None,
+    hints: str = "",
 ) -> str:
     """Fill a prompt template with video data."""
     return (
@@ -326,22 +367,39 @@ def _fill_template(
         .replace("{{description}}", description or "")
         .replace("{{published}}", published or "unknown")
         .replace("{{transcript_section}}", _build_transcript_section(transcript))
+        .replace("{{hints_section}}", hints)
     )
 
 
 # --- Message building ---
 
 
-def build_user_message(title: str, description: str, published: str | None, transcript: str | None) -> str:
+def build_user_message(
+    title: str, description: str, published: str | None, transcript: str | None, hints: str = ""
+) -> str:
     """Build the user message for Claude following the shared prompt spec."""
-    return _fill_template(USER_PROMPT_TEMPLATE, title, description, published, transcript)
+    return _fill_template(USER_PROMPT_TEMPLATE, title, description, published, transcript, hints)
 
 
 def build_batch_user_message(
-    title: str, description: str, published: str | None, transcript: str | None
+    title: str, description: str, published: str | None, transcript: str | None, hints: str = ""
 ) -> str:
     """Build the per-video user message for batch mode."""
-    return _fill_template(BATCH_USER_TEMPLATE, title, description, published, transcript)
+    return _fill_template(BATCH_USER_TEMPLATE, title, description, published, transcript, hints)
+
+
+def _local_results(youtube_data: dict, local_mode: str) -> dict | None:
+    """Run the rule-based local extractors unless local extraction is off."""
+    if local_mode == "off":
+        return None
+    return local_extract.extract(youtube_data)
+
+
+def _local_hints(local: dict | None, local_mode: str) -> str:
+    """Build the prompt hints section when local results are handed to Claude."""
+    if local is None or local_mode != "hints":
+        return ""
+    return local_extract.build_hints_section(local)
 
 
 # --- JSON extraction ---
@@ -395,6 +453,9 @@ def extract_metadata_with_claude(
     client: anthropic.Anthropic,
     youtube_data: dict,
     model: str = DEFAULT_MODEL,
+    telemetry: ExtractionTelemetry | None = None,
+    hints: str = "",
+    executor: RequestExecutor | None = None,
 ) -> dict:
     """Call Claude to extract structured metadata from video information.
 
@@ -402,6 +463,10 @@ def extract_metadata_with_claude(
         client: Anthropic client instance.
         youtube_data: Dictionary from fetch_youtube.py intermediate JSON.
         model: Claude model ID to use.
+        telemetry: Optional collector that records usage and latency for the call.
+        hints: Optional local extraction hints section to include in the prompt.
+        executor: Optional request executor adding timeouts, retries and hedging.
+            Without one, the client is called directly.
 
     Returns:
         Parsed JSON metadata from Claude's response.
@@ -411,48 +476,132 @@ def extract_metadata_with_claude(
         description=youtube_data["description"],
         published=youtube_data.get("published"),
         transcript=youtube_data.get("transcript"),
+        hints=hints,
     )
 
     user_message = _truncate_message(user_message)
 
-    response = client.messages.create(
+    return _call_for_json(
+        client, executor, model, user_message, 4096, youtube_data.get("url", ""),
+        "sequential", telemetry,
+    )
+
+
+def _call_for_json(
+    client: anthropic.Anthropic,
+    executor: RequestExecutor | None,
+    model: str,
+    user_message: str,
+    max_tokens: int,
+    url: str,
+    mode: str,
+    telemetry: ExtractionTelemetry | None,
+) -> dict:
+    """Send one real-time request and parse the last JSON object in the response.
+
+    Raises:
+        json.JSONDecodeError: If the response does not contain valid JSON.
+    """
+    create = executor.create_message if executor is not None else client.messages.create
+    started = time.monotonic()
+    response = create(
         model=model,
-        max_tokens=4096,
+        max_tokens=max_tokens,
         messages=[{"role": "user", "content": user_message}],
     )
+    latency = time.monotonic() - started
 
     raw_text = response.content[0].text.strip()
     json_str = _extract_json(raw_text)
 
     try:
-        return json.loads(json_str)
+        metadata = json.loads(json_str)
     except json.JSONDecodeError as e:
+        if telemetry is not None:
+            telemetry.record(url, model, response.usage, latency, mode, ok=False)
         print(f"Warning: Failed to parse Claude's response as JSON: {e}", file=sys.stderr)
         print(f"Raw response:\n{raw_text}", file=sys.stderr)
         raise
 
+    if telemetry is not None:
+        telemetry.record(url, model, response.usage, latency, mode)
+    return metadata
 
-def build_output_entry(url: str, youtube_data: dict, claude_metadata: dict) -> dict:
-    """Combine YouTube metadata and Claude extraction into the seed-data format."""
-    location = claude_metadata.get("location")
-    if location is not None:
-        location = {
-            "name": location.get("name"),
-            "streetAddress": location.get("streetAddress"),
-            "city": location.get("city"),
-            "state": location.get("state"),
-            "latitude": location.get("latitude"),
-            "longitude": location.get("longitude"),
-        }
 
-    confidence = claude_metadata.get("confidence", {})
-    confidence = {
-        "amendments": confidence.get("amendments", 0.0),
-        "participants": confidence.get("participants", 0.0),
-        "videoDate": confidence.get("videoDate", 0.0),
-        "location": confidence.get("location", 0.0),
-    }
+def extract_metadata_chunked(
+    client: anthropic.Anthropic,
+    youtube_data: dict,
+    model: str = DEFAULT_MODEL,
+    chunk_model: str = DEFAULT_MODEL,
+    telemetry: ExtractionTelemetry | None = None,
+    hints: str = "",
+    executor: RequestExecutor | None = None,
+) -> dict:
+    """Map-reduce extraction for transcripts too long for one call.
+
+    The transcript is split into overlapping segments (see chunked.py). Each
+    segment is sent to `chunk_model` in parallel to quote candidate evidence,
+    and one consolidation call to `model` then runs the standard prompt with
+    the merged evidence in place of the full transcript. Latency is bounded
+    by the slowest segment plus the consolidation call.
+
+    Args:
+        client: Anthropic client instance.
+        youtube_data: Dictionary from fetch_youtube.py intermediate JSON.
+        model: Claude model ID for the consolidation call.
+        chunk_model: Claude model ID for the per-segment evidence calls.
+        telemetry: Optional collector that records usage and latency for each call.
+        hints: Optional local extraction hints section to include in the prompt.
+        executor: Optional request executor adding timeouts, retries and hedging.
+
+    Returns:
+        Parsed JSON metadata from the consolidation call.
 
+    Raises:
+        RuntimeError: If no segment produced usable evidence.
+    """
+    url = youtube_data.get("url", "")
+    title = youtube_data["title"]
+    segments = chunked.split_transcript(youtube_data["transcript"])
+    print(f"  Transcript split into {len(segments)} segment(s) ({chunk_model})...", file=sys.stderr)
+
+    def extract_segment(index: int, segment: str) -> dict:
+        message = chunked.build_chunk_message(title, segment, index, len(segments))
+        return _call_for_json(
+            client, executor, chunk_model, message, chunked.CHUNK_MAX_TOKENS, url, "chunk",
+            telemetry,
+        )
+
+    segment_evidence = []
+    workers = min(len(segments), _CHUNK_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(extract_segment, i, segment) for i, segment in enumerate(segments, 1)
+        ]
+        for i, future in enumerate(futures, 1):
+            try:
+                segment_evidence.append(future.result())
+            except Exception as e:
+                print(f"  Warning: Segment {i} of {len(segments)} failed: {e}", file=sys.stderr)
+
+    if not segment_evidence:
+        raise RuntimeError(f"all {len(segments)} transcript segments failed")
+
+    evidence = chunked.merge_evidence(segment_evidence)
+    user_message = build_user_message(
+        title=title,
+        description=youtube_data["description"],
+        published=youtube_data.get("published"),
+        transcript=None,
+        hints=chunked.build_evidence_section(evidence, len(segments)) + hints,
+    )
+    return _call_for_json(
+        client, executor, model, user_message, 4096, url, "consolidate", telemetry
+    )
+
+
+def _youtube_fields(url: str, youtube_data: dict) -> dict:
+    """Return the output entry fields taken from a video's YouTube metadata."""
     return {
         "youtubeUrl": youtube_data.get("url") or url,
         "title": youtube_data.get("title", ""),
@@ -460,46 +609,146 @@ def build_output_entry(url: str, youtube_data: dict, claude_metadata: dict) -> d
         "channelName": youtube_data.get("channel", ""),
         "thumbnailUrl": youtube_data.get("thumbnail"),
         "durationSeconds": youtube_data.get("duration"),
-        "amendments": claude_metadata.get("amendments", []),
-        "participants": claude_metadata.get("participants", []),
-        "videoDate": claude_metadata.get("videoDate"),
-        "location": location,
-        "confidence": confidence,
     }
 
 
+def build_output_entry(
+    url: str, youtube_data: dict, claude_metadata: dict, local: dict | None = None
+) -> VideoEntry:
+    """Combine YouTube metadata and Claude extraction into a seed-data entry.
+
+    If local (rule-based) extraction results are given, they fill fields Claude
+    left empty; see local_extract.merge.
+    """
+    location = claude_metadata.get("location")
+    if location is not None:
+        location = Location(
+            name=location.get("name"),
+            streetAddress=location.get("streetAddress"),
+            city=location.get("city"),
+            state=location.get("state"),
+            latitude=location.get("latitude"),
+            longitude=location.get("longitude"),
+        )
+
+    confidence = claude_metadata.get("confidence", {})
+    entry = VideoEntry(
+        **_youtube_fields(url, youtube_data),
+        amendments=claude_metadata.get("amendments", []),
+        participants=claude_metadata.get("participants", []),
+        videoDate=claude_metadata.get("videoDate"),
+        location=location,
+        confidence=Confidence(
+            amendments=confidence.get("amendments", 0.0),
+            participants=confidence.get("participants", 0.0),
+            videoDate=confidence.get("videoDate", 0.0),
+            location=confidence.get("location", 0.0),
+        ),
+    )
+    if local is not None:
+        local_extract.merge(entry, local)
+    return entry
+
+
+def _copy_entry(source: VideoEntry, url: str, youtube_data: dict) -> VideoEntry:
+    """Copy a representative's extracted fields onto another video's YouTube fields."""
+    location = source.location
+    if location is not None:
+        location = replace(location, extra=None)
+    return VideoEntry(
+        **_youtube_fields(url, youtube_data),
+        amendments=source.amendments,
+        participants=source.participants,
+        videoDate=source.videoDate,
+        location=location,
+        confidence=replace(source.confidence or Confidence(), extra=None),
+    )
+
+
 def process_single(
     youtube_data: dict,
     client: anthropic.Anthropic,
     model: str,
-) -> dict:
+    telemetry: ExtractionTelemetry | None = None,
+    local_mode: str = "off",
+    executor: RequestExecutor | None = None,
+    chunk_model: str | None = None,
+    chunk_threshold: int = chunked.DEFAULT_CHUNK_THRESHOLD,
+) -> VideoEntry:
     """Process a single video entry through Claude extraction.
 
     Args:
         youtube_data: Dictionary from fetch_youtube.py intermediate JSON.
         client: Anthropic client instance.
         model: Claude model ID.
+        telemetry: Optional collector that records usage and latency for the call.
+        local_mode: "off", "merge" (merge local results into the output) or
+            "hints" (also pass high-confidence local results to Claude).
+        executor: Optional request executor adding timeouts, retries and hedging.
+        chunk_model: If set, transcripts longer than `chunk_threshold` characters
+            are extracted in chunks with this model; see extract_metadata_chunked.
+        chunk_threshold: Transcript length above which chunked extraction is used.
 
     Returns:
-        Output entry dictionary in seed-data format.
+        The seed-data output entry.
     """
     url = youtube_data.get("url", "")
     print(f"  Calling Claude ({model})...", file=sys.stderr)
-    claude_metadata = extract_metadata_with_claude(client, youtube_data, model=model)
+    local = _local_results(youtube_data, local_mode)
+    hints = _local_hints(local, local_mode)
+    if chunk_model and chunked.needs_chunking(youtube_data.get("transcript"), chunk_threshold):
+        claude_metadata = extract_metadata_chunked(
+            client,
+            youtube_data,
+            model=model,
+            chunk_model=chunk_model,
+            telemetry=telemetry,
+            hints=hints,
+            executor=executor,
+        )
+    else:
+        claude_metadata = extract_metadata_with_claude(
+            client,
+            youtube_data,
+            model=model,
+            telemetry=telemetry,
+            hints=hints,
+            executor=executor,
+        )
 
-    entry = build_output_entry(url, youtube_data, claude_metadata)
-    print(f"  Done: {entry.get('title', 'Unknown')}", file=sys.stderr)
+    entry = build_output_entry(url, youtube_data, claude_metadata, local)
+    print(f"  Done: {entry.title}", file=sys.stderr)
     return entry
 
 
+def _entry_from_message(
+    message, yt_data: dict, url: str, local_mode: str = "off"
+) -> VideoEntry:
+    """Parse a Claude response message into a seed-data output entry.
+
+    Raises:
+        json.JSONDecodeError, IndexError, KeyError: If the response cannot be parsed.
+    """
+    raw_text = message.content[0].text.strip()
+    json_str = _extract_json(raw_text)
+    claude_metadata = json.loads(json_str)
+    local = _local_results(yt_data, local_mode)
+    return build_output_entry(url, yt_data, claude_metadata, local)
+
+
 def _process_batch_entry(
     entry,
     yt_data: dict,
     url: str,
-    results: list[dict],
     errors: list[str],
-) -> None:
-    """Process a single result from the Message Batches API response."""
+    telemetry: ExtractionTelemetry | None = None,
+    local_mode: str = "off",
+) -> VideoEntry | None:
+    """Process a single result from the Message Batches API response.
+
+    Returns:
+        The output entry, or None if the request failed (the error is recorded).
+    """
     result_type = entry.result.type
 
     if result_type != "succeeded":
@@ -512,78 +761,87 @@ def _process_batch_entry(
         msg_fn = _ERROR_MESSAGES.get(result_type)
         if msg_fn:
             errors.append(msg_fn())
-        return
+        return None
 
+    message = entry.result.message
+    result = None
     try:
-        raw_text = entry.result.message.content[0].text.strip()
-        json_str = _extract_json(raw_text)
-        claude_metadata = json.loads(json_str)
-        results.append(build_output_entry(url, yt_data, claude_metadata))
+        result = _entry_from_message(message, yt_data, url, local_mode)
         print(f"  Processed: {yt_data.get('title', url)}", file=sys.stderr)
     except (json.JSONDecodeError, IndexError, KeyError) as e:
         errors.append(f"Failed to parse response for {url}: {e}")
 
+    if telemetry is not None:
+        # Batch results carry usage but no per-request latency
+        telemetry.record(
+            url, getattr(message, "model", ""), message.usage, None, "batch", ok=result is not None
+        )
+    return result
 
-def process_batch(
-    youtube_data_list: list[dict],
-    client: anthropic.Anthropic,
-    model: str,
-) -> tuple[list[dict], list[str]]:
-    """Process multiple videos using the Message Batches API for 50% cost savings.
 
-    Submits all requests as a single batch and polls for completion.
-    The prompt is split into a shared system message (with cache_control)
-    and per-video user messages to maximize prompt caching hits.
+# Requests per submitted batch. The API caps a batch at 100,000 requests / 256 MB;
+# smaller chunks keep the in-memory request list bounded on very large inputs.
+_BATCH_MAX_REQUESTS = 5_000
+_BATCH_MAX_CHARS = 100_000_000
 
-    Args:
-        youtube_data_list: List of dictionaries from fetch_youtube.py intermediate JSON.
-        client: Anthropic client instance.
-        model: Claude model ID.
+# Fields build_output_entry (and local extraction) read from youtube-data. Only these
+# are retained while a batch is in flight, so transcripts are not held in memory.
+_OUTPUT_SOURCE_FIELDS = (
+    "url", "title", "description", "channel", "thumbnail", "duration", "published",
+)
 
-    Returns:
-        Tuple of (results list, errors list).
-    """
-    print(f"\nSubmitting batch of {len(youtube_data_list)} requests...", file=sys.stderr)
-
-    requests = []
-    # custom_id must be [a-zA-Z0-9_-]{1,64} — use video ID, map back to index
-    id_to_index = {}
-    for idx, yt_data in enumerate(youtube_data_list):
-        url = yt_data.get("url", "")
-        video_id = url.split("watch?v=")[-1].split("&")[0] if "watch?v=" in url else f"idx-{idx}"
-        id_to_index[video_id] = idx
-
-        user_message = build_batch_user_message(
-            title=yt_data["title"],
-            description=yt_data["description"],
-            published=yt_data.get("published"),
-            transcript=yt_data.get("transcript"),
-        )
 
-        user_message = _truncate_message(user_message)
-
-        requests.append(
-            {
-                "custom_id": video_id,
-                "params": {
-                    "model": model,
-                    "max_tokens": 4096,
-                    "system": [
-                        {
-                            "type": "text",
-                            "text": BATCH_SYSTEM_PROMPT,
-                            "cache_control": {"type": "ephemeral"},
-                        }
-                    ],
-                    "messages": [{"role": "user", "content": user_message}],
-                },
-            }
-        )
+def _slim_record(yt_data: dict) -> dict:
+    """Drop everything build_output_entry does not need (notably the transcript)."""
+    return {k: yt_data[k] for k in _OUTPUT_SOURCE_FIELDS if k in yt_data}
+
+
+def _batch_custom_id(url: str, idx: int) -> str:
+    """Return a batch custom_id for a record: its video ID, or its input index."""
+    # custom_id must be [a-zA-Z0-9_-]{1,64}
+    return url.split("watch?v=")[-1].split("&")[0] if "watch?v=" in url else f"idx-{idx}"
+
 
+def _build_batch_request(video_id: str, yt_data: dict, model: str, hints: str = "") -> dict:
+    """Build a single Message Batches API request for one video."""
+    user_message = build_batch_user_message(
+        title=yt_data["title"],
+        description=yt_data["description"],
+        published=yt_data.get("published"),
+        transcript=yt_data.get("transcript"),
+        hints=hints,
+    )
+
+    user_message = _truncate_message(user_message)
+
+    return {
+        "custom_id": video_id,
+        "params": {
+            "model": model,
+            "max_tokens": 4096,
+            "system": [
+                {
+                    "type": "text",
+                    "text": BATCH_SYSTEM_PROMPT,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            "messages": [{"role": "user", "content": user_message}],
+        },
+    }
+
+
+def _submit_batch(client: anthropic.Anthropic, requests: list[dict]) -> str:
+    """Submit one batch of requests and return its ID."""
+    print(f"\nSubmitting batch of {len(requests)} requests...", file=sys.stderr)
     batch = client.messages.batches.create(requests=requests)
     print(f"Batch created: {batch.id}", file=sys.stderr)
+    return batch.id
 
-    # Poll for completion
+
+def _wait_for_batch(client: anthropic.Anthropic, batch_id: str) -> None:
+    """Poll a batch until processing has ended, printing progress."""
+    batch = client.messages.batches.retrieve(batch_id)
     while batch.processing_status != "ended":
         counts = batch.request_counts
         print(
@@ -599,36 +857,336 @@ def process_batch(
 
     counts = batch.request_counts
     print(
-        f"\nBatch complete: {counts.succeeded} succeeded, "
+        f"\nBatch {batch.id} complete: {counts.succeeded} succeeded, "
         f"{counts.errored} errored, "
         f"{counts.expired} expired, "
         f"{counts.canceled} canceled",
         file=sys.stderr,
     )
 
+
+# Batch status poll intervals in --deadline mode (normally, and while canceling)
+_DEADLINE_POLL_SECONDS = 30
+_CANCEL_POLL_SECONDS = 5
+
+
+def process_batch(
+    youtube_data: Iterable[dict],
+    client: anthropic.Anthropic,
+    model: str,
+    telemetry: ExtractionTelemetry | None = None,
+    local_mode: str = "off",
+) -> tuple[list[VideoEntry], list[str]]:
+    """Process multiple videos using the Message Batches API for 50% cost savings.
+
+    Requests are rendered as input records stream in and submitted in chunks of
+    at most _BATCH_MAX_REQUESTS, then all batches are polled for completion.
+    The prompt is split into a shared system message (with cache_control)
+    and per-video user messages to maximize prompt caching hits.
+
+    Args:
+        youtube_data: Iterable of dictionaries from fetch_youtube.py intermediate JSON.
+        client: Anthropic client instance.
+        model: Claude model ID.
+        telemetry: Optional collector that records usage for each batch result.
+        local_mode: "off", "merge" or "hints"; see process_single.
+
+    Returns:
+        Tuple of (results list, errors list).
+    """
+    # Each submitted batch keeps a map from custom_id back to its (slim) input record
+    submitted: list[tuple[str, dict[str, dict]]] = []
+    requests: list[dict] = []
+    id_to_record: dict[str, dict] = {}
+    chars = 0
+
+    for idx, yt_data in enumerate(youtube_data):
+        # Use the video ID as custom_id and map it back to the record
+        video_id = _batch_custom_id(yt_data.get("url", ""), idx)
+
+        hints = _local_hints(_local_results(yt_data, local_mode), local_mode)
+        request = _build_batch_request(video_id, yt_data, model, hints)
+        requests.append(request)
+        id_to_record[video_id] = _slim_record(yt_data)
+        chars += len(request["params"]["messages"][0]["content"])
+
+        if len(requests) >= _BATCH_MAX_REQUESTS or chars >= _BATCH_MAX_CHARS:
+            submitted.append((_submit_batch(client, requests), id_to_record))
+            requests, id_to_record, chars = [], {}, 0
+
+    if requests:
+        submitted.append((_submit_batch(client, requests), id_to_record))
+    del requests
+
     # Retrieve and process results
     results = []
     errors = []
 
-    for entry in client.messages.batches.results(batch.id):
-        video_id = entry.custom_id
-        idx = id_to_index.get(video_id)
-        if idx is None:
-            errors.append(f"Unknown custom_id in batch response: {video_id}")
-            continue
-        yt_data = youtube_data_list[idx]
-        url = yt_data.get("url", video_id)
-        _process_batch_entry(entry, yt_data, url, results, errors)
+    for batch_id, id_to_record in submitted:
+        _wait_for_batch(client, batch_id)
+        for entry in client.messages.batches.results(batch_id):
+            video_id = entry.custom_id
+            yt_data = id_to_record.get(video_id)
+            if yt_data is None:
+                errors.append(f"Unknown custom_id in batch response: {video_id}")
+                continue
+            url = yt_data.get("url", video_id)
+            result = _process_batch_entry(entry, yt_data, url, errors, telemetry, local_mode)
+            if result is not None:
+                results.append(result)
 
     return results, errors
 
 
+class _RequestSpool:
+    """Rendered batch requests spooled to a temporary file instead of held in memory.
+
+    --deadline needs every request's size up front to plan routes, and may
+    re-send any batch request in real time later, so each request is rendered
+    once, written here, and read back when it is submitted or sent.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._offsets: list[int] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def append(self, request: dict) -> None:
+        with self._lock:
+            self._offsets.append(self._file.seek(0, os.SEEK_END))
+            self._file.write(video_record.dumps(request).encode("utf-8") + b"\n")
+
+    def get(self, i: int) -> dict:
+        with self._lock:
+            self._file.seek(self._offsets[i])
+            line = self._file.readline()
+        return video_record.loads(line)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _send_realtime(
+    spool: _RequestSpool,
+    i: int,
+    yt_data: dict,
+    executor: RequestExecutor,
+    telemetry: ExtractionTelemetry | None,
+    local_mode: str,
+) -> dict:
+    """Send spooled request i as a real-time call and parse the response."""
+    request = spool.get(i)
+    url = yt_data.get("url", request["custom_id"])
+    started = time.monotonic()
+    message = executor.create_message(**request["params"])
+    latency = time.monotonic() - started
+    try:
+        result = _entry_from_message(message, yt_data, url, local_mode)
+    except (json.JSONDecodeError, IndexError, KeyError):
+        if telemetry is not None:
+            telemetry.record(url, request["params"]["model"], message.usage, latency, "realtime", ok=False)
+        raise
+    if telemetry is not None:
+        telemetry.record(url, request["params"]["model"], message.usage, latency, "realtime")
+    print(f"  Processed (real-time): {yt_data.get('title', url)}", file=sys.stderr)
+    return result
+
+
+def _queue_realtime(
+    pool: ThreadPoolExecutor,
+    indices: list[int],
+    spool: _RequestSpool,
+    records: list[dict],
+    executor: RequestExecutor,
+    futures: dict,
+    telemetry: ExtractionTelemetry | None,
+    local_mode: str,
+) -> None:
+    """Queue requests as real-time calls on the pool, mapping each future to its index."""
+    if not indices:
+        return
+    print(f"\nSending {len(indices)} request(s) as real-time calls...", file=sys.stderr)
+    for i in indices:
+        future = pool.submit(_send_realtime, spool, i, records[i], executor, telemetry, local_mode)
+        futures[future] = i
+
+
+def _submit_deadline_batches(
+    client: anthropic.Anthropic, spool: _RequestSpool, indices: range
+) -> list[tuple[str, list[int]]]:
+    """Submit spooled requests as batches, reading back one chunk at a time."""
+    submitted = []
+    chunk: list[int] = []
+    requests: list[dict] = []
+    chars = 0
+    for i in indices:
+        request = spool.get(i)
+        chunk.append(i)
+        requests.append(request)
+        chars += len(request["params"]["messages"][0]["content"])
+        if len(chunk) >= _BATCH_MAX_REQUESTS or chars >= _BATCH_MAX_CHARS:
+            submitted.append((_submit_batch(client, requests), chunk))
+            chunk, requests, chars = [], [], 0
+    if chunk:
+        submitted.append((_submit_batch(client, requests), chunk))
+    return submitted
+
+
+def process_with_deadline(
+    youtube_data: Iterable[dict],
+    client: anthropic.Anthropic,
+    model: str,
+    executor: RequestExecutor,
+    deadline_seconds: float,
+    concurrency: int = 1,
+    telemetry: ExtractionTelemetry | None = None,
+    local_mode: str = "off",
+) -> tuple[list[VideoEntry], list[str]]:
+    """Route videos between the Batches API and real-time calls to meet a deadline.
+
+    See router.py for the routing policy. Rendered requests are spooled to a
+    temporary file rather than kept in memory, so unfinished batch requests
+    can be re-sent as real-time calls. Batches are polled while the real-time
+    lane runs, and canceled batch requests join the same real-time pool.
+
+    Args:
+        youtube_data: Iterable of dictionaries from fetch_youtube.py intermediate JSON.
+        client: Anthropic client instance.
+        model: Claude model ID.
+        executor: Request executor used for real-time calls.
+        deadline_seconds: Seconds from now by which the run should finish.
+        concurrency: Number of concurrent real-time calls.
+        telemetry: Optional collector that records usage for each call.
+        local_mode: "off", "merge" or "hints"; see process_single.
+
+    Returns:
+        Tuple of (results list in input order, errors list).
+    """
+    deadline_at = time.monotonic() + deadline_seconds
+
+    spool = _RequestSpool()
+    custom_ids: list[str] = []
+    records: list[dict] = []
+    estimates: list[float] = []
+    for idx, yt_data in enumerate(youtube_data):
+        video_id = _batch_custom_id(yt_data.get("url", ""), idx)
+        hints = _local_hints(_local_results(yt_data, local_mode), local_mode)
+        request = _build_batch_request(video_id, yt_data, model, hints)
+        spool.append(request)
+        custom_ids.append(video_id)
+        records.append(_slim_record(yt_data))
+        prompt_chars = len(BATCH_SYSTEM_PROMPT) + len(request["params"]["messages"][0]["content"])
+        estimates.append(router.estimate_call_seconds(prompt_chars))
+
+    budget = deadline_seconds - router.SAFETY_MARGIN_SECONDS
+    realtime_count = router.plan_routes(estimates, concurrency, budget)
+    print(
+        f"\nDeadline in {deadline_seconds / 60:.0f} min: {len(spool)} request(s), "
+        f"~{router.realtime_seconds(estimates, concurrency) / 60:.0f} min if all sent real-time "
+        f"at concurrency {concurrency}.",
+        file=sys.stderr,
+    )
+    print(
+        f"Routing {len(spool) - realtime_count} request(s) to the Batches API and "
+        f"{realtime_count} to real-time calls.",
+        file=sys.stderr,
+    )
+    if realtime_count and realtime_count < len(spool):
+        print(
+            "Warning: The workload cannot be finished in real time before the deadline; "
+            "the remainder depends on the Batches API.",
+            file=sys.stderr,
+        )
+
+    completed: dict[int, VideoEntry] = {}
+    errors: list[str] = []
+    futures: dict = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            _queue_realtime(
+                pool, list(range(realtime_count)), spool, records, executor, futures,
+                telemetry, local_mode,
+            )
+            submitted = _submit_deadline_batches(client, spool, range(realtime_count, len(spool)))
+
+            # Poll the batches while real-time calls run. Canceled requests are queued
+            # behind them at once, so the cut-over only counts time they leave free.
+            canceled = False
+            while submitted:
+                in_flight = []
+                straggler_seconds = 0.0
+                for batch_id, indices in submitted:
+                    batch = client.messages.batches.retrieve(batch_id)
+                    if batch.processing_status != "ended":
+                        in_flight.append((batch_id, indices))
+                        unfinished = batch.request_counts.processing / len(indices)
+                        straggler_seconds += unfinished * router.realtime_seconds(
+                            [estimates[i] for i in indices], concurrency
+                        )
+                        continue
+                    print(f"\nBatch {batch_id} ended.", file=sys.stderr)
+                    index_of = {custom_ids[i]: i for i in indices}
+                    stragglers = []
+                    for entry in client.messages.batches.results(batch_id):
+                        i = index_of.get(entry.custom_id)
+                        if i is None:
+                            errors.append(f"Unknown custom_id in batch response: {entry.custom_id}")
+                            continue
+                        if entry.result.type in ("canceled", "expired"):
+                            stragglers.append(i)
+                            continue
+                        url = records[i].get("url", entry.custom_id)
+                        result = _process_batch_entry(entry, records[i], url, errors, telemetry, local_mode)
+                        if result is not None:
+                            completed[i] = result
+                    _queue_realtime(
+                        pool, sorted(stragglers), spool, records, executor, futures,
+                        telemetry, local_mode,
+                    )
+                submitted = in_flight
+                if not submitted:
+                    break
+
+                remaining = deadline_at - time.monotonic()
+                claimed_seconds = router.realtime_seconds(
+                    [estimates[i] for future, i in futures.items() if not future.done()], concurrency
+                )
+                if not canceled and router.should_cut_over(remaining, straggler_seconds, claimed_seconds):
+                    print(
+                        f"\n{remaining / 60:.0f} min to deadline, ~{claimed_seconds / 60:.0f} min of "
+                        f"queued real-time work and ~{straggler_seconds / 60:.0f} min of unfinished "
+                        "batch work: canceling batches and switching to real-time calls.",
+                        file=sys.stderr,
+                    )
+                    for batch_id, _ in submitted:
+                        client.messages.batches.cancel(batch_id)
+                    canceled = True
+                time.sleep(_CANCEL_POLL_SECONDS if canceled else _DEADLINE_POLL_SECONDS)
+
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    completed[i] = future.result()
+                except Exception as e:
+                    error_msg = f"Failed to process {records[i].get('url', 'unknown')}: {e}"
+                    print(f"  Error: {error_msg}", file=sys.stderr)
+                    errors.append(error_msg)
+    finally:
+        spool.close()
+
+    if time.monotonic() > deadline_at:
+        print("Warning: The run finished after the requested deadline.", file=sys.stderr)
+    return [completed[i] for i in sorted(completed)], errors
+
+
 def _load_json_array(path: Path, label: str) -> list:
     """Load and validate a JSON array from a file, exiting on error."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+        data = video_record.load_json_array(path)
+    except ValueError as e:
         print(f"Error: Failed to parse {label} {path}: {e}", file=sys.stderr)
         sys.exit(1)
 
@@ -639,62 +1197,345 @@ def _load_json_array(path: Path, label: str) -> list:
     return data
 
 
-def _load_existing_output(output_path: Path) -> tuple[list, set]:
+def _load_existing_output(output_path: Path) -> tuple[list[VideoEntry], set]:
     """Load existing entries from output file for append mode."""
     if not output_path.exists():
         return [], set()
 
-    entries = _load_json_array(output_path, "Existing file")
-    urls = {entry.get("youtubeUrl") for entry in entries}
+    entries = [VideoEntry.from_dict(entry) for entry in _load_json_array(output_path, "Existing file")]
+    urls = {entry.youtubeUrl for entry in entries}
     print(f"Loaded {len(entries)} existing entries from {output_path}.", file=sys.stderr)
     return entries, urls
 
 
-def _filter_existing_urls(data_list: list[dict], existing_urls: set) -> list[dict]:
-    """Remove already-processed entries and report skipped count."""
-    if not existing_urls:
-        return data_list
+def _read_url_file(path: Path) -> set[str]:
+    """Read a file of URLs, one per line (blank lines and # comments ignored)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip() and not line.startswith("#")}
+    except OSError as e:
+        print(f"Error: Failed to read {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _replace_reextracted(results: list[VideoEntry], existing_count: int) -> list[VideoEntry]:
+    """Put re-extracted entries in place of the existing entries for the same videos.
+
+    Args:
+        results: Existing entries followed by this run's entries.
+        existing_count: Number of existing entries at the start of `results`.
+
+    Returns:
+        Existing entries, re-extracted ones replaced in place, then the other new entries.
+    """
+    new_by_url = {entry.youtubeUrl: entry for entry in results[existing_count:]}
+    merged = [new_by_url.pop(entry.youtubeUrl, entry) for entry in results[:existing_count]]
+    return merged + list(new_by_url.values())
+
+
+def _stream_input(path: Path, errors: list[str]) -> Iterator[dict]:
+    """Yield input records one at a time, recording a parse error instead of raising.
+
+    Records are read incrementally (see json_stream.py), so a malformed record
+    part-way through a large file stops the run without losing prior results.
+    A record store yields its fetched YouTube records.
+    """
+    if record_store.is_store_path(path):
+        store = RecordStore(path)
+        try:
+            yield from store.iter("youtube")
+        finally:
+            store.close()
+        return
+    try:
+        yield from iter_records(path)
+    except ValueError as e:
+        error_msg = f"Failed to parse Input file {path}: {e}"
+        print(f"Error: {error_msg}", file=sys.stderr)
+        errors.append(error_msg)
+
+
+def _prioritized_input(path: Path, errors: list[str], score) -> Iterator[dict]:
+    """Yield input records highest priority first.
+
+    A record store is scored up front and its records are then read by key in
+    exact priority order. A small JSON file is sorted in memory; a large one is
+    scored in one pass and read again once per priority tier (rank quarters),
+    each tier in file order, so memory stays flat at the cost of re-parsing.
+    """
+    if record_store.is_store_path(path):
+        store = RecordStore(path)
+        try:
+            scored = [(record.get("url", ""), score(record)) for record in store.iter("youtube")]
+            for url, _ in priority.by_priority(scored, lambda item: item[1]):
+                yield store.get("youtube", url)
+        finally:
+            store.close()
+        return
 
-    filtered = [d for d in data_list if d.get("url") not in existing_urls]
-    skipped = len(data_list) - len(filtered)
+    scores = [score(record) for record in _stream_input(path, errors)]
+    # A parse error stops every pass at the same record (reported by the first pass)
+    count = len(scores)
+    ranked = priority.by_priority(range(count), lambda i: scores[i])
+    if count <= _PRIORITY_EXACT_MAX:
+        records = list(itertools.islice(iter_records(path), count))
+        for index in ranked:
+            yield records[index]
+        return
+    tier_of = [0] * count
+    for rank, index in enumerate(ranked):
+        tier_of[index] = rank * _PRIORITY_TIERS // count
+    for tier in range(_PRIORITY_TIERS):
+        for index, record in enumerate(itertools.islice(iter_records(path), count)):
+            if tier_of[index] == tier:
+                yield record
+
+
+def _peek(records: Iterator[dict]) -> tuple[dict | None, Iterator[dict]]:
+    """Return the first record (or None) and an iterator that still yields it."""
+    first = next(records, None)
+    if first is None:
+        return None, records
+    return first, itertools.chain([first], records)
+
+
+def _shard_filter(records: Iterable[dict], shard: tuple[int, int]) -> Iterator[dict]:
+    """Yield only the records assigned to this shard, reporting the count once exhausted."""
+    index, count = shard
+    total = kept = 0
+    for record in records:
+        total += 1
+        if shards.shard_of(record.get("url", ""), count) == index:
+            kept += 1
+            yield record
+    print(f"Shard {index}/{count}: {kept} of {total} input entry(ies).", file=sys.stderr)
+
+
+def _filter_existing_urls(records: Iterable[dict], existing_urls: set) -> Iterator[dict]:
+    """Yield not-yet-processed entries, reporting the skipped count once exhausted."""
+    skipped = 0
+    for record in records:
+        if record.get("url") in existing_urls:
+            skipped += 1
+            continue
+        yield record
     if skipped:
-        print(f"Skipping {skipped} already-extracted URL(s).", file=sys.stderr)
-    return filtered
+        print(f"Skipped {skipped} already-extracted URL(s).", file=sys.stderr)
+
+
+def _preclassify_filter(
+    records: Iterable[dict], threshold: float, skipped: list[dict]
+) -> Iterator[dict]:
+    """Yield records that pass the local pre-classifier, collecting audit entries for the rest."""
+    total = 0
+    for record in records:
+        total += 1
+        audit = preclassify.classify(record, threshold)
+        if audit is None:
+            yield record
+            continue
+        skipped.append(audit)
+        print(
+            f"Pre-classifier skipped (score {audit['score']}): {record.get('url', 'unknown')}",
+            file=sys.stderr,
+        )
+    print(
+        f"Pre-classifier skipped {len(skipped)} of {total} entry(ies) "
+        f"below threshold {threshold}.",
+        file=sys.stderr,
+    )
+
+
+def _find_duplicate_groups(path: Path, threshold: float) -> list[list[str]]:
+    """Read the input once and group near-duplicate records by URL."""
+    print("Finding near-duplicate videos...", file=sys.stderr)
+    groups = dedupe.find_groups(_stream_input(path, []), threshold)
+    print(
+        f"Found {len(groups)} near-duplicate group(s) covering "
+        f"{sum(len(group) for group in groups)} entry(ies).",
+        file=sys.stderr,
+    )
+    return groups
+
+
+def _dedupe_filter(
+    records: Iterable[dict],
+    group_of: dict[str, int],
+    representatives: dict[int, str],
+    duplicates: list[tuple[str, dict]],
+) -> Iterator[dict]:
+    """Yield the first record of each near-duplicate group and hold back the others.
+
+    Held-back records are collected in `duplicates` as (representative URL, slim
+    record) pairs; _copy_duplicates gives them the representative's metadata.
+    `representatives` may be pre-seeded with already-extracted group members.
+    """
+    for record in records:
+        url = record.get("url")
+        group = group_of.get(url)
+        if group is None or representatives.setdefault(group, url) == url:
+            yield record
+            continue
+        duplicates.append((representatives[group], _slim_record(record)))
+        print(f"Near-duplicate of {representatives[group]}: {url}", file=sys.stderr)
+
+
+def _promote_representatives(
+    duplicates: list[tuple[str, dict]], extracted: Callable[[str], bool]
+) -> tuple[list[tuple[str, dict]], set[str]]:
+    """Replace each representative that failed extraction with its next held-back copy.
+
+    Args:
+        duplicates: Held-back (representative URL, slim record) pairs, in input order.
+        extracted: Whether a URL has an extracted entry.
+
+    Returns:
+        The remaining held-back pairs, re-pointed at the new representatives,
+        and the URLs of the promoted copies, which still need extracting.
+    """
+    replacement: dict[str, str] = {}
+    remaining = []
+    for representative, yt_data in duplicates:
+        if extracted(representative):
+            remaining.append((representative, yt_data))
+        elif representative in replacement:
+            remaining.append((replacement[representative], yt_data))
+        else:
+            replacement[representative] = yt_data.get("url", "")
+            print(
+                f"Extracting near-duplicate {replacement[representative]} instead of "
+                f"{representative}, which failed.",
+                file=sys.stderr,
+            )
+    return remaining, set(replacement.values())
+
+
+def _select_input(path: Path, urls: set[str]) -> Iterator[dict]:
+    """Re-read the input and yield only the records with the given URLs."""
+    return (record for record in _stream_input(path, []) if record.get("url") in urls)
+
+
+def _copy_duplicates(
+    results: list[VideoEntry],
+    duplicates: list[tuple[str, dict]],
+    errors: list[str],
+    telemetry: ExtractionTelemetry | None = None,
+    store: RecordStore | None = None,
+) -> None:
+    """Append an entry for each held-back near-duplicate, copied from its representative.
+
+    Representatives extracted in an earlier run are looked up in `store` when
+    the output is a record store (they are not in `results` then).
+    """
+    by_url = {entry.youtubeUrl: entry for entry in results}
+    for representative, yt_data in duplicates:
+        source = by_url.get(representative)
+        if source is None and store is not None:
+            stored = store.get("extracted", representative)
+            if stored is not None:
+                source = VideoEntry.from_dict(stored)
+        if source is None:
+            errors.append(
+                f"Skipped near-duplicate {yt_data.get('url')}: {representative} was not extracted"
+            )
+            continue
+        # Extracted fields come from the representative, YouTube fields from the copy itself
+        results.append(_copy_entry(source, yt_data.get("url", ""), yt_data))
+        if telemetry is not None:
+            telemetry.increment("near_duplicate_copies")
 
 
 def _process_sequential(
-    youtube_data_list: list[dict],
+    youtube_data: Iterable[dict],
     client: anthropic.Anthropic,
     model: str,
-    results: list[dict],
+    results: list[VideoEntry],
     errors: list[str],
+    telemetry: ExtractionTelemetry | None = None,
+    local_mode: str = "off",
+    executor: RequestExecutor | None = None,
+    chunk_model: str | None = None,
+    chunk_threshold: int = chunked.DEFAULT_CHUNK_THRESHOLD,
 ) -> None:
     """Process videos one at a time through Claude extraction."""
-    for i, yt_data in enumerate(youtube_data_list, 1):
+    for i, yt_data in enumerate(youtube_data, 1):
         url = yt_data.get("url", "unknown")
-        print(f"\n[{i}/{len(youtube_data_list)}] Processing: {url}", file=sys.stderr)
+        print(f"\n[{i}] Processing: {url}", file=sys.stderr)
         try:
-            entry = process_single(yt_data, client, model)
-            results.append(entry)
+            results.append(process_single(
+                yt_data, client, model, telemetry, local_mode, executor,
+                chunk_model, chunk_threshold,
+            ))
         except Exception as e:
             error_msg = f"Failed to process {url}: {e}"
             print(f"  Error: {error_msg}", file=sys.stderr)
             errors.append(error_msg)
 
 
-def _write_output(output_arg: str | None, results: list[dict]) -> None:
-    """Write results to file or stdout."""
-    output_json = json.dumps(results, indent=2, ensure_ascii=False)
+def _process_concurrent(
+    youtube_data: Iterable[dict],
+    client: anthropic.Anthropic,
+    model: str,
+    results: list[VideoEntry],
+    errors: list[str],
+    telemetry: ExtractionTelemetry | None = None,
+    local_mode: str = "off",
+    executor: RequestExecutor | None = None,
+    concurrency: int = 4,
+    chunk_model: str | None = None,
+    chunk_threshold: int = chunked.DEFAULT_CHUNK_THRESHOLD,
+) -> None:
+    """Process videos with up to `concurrency` Claude calls in flight.
 
-    if output_arg:
-        output_path = Path(output_arg)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(output_json)
-            f.write("\n")
+    Input is still consumed lazily: at most 2x `concurrency` records are held
+    at once. Results are appended in input order.
+    """
+    completed: dict[int, VideoEntry] = {}
+    pending: dict = {}
+
+    def drain(return_when: str) -> None:
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            i, url = pending.pop(future)
+            try:
+                completed[i] = future.result()
+            except Exception as e:
+                error_msg = f"Failed to process {url}: {e}"
+                print(f"  Error: {error_msg}", file=sys.stderr)
+                errors.append(error_msg)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, yt_data in enumerate(youtube_data, 1):
+            url = yt_data.get("url", "unknown")
+            print(f"\n[{i}] Processing: {url}", file=sys.stderr)
+            future = pool.submit(
+                process_single, yt_data, client, model, telemetry, local_mode, executor,
+                chunk_model, chunk_threshold,
+            )
+            pending[future] = (i, url)
+            if len(pending) >= 2 * concurrency:
+                drain(FIRST_COMPLETED)
+        while pending:
+            drain(FIRST_COMPLETED)
+
+    results.extend(completed[i] for i in sorted(completed))
+
+
+def _write_output(
+    output_arg: str | None,
+    results: list[VideoEntry],
+    store: RecordStore | None = None,
+    compact: bool = False,
+) -> None:
+    """Write results to file or stdout, or update them in a record store."""
+    if store is not None:
+        store.put_many("extracted", (entry.to_dict() for entry in results))
+        print(f"\nStored {len(results)} entries in {output_arg}.", file=sys.stderr)
+    elif output_arg:
+        video_record.write_json_array(Path(output_arg), results, compact)
         print(f"\nWrote {len(results)} entries to {output_arg}.", file=sys.stderr)
     else:
-        print(output_json)
+        print(video_record.dumps([entry.to_dict() for entry in results], indent=True))
 
 
 def _print_summary(new_count: int, errors: list[str]) -> None:
@@ -708,6 +1549,63 @@ def _print_summary(new_count: int, errors: list[str]) -> None:
         print(f"\nSuccessfully processed {new_count} entry(ies).", file=sys.stderr)
 
 
+def _extract_records(
+    youtube_data: Iterable[dict],
+    client: anthropic.Anthropic,
+    args: argparse.Namespace,
+    results: list[VideoEntry],
+    errors: list[str],
+    telemetry: ExtractionTelemetry,
+    deadline: float | None,
+) -> None:
+    """Extract records in the mode chosen on the command line, appending to results and errors."""
+    if args.batch:
+        batch_results, batch_errors = process_batch(
+            youtube_data, client, args.model, telemetry, args.local_extract
+        )
+        results.extend(batch_results)
+        errors.extend(batch_errors)
+    elif deadline is not None:
+        executor = RequestExecutor(
+            client,
+            telemetry,
+            call_timeout=args.call_timeout,
+            max_retries=args.max_retries,
+            hedge=args.hedge,
+            concurrency=args.concurrency,
+        )
+        routed_results, routed_errors = process_with_deadline(
+            youtube_data, client, args.model, executor, deadline, args.concurrency,
+            telemetry, args.local_extract,
+        )
+        executor.close()
+        results.extend(routed_results)
+        errors.extend(routed_errors)
+    else:
+        executor = RequestExecutor(
+            client,
+            telemetry,
+            call_timeout=args.call_timeout,
+            max_retries=args.max_retries,
+            hedge=args.hedge,
+            # Chunked videos fan out into parallel segment calls
+            concurrency=args.concurrency * (_CHUNK_WORKERS if args.chunked else 1),
+        )
+        chunk_model = args.chunk_model if args.chunked else None
+        if args.concurrency > 1:
+            _process_concurrent(
+                youtube_data, client, args.model, results, errors, telemetry,
+                args.local_extract, executor, args.concurrency,
+                chunk_model, args.chunk_threshold,
+            )
+        else:
+            _process_sequential(
+                youtube_data, client, args.model, results, errors, telemetry,
+                args.local_extract, executor, chunk_model, args.chunk_threshold,
+            )
+        executor.close()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract structured metadata from YouTube data using Claude for AccountabilityAtlas.",
@@ -718,13 +1616,14 @@ def main():
         "-i",
         type=str,
         required=True,
-        help="Input JSON file from fetch_youtube.py.",
+        help="Input JSON array or JSON Lines file from fetch_youtube.py, or a record store (.db).",
     )
     parser.add_argument(
         "--output",
         "-o",
         type=str,
-        help="Output file path for JSON results. If not specified, prints to stdout.",
+        help="Output file path for JSON results, or a record store (.db) updated in place "
+        "(see record_store.py). If not specified, prints to stdout.",
     )
     parser.add_argument(
         "--model",
@@ -745,11 +1644,172 @@ def main():
         action="store_true",
         help="Append to existing output file, skipping URLs already present.",
     )
+    parser.add_argument(
+        "--reextract",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="With --append, extract the videos listed in FILE again and replace their entries "
+        "(e.g. the --changed file of fetch_youtube.py --refresh).",
+    )
+    parser.add_argument(
+        "--priority",
+        action="store_true",
+        help="Extract the most promising videos first (keyword, recency and duration score; "
+        "see priority.py). Output follows the processing order.",
+    )
+    parser.add_argument(
+        "--scores",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="User scores (URL or video ID and a score per line) that override the computed "
+        "priority. Implies --priority.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the JSON output one entry per line, without indentation (smaller and "
+        "faster to write; still a JSON array).",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write per-call token/latency metrics and run totals to this JSON file.",
+    )
+    parser.add_argument(
+        "--preclassify",
+        action="store_true",
+        help="Skip clearly non-accountability videos with a local keyword scorer before calling Claude.",
+    )
+    parser.add_argument(
+        "--preclassify-threshold",
+        type=float,
+        default=preclassify.DEFAULT_THRESHOLD,
+        metavar="SCORE",
+        help="Pre-classifier score below which a video is skipped "
+        f"(default: {preclassify.DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--preclassify-report",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write videos skipped by the pre-classifier, with scores and features, to this JSON file.",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=1,
+        help="Number of concurrent real-time Claude calls (default: 1, sequential).",
+    )
+    parser.add_argument(
+        "--call-timeout",
+        type=float,
+        default=DEFAULT_CALL_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Per-call timeout for real-time requests (default: {DEFAULT_CALL_TIMEOUT:g}).",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f"Retries with exponential backoff for transient errors (default: {DEFAULT_MAX_RETRIES}).",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Send a duplicate request when a call runs longer than the recent p95 latency.",
+    )
+    parser.add_argument(
+        "--local-extract",
+        choices=LOCAL_EXTRACT_MODES,
+        default="off",
+        help="Rule-based extraction of explicit coordinates, dates and states: 'merge' fills "
+        "fields Claude left empty; 'hints' also passes confident values to Claude (default: off).",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=router.parse_deadline,
+        default=None,
+        metavar="WHEN",
+        help="Finish by this time (duration like 6h or 90m, or an ISO timestamp) at the lowest "
+        "cost: use the Batches API where possible and real-time calls for the rest.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shards.parse_shard,
+        default=None,
+        metavar="I/N",
+        help="Process only shard I of N (by video-ID hash) and write an error summary next to "
+        "--output. Merge shard outputs with shards.py.",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Group near-duplicate videos (re-uploads, mirrors) by transcript similarity, "
+        "extract one per group and copy its metadata to the others.",
+    )
+    parser.add_argument(
+        "--dedupe-threshold",
+        type=float,
+        default=dedupe.DEFAULT_THRESHOLD,
+        metavar="SIMILARITY",
+        help="Minimum estimated Jaccard similarity of near-duplicates "
+        f"(default: {dedupe.DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--dedupe-report",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write the near-duplicate groups to this JSON file.",
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Extract long transcripts map-reduce style: evidence from overlapping segments in "
+        "parallel, then one consolidation call (instead of truncating).",
+    )
+    parser.add_argument(
+        "--chunk-model",
+        type=str,
+        default=DEFAULT_MODEL,
+        help=f"Claude model for per-segment evidence calls in --chunked mode (default: {DEFAULT_MODEL}).",
+    )
+    parser.add_argument(
+        "--chunk-threshold",
+        type=int,
+        default=chunked.DEFAULT_CHUNK_THRESHOLD,
+        metavar="CHARS",
+        help="Transcript length above which --chunked splits it "
+        f"(default: {chunked.DEFAULT_CHUNK_THRESHOLD}).",
+    )
 
     args = parser.parse_args()
 
     if args.append and not args.output:
         parser.error("--append requires --output.")
+    if args.reextract and not args.append:
+        parser.error("--reextract requires --append.")
+    if args.compact and not (args.output and not record_store.is_store_path(args.output)):
+        parser.error("--compact requires a JSON --output file.")
+    if args.preclassify_report and not args.preclassify:
+        parser.error("--preclassify-report requires --preclassify.")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1.")
+    if args.chunked and args.batch:
+        parser.error("--chunked cannot be combined with --batch.")
+    if args.dedupe_report and not args.dedupe:
+        parser.error("--dedupe-report requires --dedupe.")
+    if args.shard and not args.output:
+        parser.error("--shard requires --output.")
+    if args.deadline is not None and (args.batch or args.chunked):
+        parser.error("--deadline cannot be combined with --batch or --chunked.")
 
     # Load input data
     input_path = Path(args.input)
@@ -757,14 +1817,52 @@ def main():
         print(f"Error: Input file not found: {args.input}", file=sys.stderr)
         sys.exit(1)
 
-    youtube_data_list = _load_json_array(input_path, "Input file")
-    if not youtube_data_list:
-        print("Error: Input file contains no entries.", file=sys.stderr)
+    # Stream input records; only the first is read up front to validate the file
+    errors = []
+    if args.priority or args.scores:
+        scores = priority.load_scores(Path(args.scores)) if args.scores else None
+        records = _prioritized_input(input_path, errors, priority.scorer(scores, computed=True))
+    else:
+        records = _stream_input(input_path, errors)
+    first, youtube_data = _peek(records)
+    if first is None:
+        if not errors:
+            print("Error: Input file contains no entries.", file=sys.stderr)
         sys.exit(1)
+    if args.shard:
+        youtube_data = _shard_filter(youtube_data, args.shard)
+
+    print(f"Streaming entries from {args.input}.", file=sys.stderr)
 
-    print(f"Loaded {len(youtube_data_list)} entries from {args.input}.", file=sys.stderr)
+    output_store = None
+    if args.output and record_store.is_store_path(args.output):
+        output_store = RecordStore(Path(args.output))
 
-    # Initialize Anthropic client
+    # Load existing entries if appending; a record store is only asked for its URLs
+    existing_entries = []
+    existing_order = []
+    if args.append and output_store is not None:
+        existing_order = output_store.urls("extracted")
+        existing_urls = set(existing_order)
+        print(
+            f"Found {len(existing_urls)} extracted entries in {args.output}.", file=sys.stderr
+        )
+    elif args.append and args.output:
+        existing_entries, existing_urls = _load_existing_output(Path(args.output))
+        existing_order = [entry.youtubeUrl for entry in existing_entries]
+    if args.reextract:
+        reextract = _read_url_file(Path(args.reextract))
+        print(f"Re-extracting {len(reextract & existing_urls)} changed video(s).", file=sys.stderr)
+        existing_urls -= reextract
+    if args.append and args.output:
+        if existing_urls:
+            first, youtube_data = _peek(_filter_existing_urls(youtube_data, existing_urls))
+            if first is None:
+                print("All entries already extracted. Nothing to do.", file=sys.stderr)
+                sys.exit(0)
+
+    # Initialize Anthropic client (only runs with work to do import the SDK)
+    anthropic = import_anthropic()
     try:
         client = anthropic.Anthropic()
     except anthropic.AuthenticationError:
@@ -774,29 +1872,60 @@ def main():
         )
         sys.exit(1)
 
-    # Load existing entries if appending
-    existing_entries = []
-    if args.append and args.output:
-        existing_entries, existing_urls = _load_existing_output(Path(args.output))
-        youtube_data_list = _filter_existing_urls(youtube_data_list, existing_urls)
-
-    if not youtube_data_list and existing_entries:
-        print("All entries already extracted. Nothing to do.", file=sys.stderr)
-        sys.exit(0)
+    preclassified = []
+    if args.preclassify:
+        youtube_data = _preclassify_filter(youtube_data, args.preclassify_threshold, preclassified)
+
+    duplicates = []
+    groups = []
+    if args.dedupe:
+        groups = _find_duplicate_groups(input_path, args.dedupe_threshold)
+        group_of = {url: i for i, group in enumerate(groups) for url in group}
+        # Groups with an already-extracted member copy from it instead
+        representatives = {}
+        for url in existing_order:
+            group = group_of.get(url)
+            if group is not None:
+                representatives.setdefault(group, url)
+        youtube_data = _dedupe_filter(youtube_data, group_of, representatives, duplicates)
 
     # Process entries
     results = list(existing_entries)
-    errors = []
-
-    if args.batch:
-        batch_results, batch_errors = process_batch(youtube_data_list, client, args.model)
-        results.extend(batch_results)
-        errors.extend(batch_errors)
-    else:
-        _process_sequential(youtube_data_list, client, args.model, results, errors)
-
-    _write_output(args.output, results)
-    _print_summary(len(results) - len(existing_entries), errors)
+    telemetry = ExtractionTelemetry()
+    _extract_records(youtube_data, client, args, results, errors, telemetry, args.deadline)
+
+    if duplicates:
+        # A group whose representative failed is extracted from its next copy instead
+        while True:
+            extracted_urls = {entry.youtubeUrl for entry in results}
+            duplicates, promoted = _promote_representatives(
+                duplicates,
+                lambda url: url in extracted_urls
+                or (output_store is not None and output_store.get("extracted", url) is not None),
+            )
+            if not promoted:
+                break
+            # Few records: sent real-time even in --deadline mode
+            _extract_records(
+                _select_input(input_path, promoted), client, args, results, errors, telemetry, None
+            )
+        _copy_duplicates(results, duplicates, errors, telemetry, output_store)
+    new_count = len(results) - len(existing_entries)
+    if args.reextract and output_store is None:
+        results = _replace_reextracted(results, len(existing_entries))
+    _write_output(args.output, results, output_store, args.compact)
+    if output_store is not None:
+        output_store.close()
+    telemetry.print_report()
+    if args.metrics:
+        telemetry.write_json(Path(args.metrics))
+    if args.preclassify_report:
+        preclassify.write_report(Path(args.preclassify_report), preclassified)
+    if args.dedupe_report:
+        dedupe.write_report(Path(args.dedupe_report), groups)
+    if args.shard:
+        shards.write_shard_summary(Path(args.output), args.shard, new_count, errors)
+    _print_summary(new_count, errors)
 
 
 if __name__ == "__main__":
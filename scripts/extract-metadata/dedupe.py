@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for youtube-data records.
+
+Audit channels often re-upload or mirror the same encounter under a new title.
+This module groups such copies so claude_extract.py --dedupe can extract each
+group once and copy the metadata to the other members.
+
+Records are compared on word 5-gram shingles of their transcript and
+description (titles are ignored, since re-uploads usually retitle). Each
+record gets a MinHash signature, and locality-sensitive hashing over bands of
+the signature finds candidate pairs without comparing every pair. Candidates
+are confirmed by their estimated Jaccard similarity and joined with
+union-find. The cost is linear in the number of records:
+
+- one-permutation MinHash: each shingle is hashed once and binned, instead
+  of once per hash function;
+- shingles are hashed as tuples of word hashes in C-level map/zip calls;
+- each record is compared only with earlier records that share one of its
+  LSH band buckets, skipping those already in its group.
+
+Records whose transcript is too short to fingerprint reliably are never
+grouped: shared channel boilerplate in descriptions would otherwise make
+unrelated videos look alike.
+
+Usage:
+    python dedupe.py --input youtube-data.json
+    python dedupe.py --input youtube-data.json --threshold 0.9 --report groups.json
+"""
+
+import argparse
+import json
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+
+from json_stream import iter_records
+
+DEFAULT_THRESHOLD = 0.8
+
+_SHINGLE_WORDS = 5
+_MAX_TEXT_CHARS = 30_000
+# Below this many transcript shingles a record is not fingerprinted.
+_MIN_TRANSCRIPT_SHINGLES = 100
+
+# 64 one-permutation MinHash bins; LSH uses 12 bands of 5 bins, which makes
+# pairs with Jaccard similarity 0.8 candidates with ~99% probability.
+_NUM_BINS = 64
+_BANDS = 12
+_ROWS = 5
+
+# Larger than any MinHash value (a 64-bit hash divided by _NUM_BINS)
+_EMPTY = (1 << 63) - 1
+
+_STRIP_PUNCTUATION = str.maketrans("", "", "\"'.,:;!?()[]{}<>*#-_/|~`")
+
+
+def _shingle_hashes(text: str) -> set[int]:
+    """Hashes of every run of _SHINGLE_WORDS consecutive words in a text.
+
+    Words are hashed with CRC-32 and each shingle as a tuple of those ints.
+    Unlike string hashes, int-tuple hashes are not salted per process, so
+    signatures are reproducible across runs. Everything here runs in C-level
+    map/zip calls, with no per-word Python code.
+    """
+    words = text[:_MAX_TEXT_CHARS].lower().translate(_STRIP_PUNCTUATION).encode("utf-8").split()
+    if len(words) < _SHINGLE_WORDS:
+        return set()
+    wh = list(map(zlib.crc32, words))
+    return set(map(hash, zip(*(wh[i:] for i in range(_SHINGLE_WORDS)))))
+
+
+def signature(record: dict) -> array | None:
+    """Compute a record's MinHash signature, or None if its transcript is too short.
+
+    Args:
+        record: Dictionary from fetch_youtube.py intermediate JSON.
+    """
+    shingles = _shingle_hashes(record.get("transcript") or "")
+    if len(shingles) < _MIN_TRANSCRIPT_SHINGLES:
+        return None
+    shingles |= _shingle_hashes(record.get("description") or "")
+
+    # One-permutation MinHash: the low bits pick a bin, the rest is the value.
+    # In ascending order, the first hash seen in each bin is that bin's minimum.
+    sig = array("q", [_EMPTY]) * _NUM_BINS
+    remaining = _NUM_BINS
+    for h in sorted(shingles):
+        b = h % _NUM_BINS
+        if sig[b] == _EMPTY:
+            sig[b] = h // _NUM_BINS
+            remaining -= 1
+            if not remaining:
+                break
+    return sig
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimate the Jaccard similarity of two records from their signatures."""
+    filled = matching = 0
+    for x, y in zip(a, b):
+        if x == _EMPTY and y == _EMPTY:
+            continue
+        filled += 1
+        matching += x == y
+    return matching / filled if filled else 0.0
+
+
+def find_groups(records: Iterable[dict], threshold: float = DEFAULT_THRESHOLD) -> list[list[str]]:
+    """Group near-duplicate records by URL.
+
+    Args:
+        records: Iterable of dictionaries from fetch_youtube.py intermediate JSON.
+        threshold: Minimum estimated Jaccard similarity to treat two records as copies.
+
+    Returns:
+        Groups of two or more URLs, each in input order, ordered by their first member.
+    """
+    urls: list[str] = []
+    signatures: list[array | None] = []
+    parent: list[int] = []
+    buckets: list[dict[int, list[int]]] = [{} for _ in range(_BANDS)]
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, record in enumerate(records):
+        urls.append(record.get("url", ""))
+        parent.append(i)
+        sig = signature(record)
+        signatures.append(sig)
+        if sig is None:
+            continue
+        for band, bucket in enumerate(buckets):
+            key = hash(tuple(sig[band * _ROWS : (band + 1) * _ROWS]))
+            # Every earlier member is a candidate: a copy of this record may share
+            # a bucket with an unrelated record that happened to land there first
+            members = bucket.setdefault(key, [])
+            for other in members:
+                root_i, root_other = find(i), find(other)
+                if root_i != root_other and similarity(sig, signatures[other]) >= threshold:
+                    parent[max(root_i, root_other)] = min(root_i, root_other)
+            members.append(i)
+
+    members: dict[int, list[str]] = {}
+    for i, url in enumerate(urls):
+        members.setdefault(find(i), []).append(url)
+    return [group for _, group in sorted(members.items()) if len(group) > 1]
+
+
+def write_report(path: Path, groups: list[list[str]]) -> None:
+    """Write near-duplicate groups as a JSON array of URL arrays."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(groups, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Wrote {len(groups)} near-duplicate group(s) to {path}.", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate videos (re-uploads, mirrors) in youtube-data records.",
+    )
+    parser.add_argument(
+        "--input",
+        "-i",
+        type=str,
+        required=True,
+        help="Input JSON array or JSON Lines file from fetch_youtube.py.",
+    )
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum estimated Jaccard similarity of two copies (default: {DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--report",
+        "-r",
+        type=str,
+        default=None,
+        help="Write the groups to this JSON file.",
+    )
+    args = parser.parse_args()
+
+    groups = find_groups(iter_records(Path(args.input)), args.threshold)
+    for group in groups:
+        print(f"GROUP {len(group)}: {group[0]}")
+        for url in group[1:]:
+            print(f"         {url}")
+
+    duplicates = sum(len(group) - 1 for group in groups)
+    print(
+        f"\n{len(groups)} group(s); {duplicates} duplicate(s) can reuse another video's extraction.",
+        file=sys.stderr,
+    )
+    if args.report:
+        write_report(Path(args.report), groups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Deadline-aware request executor for real-time Claude calls.
+
+Wraps ``client.messages.create`` with:
+
+- a per-call timeout, so one stuck request cannot stall a run;
+- exponential-backoff retries (with jitter, honoring ``retry-after``) for
+  retryable errors: timeouts, connection errors, 429s and 5xx/529s;
+- an overall per-request deadline that bounds the time spent across retries;
+- optional hedging: when a call runs longer than the recent p95 latency, a
+  duplicate is sent and whichever finishes first wins. A synchronous SDK call
+  cannot be cancelled, so the losing request runs on until it completes or
+  times out; at most ``concurrency`` hedged pairs are outstanding at once, which
+  keeps losers from starving new requests of worker threads.
+
+Sequential and concurrent modes in claude_extract.py share one executor, so
+retry and hedge counters are per run.
+
+The Anthropic SDK is imported on first use (see import_anthropic), so
+importing this module, e.g. for its defaults, stays cheap.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+from telemetry import ExtractionTelemetry, percentile
+
+DEFAULT_CALL_TIMEOUT = 120.0
+DEFAULT_MAX_RETRIES = 4
+
+# Total time one logical request may take, across all attempts and backoff.
+_REQUEST_DEADLINE = 600.0
+
+_BACKOFF_BASE = 2.0
+_BACKOFF_MAX = 60.0
+
+# Hedging starts once enough latencies have been seen for a meaningful p95.
+_HEDGE_MIN_SAMPLES = 20
+_HEDGE_PERCENTILE = 95
+_LATENCY_WINDOW = 200
+
+_RETRYABLE_STATUS = frozenset({408, 429})
+
+if TYPE_CHECKING:
+    import anthropic
+
+
+def import_anthropic():
+    """Import the Anthropic SDK on first use and return the module.
+
+    The SDK and the HTTP stack it pulls in take most of claude_extract.py's
+    startup time, so --help, argument errors and runs with nothing to extract
+    never load it. Exits with install instructions if the package is missing.
+    """
+    try:
+        import anthropic
+    except ImportError:
+        print(
+            "Error: 'anthropic' package is not installed. "
+            "Run: pip install -r requirements.txt",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return anthropic
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an Anthropic SDK error is transient and worth retrying."""
+    anthropic = import_anthropic()
+    if isinstance(error, (anthropic.APITimeoutError, anthropic.APIConnectionError)):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Read a retry-after header (in seconds) from an API error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestExecutor:
+    """Runs Claude message requests with timeouts, retries and optional hedging."""
+
+    def __init__(
+        self,
+        client: anthropic.Anthropic,
+        telemetry: ExtractionTelemetry | None = None,
+        call_timeout: float = DEFAULT_CALL_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        hedge: bool = False,
+        concurrency: int = 1,
+    ):
+        # Retries are handled here so they can be counted and bounded by the deadline
+        self._client = client.with_options(max_retries=0)
+        self._telemetry = telemetry
+        self.call_timeout = call_timeout
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        # Threads: one primary per in-flight request, plus one per hedge slot for the
+        # duplicate or, once its pair is decided, the losing request still running
+        self._pool = ThreadPoolExecutor(max_workers=2 * concurrency) if hedge else None
+        self._hedge_slots = threading.BoundedSemaphore(concurrency)
+
+    def close(self) -> None:
+        """Release hedge worker threads (losing duplicates are not waited for)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def _count(self, name: str) -> None:
+        if self._telemetry is not None:
+            self._telemetry.increment(name)
+
+    def create_message(self, **params):
+        """Send a ``messages.create`` request, retrying transient failures.
+
+        Raises:
+            The last error once it is not retryable, retries are exhausted,
+            or the next attempt could not finish before the request deadline.
+        """
+        deadline = time.monotonic() + _REQUEST_DEADLINE
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                return self._attempt(params, min(self.call_timeout, remaining))
+            except Exception as e:
+                if isinstance(e, import_anthropic().APITimeoutError):
+                    self._count("timeouts")
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(_BACKOFF_MAX, _BACKOFF_BASE**attempt) * random.uniform(0.5, 1.0)
+                if time.monotonic() + delay >= deadline:
+                    self._count("deadline_exceeded")
+                    raise
+                attempt += 1
+                self._count("retries")
+                time.sleep(delay)
+
+    def _timed_call(self, params: dict, timeout: float):
+        started = time.monotonic()
+        response = self._client.messages.create(**params, timeout=timeout)
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+        return response
+
+    def _hedge_delay(self) -> float | None:
+        """Seconds after which a duplicate is sent, or None if there is no p95 yet."""
+        with self._lock:
+            if len(self._latencies) < _HEDGE_MIN_SAMPLES:
+                return None
+            return percentile(list(self._latencies), _HEDGE_PERCENTILE)
+
+    def _release_slot_when_done(self, futures: list) -> None:
+        """Free a hedge slot once every request of the hedged pair has finished."""
+        pending = [len(futures)]
+
+        def finished(_future):
+            with self._lock:
+                pending[0] -= 1
+                last = pending[0] == 0
+            if last:
+                self._hedge_slots.release()
+
+        for future in futures:
+            future.add_done_callback(finished)
+
+    def _attempt(self, params: dict, timeout: float):
+        """Make one attempt, hedging with a duplicate if it runs past the p95 latency."""
+        hedge_after = self._hedge_delay() if self.hedge else None
+        if hedge_after is None or hedge_after >= timeout:
+            return self._timed_call(params, timeout)
+
+        primary = self._pool.submit(self._timed_call, params, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # Every hedge slot is held by a pair whose loser is still running
+        if not self._hedge_slots.acquire(blocking=False):
+            self._count("hedges_skipped")
+            return primary.result()
+        self._count("hedges")
+        duplicate = self._pool.submit(self._timed_call, params, timeout - hedge_after)
+        self._release_slot_when_done([primary, duplicate])
+        pending = {primary, duplicate}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is duplicate:
+                        self._count("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        raise error
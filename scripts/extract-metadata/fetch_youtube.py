@@ -10,9 +10,14 @@ Usage:
     python fetch_youtube.py --file urls.txt --output youtube-data.json
     python fetch_youtube.py --file urls.txt --output youtube-data.json --no-transcript
     python fetch_youtube.py --file urls.txt --output youtube-data.json --append
+    python fetch_youtube.py --file urls.txt --output videos.db --append
+    python fetch_youtube.py --output youtube-data.json --refresh --changed changed.txt
+    python fetch_youtube.py --file urls.txt --output youtube-data.json --append --scores scores.txt
+    python fetch_youtube.py --file urls.txt --output youtube-data.json --append --compact
 """
 
 import argparse
+import hashlib
 import json
 import re
 import sys
@@ -20,29 +25,69 @@ import tempfile
 import time
 from pathlib import Path
 
-try:
-    import yt_dlp
-except ImportError:
-    print(
-        "Error: 'yt-dlp' package is not installed. "
-        "Run: pip install -r requirements.txt",
-        file=sys.stderr,
-    )
-    sys.exit(1)
+import priority
+import record_store
+import video_record
+import ytdl_daemon
+from record_store import RecordStore
+from shards import video_id
+from video_record import YouTubeRecord
 
 
 # --- YouTube fetching ---
 
 
+def _base_ydl_opts(cookies_from_browser: str | None) -> dict:
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "ignore_no_formats_error": True,
+        "sleep_requests": 0.75,
+        "sleep_interval": 2,
+    }
+    if cookies_from_browser:
+        ydl_opts["cookiesfrombrowser"] = (cookies_from_browser,)
+    return ydl_opts
+
+
+def _fingerprint(title: str | None, description: str | None, has_captions: bool) -> str:
+    """Hash the fields whose changes are worth a refetch and re-extraction."""
+    data = json.dumps([title or "", description or "", has_captions], ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def metadata_fingerprint(info: dict) -> str:
+    """Fingerprint a yt-dlp info dict: title, description and English caption availability."""
+    has_captions = "en" in (info.get("subtitles") or {}) or "en" in (
+        info.get("automatic_captions") or {}
+    )
+    return _fingerprint(info.get("title"), info.get("description"), has_captions)
+
+
+def fetch_fingerprint(url: str, cookies_from_browser: str | None = None) -> str:
+    """Fetch a video's metadata without subtitles and return its fingerprint.
+
+    This still loads the watch page, as a full fetch does; it saves the
+    subtitle downloads (and their sleep_subtitles pauses) and format
+    selection, not the page request itself.
+    """
+    with ytdl_daemon.youtube_dl(_base_ydl_opts(cookies_from_browser)) as ydl:
+        # process=False skips format selection; subtitles are listed but not fetched
+        info = ydl.extract_info(url, download=False, process=False)
+    return metadata_fingerprint(info)
+
+
 def fetch_youtube_metadata(
     url: str,
     include_transcript: bool = True,
     cookies_from_browser: str | None = None,
-) -> dict:
+) -> YouTubeRecord:
     """Fetch video metadata and optionally transcript from YouTube using yt-dlp.
 
     Subtitles are downloaded by yt-dlp to a temp directory (rather than fetched
     separately) so that cookies and rate-limit handling are applied consistently.
+    Runs in the yt-dlp daemon (see ytdl_daemon.py) when one is running.
 
     Args:
         url: YouTube video URL.
@@ -50,20 +95,11 @@ def fetch_youtube_metadata(
         cookies_from_browser: Browser name to read cookies from (e.g., "firefox").
 
     Returns:
-        Dictionary with keys: url, title, description, channel, thumbnail,
-        duration, published (str or None), transcript (str or None).
+        The video's record: url, title, description, channel, thumbnail,
+        duration, published (str or None), transcript (str or None) and
+        fingerprint (see metadata_fingerprint).
     """
-    ydl_opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "skip_download": True,
-        "ignore_no_formats_error": True,
-        "sleep_requests": 0.75,
-        "sleep_interval": 2,
-    }
-
-    if cookies_from_browser:
-        ydl_opts["cookiesfrombrowser"] = (cookies_from_browser,)
+    ydl_opts = _base_ydl_opts(cookies_from_browser)
 
     if include_transcript:
         ydl_opts.update(
@@ -79,7 +115,7 @@ def fetch_youtube_metadata(
     with tempfile.TemporaryDirectory() as tmpdir:
         ydl_opts["outtmpl"] = str(Path(tmpdir) / "%(id)s.%(ext)s")
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with ytdl_daemon.youtube_dl(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
 
         transcript = None
@@ -88,16 +124,17 @@ def fetch_youtube_metadata(
 
     thumbnail = _pick_best_thumbnail(info)
 
-    return {
-        "url": info.get("webpage_url") or url,
-        "title": info.get("title", ""),
-        "description": info.get("description", ""),
-        "channel": info.get("channel") or info.get("uploader", ""),
-        "thumbnail": thumbnail,
-        "duration": info.get("duration"),
-        "published": info.get("upload_date"),
-        "transcript": transcript,
-    }
+    return YouTubeRecord(
+        url=info.get("webpage_url") or url,
+        title=info.get("title", ""),
+        description=info.get("description", ""),
+        channel=info.get("channel") or info.get("uploader", ""),
+        thumbnail=thumbnail,
+        duration=info.get("duration"),
+        published=info.get("upload_date"),
+        transcript=transcript,
+        fingerprint=metadata_fingerprint(info),
+    )
 
 
 def _read_subtitle_file(tmpdir: str, video_id: str) -> str | None:
@@ -227,22 +264,27 @@ def _collect_urls(args) -> list[str]:
     return urls
 
 
-def _write_json_output(path: Path, data: list) -> None:
-    """Write a JSON array to a file."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+def _prioritize_urls(urls: list[str], scores_path: Path) -> list[str]:
+    """Order URLs by user score, highest first; unscored URLs score 0 and keep their order."""
+    scores = priority.load_scores(scores_path)
+    scored = sum(1 for url in urls if video_id(url) in scores)
+    print(f"Ordering {len(urls)} URL(s) by priority ({scored} scored).", file=sys.stderr)
+    return priority.by_priority(urls, priority.scorer(scores, computed=False))
+
 
+def _write_json_output(path: Path, data: list[YouTubeRecord], compact: bool = False) -> None:
+    """Write records to a JSON array file (see video_record.write_json_array)."""
+    video_record.write_json_array(path, data, compact)
 
-def _load_existing_output(output_path: Path) -> tuple[list, set]:
+
+def _load_existing_output(output_path: Path) -> tuple[list[YouTubeRecord], set]:
     """Load existing entries from output file for append mode."""
     if not output_path.exists():
         return [], set()
 
     try:
-        with open(output_path, "r", encoding="utf-8") as f:
-            entries = json.load(f)
-    except json.JSONDecodeError as e:
+        entries = video_record.load_json_array(output_path)
+    except ValueError as e:
         print(f"Error: Failed to parse existing file {output_path}: {e}", file=sys.stderr)
         sys.exit(1)
 
@@ -250,19 +292,35 @@ def _load_existing_output(output_path: Path) -> tuple[list, set]:
         print(f"Error: Existing file {output_path} does not contain a JSON array.", file=sys.stderr)
         sys.exit(1)
 
-    urls = {entry.get("url") for entry in entries}
+    entries = [YouTubeRecord.from_dict(entry) for entry in entries]
+    urls = {entry.url for entry in entries}
     print(f"Loaded {len(entries)} existing entries from {output_path}.", file=sys.stderr)
     return entries, urls
 
 
+def _load_store_urls(store: RecordStore) -> set:
+    """Return the URLs already fetched into a record store, for append mode."""
+    urls = set(store.urls("youtube"))
+    print(f"Found {len(urls)} fetched video(s) in {store.path}.", file=sys.stderr)
+    return urls
+
+
 def _validate_args(parser, args) -> None:
     """Validate CLI argument combinations."""
-    if not args.url and not args.file:
+    if not args.url and not args.file and not args.refresh:
         parser.error("Provide either a URL argument or --file with a file of URLs.")
     if args.url and args.file:
         parser.error("Provide either a URL argument or --file, not both.")
     if args.append and not args.output:
         parser.error("--append requires --output.")
+    if args.refresh and not args.output:
+        parser.error("--refresh requires --output.")
+    if args.refresh and args.append:
+        parser.error("--refresh already skips unchanged videos; drop --append.")
+    if args.changed and not args.refresh:
+        parser.error("--changed requires --refresh.")
+    if args.compact and not (args.output and not record_store.is_store_path(args.output)):
+        parser.error("--compact requires a JSON --output file.")
 
 
 def _filter_existing_urls(urls: list[str], existing_urls: set) -> list[str]:
@@ -277,7 +335,7 @@ def _filter_existing_urls(urls: list[str], existing_urls: set) -> list[str]:
     return filtered
 
 
-def _is_rate_limited(error: Exception) -> bool:
+def is_rate_limited(error: Exception) -> bool:
     """Check if an error indicates YouTube rate limiting."""
     return "429" in str(error)
 
@@ -288,12 +346,16 @@ def _fetch_all(
     cookies_from_browser: str | None,
     output_path: Path | None,
     delay: float,
-    results: list[dict],
+    results: list[YouTubeRecord],
+    store: RecordStore | None = None,
+    compact: bool = False,
 ) -> list[str]:
     """Fetch metadata for all URLs, writing incrementally. Returns errors list.
 
     Stops immediately on rate limiting (429) since subsequent requests
-    will also fail. Progress is preserved via incremental writes.
+    will also fail. Progress is preserved via incremental writes: a JSON
+    output file is rewritten after each video, while a record store only
+    writes the new record.
     """
     errors = []
 
@@ -306,16 +368,18 @@ def _fetch_all(
             )
             results.append(data)
 
-            if include_transcript and data.get("transcript") is None:
+            if include_transcript and data.transcript is None:
                 print("  Warning: No transcript available for this video.", file=sys.stderr)
-            print(f"  Done: {data.get('title', 'Unknown')}", file=sys.stderr)
+            print(f"  Done: {data.title or 'Unknown'}", file=sys.stderr)
 
-            if output_path:
-                _write_json_output(output_path, results)
+            if store is not None:
+                store.put("youtube", data.to_dict())
+            elif output_path:
+                _write_json_output(output_path, results, compact)
             if delay > 0 and i < len(urls):
                 time.sleep(delay)
         except Exception as e:
-            if _is_rate_limited(e):
+            if is_rate_limited(e):
                 remaining = len(urls) - i
                 print(
                     "\n  Rate limited by YouTube (HTTP 429). Stopping.",
@@ -338,18 +402,165 @@ def _fetch_all(
     return errors
 
 
+def _refresh_changed(
+    records: list[YouTubeRecord],
+    indexes: list[int],
+    include_transcript: bool,
+    cookies_from_browser: str | None,
+    output_path: Path,
+    delay: float,
+    store: RecordStore | None = None,
+    compact: bool = False,
+) -> tuple[list[str], int, list[str], bool]:
+    """Re-check fetched records and refetch the ones whose fingerprint changed.
+
+    Each record is checked with a request that skips subtitles (see
+    fetch_fingerprint); only changed videos are fetched in full (with their
+    transcript) and replaced in place. Records fetched before fingerprints
+    were stored have nothing to compare against: they get the current
+    fingerprint and count as unchanged. Like _fetch_all, stops on rate
+    limiting and saves progress as it goes.
+
+    Args:
+        records: All fetched records (updated in place).
+        indexes: Positions in `records` of the records to check.
+        include_transcript: Whether refetches include the transcript.
+        cookies_from_browser: Browser name to read cookies from.
+        output_path: JSON output file, rewritten after each refetch.
+        delay: Seconds to wait between videos.
+        store: Record store to update instead of the JSON file.
+        compact: Write the JSON file one record per line.
+
+    Returns:
+        Tuple of (changed URLs, unchanged count, errors list, whether rate limited).
+    """
+    changed = []
+    unchanged = 0
+    errors = []
+    unsaved = False  # Fingerprints recorded since the JSON file was last written
+    for n, i in enumerate(indexes, 1):
+        url = records[i].url
+        print(f"[{n}/{len(indexes)}] Checking: {url}", file=sys.stderr)
+        try:
+            fingerprint = fetch_fingerprint(url, cookies_from_browser)
+            if records[i].fingerprint is None:
+                print("  No stored fingerprint; recorded the current one.", file=sys.stderr)
+                records[i].fingerprint = fingerprint
+                unchanged += 1
+                if store is not None:
+                    store.put("youtube", records[i].to_dict())
+                else:
+                    unsaved = True
+                continue
+            if fingerprint == records[i].fingerprint:
+                unchanged += 1
+                continue
+            print("  Changed; refetching.", file=sys.stderr)
+            data = fetch_youtube_metadata(
+                url, include_transcript=include_transcript,
+                cookies_from_browser=cookies_from_browser,
+            )
+        except Exception as e:
+            if is_rate_limited(e):
+                print(
+                    f"\n  Rate limited by YouTube (HTTP 429). Stopping with "
+                    f"{len(indexes) - n + 1} video(s) left to check.",
+                    file=sys.stderr,
+                )
+                errors.append(f"Rate limited at video {n}/{len(indexes)}: {url}")
+                if unsaved:
+                    _write_json_output(output_path, records, compact)
+                return changed, unchanged, errors, True
+            error_msg = f"Failed to refresh {url}: {e}"
+            print(f"  Error: {error_msg}", file=sys.stderr)
+            errors.append(error_msg)
+            continue
+
+        records[i] = data
+        changed.append(url)
+        if store is not None:
+            store.put("youtube", data.to_dict())
+            # Extracted from the old metadata; claude_extract.py --append redoes it
+            store.clear("extracted", [url])
+        else:
+            _write_json_output(output_path, records, compact)
+            unsaved = False
+        if delay > 0 and n < len(indexes):
+            time.sleep(delay)
+    if unsaved:
+        _write_json_output(output_path, records, compact)
+    return changed, unchanged, errors, False
+
+
+def _run_refresh(args, urls: list[str], output_path: Path, store: RecordStore | None) -> None:
+    """Refresh mode: re-check fetched videos, refetch changed ones, fetch new ones."""
+    if store is not None:
+        records = [YouTubeRecord.from_dict(record) for record in store.iter("youtube")]
+    else:
+        records, _ = _load_existing_output(output_path)
+    position = {record.url: i for i, record in enumerate(records)}
+    if urls:
+        indexes = [position[url] for url in urls if url in position]
+        new_urls = [url for url in urls if url not in position]
+    else:
+        indexes = list(range(len(records)))
+        new_urls = []
+    print(f"Checking {len(indexes)} fetched video(s) for changes.", file=sys.stderr)
+
+    include_transcript = not args.no_transcript
+    changed, unchanged, errors, rate_limited = _refresh_changed(
+        records, indexes, include_transcript, args.cookies_from_browser, output_path,
+        args.delay, store, args.compact,
+    )
+    fetched_before = len(records)
+    if new_urls and not rate_limited:
+        print(f"\nFetching {len(new_urls)} new video(s).", file=sys.stderr)
+        errors += _fetch_all(
+            new_urls, include_transcript, args.cookies_from_browser, output_path, args.delay,
+            records, store, args.compact,
+        )
+    if store is not None:
+        store.close()
+
+    if args.changed:
+        with open(args.changed, "w", encoding="utf-8") as f:
+            f.writelines(f"{url}\n" for url in changed)
+
+    print(
+        f"\n{unchanged} video(s) unchanged, {len(changed)} changed and refetched, "
+        f"{len(records) - fetched_before} new fetched.",
+        file=sys.stderr,
+    )
+    if changed:
+        if store is not None:
+            hint = "their extracted entries were cleared; re-run claude_extract.py --append."
+        elif args.changed:
+            hint = f"re-extract them with claude_extract.py --append --reextract {args.changed}."
+        else:
+            hint = "use --changed FILE to list them for claude_extract.py --reextract."
+        print(f"Changed videos: {hint}", file=sys.stderr)
+    if errors:
+        print(f"\nCompleted with {len(errors)} error(s):", file=sys.stderr)
+        for err in errors:
+            print(f"  - {err}", file=sys.stderr)
+        sys.exit(1 if not changed and len(records) == fetched_before else 0)
+
+
 def _print_summary(
     output_path: Path | None,
     output_arg: str | None,
-    results: list[dict],
+    results: list[YouTubeRecord],
     existing_count: int,
     errors: list[str],
+    store: RecordStore | None = None,
 ) -> None:
     """Print final output and summary."""
-    if output_path:
+    if store is not None:
+        print(f"\nStored {len(results)} fetched video(s) in {output_arg}.", file=sys.stderr)
+    elif output_path:
         print(f"\nWrote {len(results)} entries to {output_arg}.", file=sys.stderr)
     else:
-        print(json.dumps(results, indent=2, ensure_ascii=False))
+        print(video_record.dumps([record.to_dict() for record in results], indent=True))
 
     new_count = len(results) - existing_count
     if errors:
@@ -380,7 +591,14 @@ def main():
         "--output",
         "-o",
         type=str,
-        help="Output file path for JSON results. If not specified, prints to stdout.",
+        help="Output file path for JSON results, or a record store (.db) updated in place "
+        "(see record_store.py). If not specified, prints to stdout.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the JSON output one record per line, without indentation (smaller and "
+        "faster to rewrite; still a JSON array).",
     )
     parser.add_argument(
         "--no-transcript",
@@ -407,18 +625,58 @@ def main():
         metavar="BROWSER",
         help="Browser to read YouTube cookies from (e.g., firefox, chrome). Raises rate limits ~6x.",
     )
+    parser.add_argument(
+        "--scores",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Fetch URLs highest user score first (URL or video ID and a score per line; "
+        "unscored URLs score 0). list_channel.py --priority orders its output the same way.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-check videos already in --output (all, or those in the URL/--file) with a "
+        "request that skips subtitles; refetch only those whose title, description or caption "
+        "availability changed. New URLs are fetched as with --append.",
+    )
+    parser.add_argument(
+        "--changed",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="With --refresh, write the URLs of changed videos to this file "
+        "(for claude_extract.py --reextract).",
+    )
 
     args = parser.parse_args()
     _validate_args(parser, args)
 
-    urls = _collect_urls(args)
-    if not urls:
+    urls = _collect_urls(args) if args.url or args.file else []
+    if not urls and not args.refresh:
         print("Error: No URLs to process.", file=sys.stderr)
         sys.exit(1)
+    if args.scores:
+        urls = _prioritize_urls(urls, Path(args.scores))
+
+    output_path = Path(args.output) if args.output else None
+    store = None
+    if output_path and record_store.is_store_path(output_path):
+        store = RecordStore(output_path)
+
+    if args.refresh:
+        _run_refresh(args, urls, output_path, store)
+        return
 
     # Load existing entries if appending
     existing_entries = []
-    if args.append and args.output:
+    if args.append and store is not None:
+        existing_urls = _load_store_urls(store)
+        urls = _filter_existing_urls(urls, existing_urls)
+        if not urls:
+            print("All URLs already fetched. Nothing to do.", file=sys.stderr)
+            sys.exit(0)
+    elif args.append and args.output:
         existing_entries, existing_urls = _load_existing_output(Path(args.output))
         urls = _filter_existing_urls(urls, existing_urls)
 
@@ -427,7 +685,6 @@ def main():
         sys.exit(0)
 
     results = list(existing_entries)
-    output_path = Path(args.output) if args.output else None
     if output_path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -438,9 +695,13 @@ def main():
         output_path=output_path,
         delay=args.delay,
         results=results,
+        store=store,
+        compact=args.compact,
     )
+    if store is not None:
+        store.close()
 
-    _print_summary(output_path, args.output, results, len(existing_entries), errors)
+    _print_summary(output_path, args.output, results, len(existing_entries), errors, store)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+"""
+Incremental readers for large youtube-data input files.
+
+``json.load`` materializes every record (and every transcript) at once. These
+readers yield one record at a time from either a top-level JSON array (the
+format written by fetch_youtube.py) or JSON Lines, so memory use is bounded by
+the largest single record rather than the whole file.
+"""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+_CHUNK_SIZE = 1 << 20  # 1 MiB
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = _WHITESPACE + ",]"
+
+# A value cut off by the end of the buffer fails to decode within this many
+# characters of the end ("-Infinit", a half-read \uXXXX escape), or as a string
+# left unterminated. Any other decode error is malformed input.
+_TRUNCATION_MARGIN = 10
+
+_decoder = json.JSONDecoder()
+
+
+class _CharReader:
+    """Buffered text reader that exposes a growable window over the file."""
+
+    def __init__(self, f):
+        self._f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, discarding consumed text. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self._f.read(_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> str | None:
+        """Advance past whitespace and return the next character (None at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def decode_value(self):
+        """Decode one JSON value at the current position, reading more as needed."""
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # Only read on if the value may continue past the buffered text;
+                # reading the rest of the file would not fix a malformed record
+                truncated = e.pos >= len(self.buf) - _TRUNCATION_MARGIN or e.msg.startswith(
+                    "Unterminated string"
+                )
+                if truncated and self.fill():
+                    continue
+                raise
+            # A bare number cut at the buffer edge ("12" of "12.5") decodes early;
+            # only trust it once the following delimiter has been read
+            if (
+                isinstance(value, (int, float))
+                and (end == len(self.buf) or self.buf[end] not in _DELIMITERS)
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(path: Path) -> Iterator[dict]:
+    """Yield elements of a top-level JSON array one at a time.
+
+    Raises:
+        ValueError: If the file is not a JSON array or is malformed
+            (``json.JSONDecodeError`` is a ValueError subclass).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _CharReader(f)
+        if reader.skip_whitespace() != "[":
+            raise ValueError("does not contain a JSON array")
+        reader.pos += 1
+
+        if reader.skip_whitespace() == "]":
+            return
+
+        while True:
+            if reader.skip_whitespace() is None:
+                raise ValueError("unexpected end of file inside JSON array")
+            yield reader.decode_value()
+
+            sep = reader.skip_whitespace()
+            if sep == ",":
+                reader.pos += 1
+            elif sep == "]":
+                return
+            elif sep is None:
+                raise ValueError("unexpected end of file inside JSON array")
+            else:
+                raise ValueError(f"expected ',' or ']' in JSON array, got {sep!r}")
+
+
+def iter_jsonl(path: Path) -> Iterator[dict]:
+    """Yield one JSON value per non-blank line of a JSON Lines file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {line_no}: {e}") from e
+
+
+def _first_char(path: Path) -> str | None:
+    """Return the first non-whitespace character of a file, or None if it is blank."""
+    with open(path, "r", encoding="utf-8") as f:
+        while chunk := f.read(4096):
+            stripped = chunk.lstrip()
+            if stripped:
+                return stripped[0]
+    return None
+
+
+def iter_records(path: Path) -> Iterator[dict]:
+    """Yield records from a JSON array or JSON Lines file, detected by its first character."""
+    if _first_char(path) == "{":
+        return iter_jsonl(path)
+    return iter_json_array(path)
@@ -0,0 +1,437 @@
+"""
+Rule-based extraction of explicit coordinates, dates and US states.
+
+Copying coordinates that are spelled out in a description, converting an
+absolute date to YYYY-MM-DD, or resolving "yesterday" against the publication
+date are mechanical tasks. This module handles them with precompiled patterns
+so claude_extract.py can merge the results into its output, and optionally pass
+high-confidence values to Claude as hints so it can skip re-deriving them.
+
+Each extracted value is returned with a confidence score and the source text
+it was read from:
+
+    {
+        "coordinates": {"latitude": 30.2672, "longitude": -97.7431,
+                        "confidence": 0.95, "source": "30.2672, -97.7431"},
+        "videoDate": {"value": "2024-03-15", "confidence": 0.9, "source": "March 15, 2024"},
+        "state": {"value": "TX", "confidence": 0.85, "source": "Texas"},
+    }
+
+Missing values are None.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+
+from video_record import VideoEntry
+
+# Local results at or above this confidence are passed to Claude as hints.
+HINT_MIN_CONFIDENCE = 0.8
+
+# A state only fills Claude's gap when its confidence is above this. A lone bare
+# code ("NY" in an all-caps title) scores exactly this and is not merged; a state
+# name, an address-like ", XX" or a repeated code is. (Dates carry their own
+# confidence into the output, where seed-videos.sh filters low values.)
+_STATE_MERGE_MIN_CONFIDENCE = 0.75
+
+# Highest confidence a date found in free text gets when it fills Claude's null
+# videoDate. It may be an upload or court date rather than the encounter's, so it
+# stays below the seeder's 0.5 date threshold: it is kept for review, not seeded.
+_FILLED_DATE_MAX_CONFIDENCE = 0.45
+
+# --- Coordinates ---
+
+_DECIMAL_COORDS_RE = re.compile(
+    r"(?<![\d.])(-?\d{1,2}\.\d{3,})\s*°?\s*([NS])?\s*[,/ ]\s*"
+    r"(-?\d{1,3}\.\d{3,})\s*°?\s*([EW])?(?!\.?\d)",
+    re.IGNORECASE,
+)
+
+_DMS_COORDS_RE = re.compile(
+    r"(\d{1,2})°\s*(\d{1,2})['′]\s*(\d{1,2}(?:\.\d+)?)[\"″]\s*([NS])[,\s]+"
+    r"(\d{1,3})°\s*(\d{1,2})['′]\s*(\d{1,2}(?:\.\d+)?)[\"″]\s*([EW])",
+    re.IGNORECASE,
+)
+
+# Rough bounding box for the US (including Alaska and Hawaii)
+_US_LAT_RANGE = (18.0, 72.0)
+_US_LNG_RANGE = (-180.0, -65.0)
+
+
+def _in_us(lat: float, lng: float) -> bool:
+    """Whether a coordinate pair falls in the (rough) US bounding box.
+
+    Encounters are US-only, so pairs elsewhere are version numbers, prices or
+    other decimal noise rather than locations.
+    """
+    return (
+        _US_LAT_RANGE[0] <= lat <= _US_LAT_RANGE[1]
+        and _US_LNG_RANGE[0] <= lng <= _US_LNG_RANGE[1]
+    )
+
+
+def _signed(value: float, hemisphere: str | None, negative: str) -> float:
+    """Apply an N/S/E/W hemisphere letter to an unsigned coordinate."""
+    if hemisphere and hemisphere.upper() == negative:
+        return -abs(value)
+    return value
+
+
+def extract_coordinates(text: str) -> dict | None:
+    """Find the first explicit latitude/longitude pair in text."""
+    for match in _DMS_COORDS_RE.finditer(text):
+        d1, m1, s1, ns, d2, m2, s2, ew = match.groups()
+        lat = _signed(int(d1) + int(m1) / 60 + float(s1) / 3600, ns, "S")
+        lng = _signed(int(d2) + int(m2) / 60 + float(s2) / 3600, ew, "W")
+        if _in_us(lat, lng):
+            return _coords_result(lat, lng, match.group(0))
+
+    for match in _DECIMAL_COORDS_RE.finditer(text):
+        lat_s, ns, lng_s, ew = match.groups()
+        lat = _signed(float(lat_s), ns, "S")
+        lng = _signed(float(lng_s), ew, "W")
+        if _in_us(lat, lng):
+            return _coords_result(lat, lng, match.group(0))
+
+    return None
+
+
+def _coords_result(lat: float, lng: float, source: str) -> dict:
+    return {
+        "latitude": round(lat, 6),
+        "longitude": round(lng, 6),
+        "confidence": 0.95,
+        "source": source.strip(),
+    }
+
+
+# --- Dates ---
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_PATTERN = (
+    r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+
+_ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_US_NUMERIC_DATE_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\b")
+_MONTH_DAY_RE = re.compile(
+    _MONTH_PATTERN + r"\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(\d{4})\b)?",
+    re.IGNORECASE,
+)
+_DAY_MONTH_RE = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?" + _MONTH_PATTERN + r",?\s+(\d{4})\b",
+    re.IGNORECASE,
+)
+
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+_YESTERDAY_RE = re.compile(r"\byesterday\b", re.IGNORECASE)
+_DAYS_AGO_RE = re.compile(
+    r"\b(\d{1,2}|" + "|".join(_NUMBER_WORDS) + r")\s+days?\s+ago\b",
+    re.IGNORECASE,
+)
+_LAST_WEEKDAY_RE = re.compile(r"\blast\s+(" + "|".join(_WEEKDAYS) + r")\b", re.IGNORECASE)
+
+_MIN_YEAR = 1990
+
+
+def _parse_published(published: str | None) -> date | None:
+    """Parse a yt-dlp upload_date (YYYYMMDD)."""
+    if not published:
+        return None
+    try:
+        return datetime.strptime(published, "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def _make_date(year: int, month: int, day: int) -> date | None:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _plausible(d: date | None, published: date | None) -> bool:
+    """An encounter date must not be implausibly old or after publication."""
+    if d is None or d.year < _MIN_YEAR:
+        return False
+    return published is None or d <= published
+
+
+def _absolute_dates(text: str, published: date | None) -> list[tuple[date, float, str]]:
+    """Find absolute dates in text as (date, confidence, source) in order of appearance."""
+    found = []
+
+    for match in _ISO_DATE_RE.finditer(text):
+        d = _make_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        found.append((match.start(), d, 0.9, match.group(0)))
+
+    for match in _US_NUMERIC_DATE_RE.finditer(text):
+        year = int(match.group(3))
+        if year < 100:
+            year += 2000
+        d = _make_date(year, int(match.group(1)), int(match.group(2)))
+        found.append((match.start(), d, 0.85, match.group(0)))
+
+    for match in _DAY_MONTH_RE.finditer(text):
+        if not match.group(2)[0].isupper():
+            continue
+        month = _MONTHS[match.group(2)[:3].lower()]
+        d = _make_date(int(match.group(3)), month, int(match.group(1)))
+        found.append((match.start(), d, 0.9, match.group(0)))
+
+    for match in _MONTH_DAY_RE.finditer(text):
+        # Lowercase "may 2 officers" is not a date
+        if not match.group(1)[0].isupper():
+            continue
+        month = _MONTHS[match.group(1)[:3].lower()]
+        day = int(match.group(2))
+        if match.group(3):
+            d = _make_date(int(match.group(3)), month, day)
+            found.append((match.start(), d, 0.9, match.group(0)))
+        elif published is not None:
+            # No year: assume the most recent such date on or before publication
+            d = _make_date(published.year, month, day)
+            if d is not None and d > published:
+                d = _make_date(published.year - 1, month, day)
+            found.append((match.start(), d, 0.7, match.group(0)))
+
+    found.sort(key=lambda item: item[0])
+    return [(d, conf, src) for _, d, conf, src in found if _plausible(d, published)]
+
+
+def _relative_dates(text: str, published: date) -> list[tuple[date, float, str]]:
+    """Resolve relative dates ("yesterday", "3 days ago", "last Tuesday") against publication."""
+    found = []
+
+    for match in _YESTERDAY_RE.finditer(text):
+        found.append((match.start(), published - timedelta(days=1), 0.8, match.group(0)))
+
+    for match in _DAYS_AGO_RE.finditer(text):
+        raw = match.group(1).lower()
+        days = _NUMBER_WORDS.get(raw) or int(raw)
+        found.append((match.start(), published - timedelta(days=days), 0.75, match.group(0)))
+
+    for match in _LAST_WEEKDAY_RE.finditer(text):
+        weekday = _WEEKDAYS.index(match.group(1).lower())
+        delta = (published.weekday() - weekday) % 7 or 7
+        found.append((match.start(), published - timedelta(days=delta), 0.7, match.group(0)))
+
+    found.sort(key=lambda item: item[0])
+    return [(d, conf, src) for _, d, conf, src in found]
+
+
+def extract_date(text: str, published: str | None) -> dict | None:
+    """Find the encounter date in text, preferring absolute dates over relative ones.
+
+    When several distinct dates are found the first is used with a reduced
+    confidence, since the text may be describing more than one event.
+    """
+    published_date = _parse_published(published)
+    candidates = _absolute_dates(text, published_date)
+    if not candidates and published_date is not None:
+        candidates = _relative_dates(text, published_date)
+    if not candidates:
+        return None
+
+    d, confidence, source = candidates[0]
+    if len({c[0] for c in candidates}) > 1:
+        confidence = min(confidence, 0.5)
+    return {"value": d.isoformat(), "confidence": confidence, "source": source}
+
+
+# --- States ---
+
+_STATE_NAMES = {
+    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
+    "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE", "Florida": "FL", "Georgia": "GA",
+    "Hawaii": "HI", "Idaho": "ID", "Illinois": "IL", "Indiana": "IN", "Iowa": "IA",
+    "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
+    "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS",
+    "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV",
+    "New Hampshire": "NH", "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY",
+    "North Carolina": "NC", "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK",
+    "Oregon": "OR", "Pennsylvania": "PA", "Rhode Island": "RI", "South Carolina": "SC",
+    "South Dakota": "SD", "Tennessee": "TN", "Texas": "TX", "Utah": "UT", "Vermont": "VT",
+    "Virginia": "VA", "Washington": "WA", "West Virginia": "WV", "Wisconsin": "WI",
+    "Wyoming": "WY", "District of Columbia": "DC",
+}
+_STATE_CODES = frozenset(_STATE_NAMES.values())
+
+# Codes that are also common words or abbreviations ("IN", "OR", "AR-15", "CT scan")
+# are only trusted in an address-like position (", XX" or "XX 12345").
+_AMBIGUOUS_CODES = frozenset(
+    {
+        "IN", "OR", "ME", "OK", "HI", "OH", "ID", "DE", "AL",
+        "LA", "CO", "MA", "PA", "MD", "MO", "VA", "AR", "CT",
+    }
+)
+
+# Longest names first so "West Virginia" wins over "Virginia"
+_STATE_NAME_RE = re.compile(
+    r"\b(" + "|".join(sorted(_STATE_NAMES, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+_WASHINGTON_DC_RE = re.compile(r"\bWashington,?\s+D\.?\s?C\b\.?", re.IGNORECASE)
+_ADDRESS_CODE_RE = re.compile(r"(?:,\s*([A-Z]{2})\b(?![-\w])|\b([A-Z]{2})\s+\d{5}\b)")
+_BARE_CODE_RE = re.compile(r"\b([A-Z]{2})\b(?!-)")
+
+
+def _state_mentions(text: str) -> list[tuple[int, str, float, str]]:
+    """Find state mentions as (position, code, confidence, source)."""
+    found = []
+
+    for match in _WASHINGTON_DC_RE.finditer(text):
+        found.append((match.start(), "DC", 0.9, match.group(0)))
+    dc_spans = [m.span() for m in _WASHINGTON_DC_RE.finditer(text)]
+
+    for match in _STATE_NAME_RE.finditer(text):
+        name = match.group(1)
+        if not name[0].isupper() or any(a <= match.start() < b for a, b in dc_spans):
+            continue
+        canonical = next(n for n in _STATE_NAMES if n.lower() == name.lower())
+        # "Washington" alone is as likely the city/person as the state
+        confidence = 0.6 if canonical == "Washington" else 0.85
+        found.append((match.start(), _STATE_NAMES[canonical], confidence, name))
+
+    address_positions = set()
+    for match in _ADDRESS_CODE_RE.finditer(text):
+        code = match.group(1) or match.group(2)
+        if code in _STATE_CODES:
+            pos = match.start(1) if match.group(1) else match.start(2)
+            address_positions.add(pos)
+            found.append((pos, code, 0.85, code))
+
+    for match in _BARE_CODE_RE.finditer(text):
+        code = match.group(1)
+        if code not in _STATE_CODES or code in _AMBIGUOUS_CODES:
+            continue
+        if match.start() in address_positions:
+            continue
+        found.append((match.start(), code, 0.75, code))
+
+    found.sort(key=lambda item: item[0])
+    return found
+
+
+def extract_state(text: str) -> dict | None:
+    """Find the US state mentioned in text as a two-letter code."""
+    mentions = _state_mentions(text)
+    if not mentions:
+        return None
+
+    _, code, confidence, source = mentions[0]
+    distinct = {m[1] for m in mentions}
+    if len(distinct) > 1:
+        confidence = min(confidence, 0.4)
+    elif len(mentions) > 1:
+        # The same state named repeatedly is stronger evidence
+        confidence = min(0.95, max(m[2] for m in mentions) + 0.05)
+    return {"value": code, "confidence": confidence, "source": source}
+
+
+# --- Combined ---
+
+
+def extract(youtube_data: dict) -> dict:
+    """Run all local extractors over a youtube-data record's title and description.
+
+    Only the title and description are used, matching the prompt's rules that
+    coordinates and dates must be explicit in the video's own text.
+    """
+    title = youtube_data.get("title") or ""
+    description = youtube_data.get("description") or ""
+    text = title + "\n" + description
+    return {
+        "coordinates": extract_coordinates(description) or extract_coordinates(title),
+        "videoDate": extract_date(text, youtube_data.get("published")),
+        "state": extract_state(text),
+    }
+
+
+def high_confidence(local: dict) -> dict:
+    """Return only the local results confident enough to hand to Claude as hints."""
+    return {
+        key: value
+        for key, value in local.items()
+        if value is not None and value["confidence"] >= HINT_MIN_CONFIDENCE
+    }
+
+
+def build_hints_section(local: dict) -> str:
+    """Build the XML-tagged hints section for prompt insertion, or "" if nothing qualifies."""
+    hints = high_confidence(local)
+    if not hints:
+        return ""
+
+    lines = []
+    if "videoDate" in hints:
+        h = hints["videoDate"]
+        lines.append(f'- videoDate: {h["value"]} (from "{h["source"]}")')
+    if "coordinates" in hints:
+        h = hints["coordinates"]
+        lines.append(
+            f'- latitude/longitude: {h["latitude"]}, {h["longitude"]} (from "{h["source"]}")'
+        )
+    if "state" in hints:
+        h = hints["state"]
+        lines.append(f'- state: {h["value"]} (from "{h["source"]}")')
+
+    return (
+        "\n<local_extraction_hints>\n"
+        "These values were extracted deterministically from the title and description and "
+        "are reliable. Use them as-is. In the matching processing step, write only "
+        '"Using provided hint." instead of re-deriving them.\n'
+        + "\n".join(lines)
+        + "\n</local_extraction_hints>\n"
+    )
+
+
+def merge(entry: VideoEntry, local: dict) -> VideoEntry:
+    """Merge local results into a seed-data output entry, filling gaps left by Claude.
+
+    Claude's values are kept when present. Explicit coordinates are added to a
+    location Claude returned without them; no location is created from
+    coordinates alone, since the seeder needs a name or address to create one.
+    The location's confidence stays Claude's: the coordinates may belong to
+    some other place mentioned in the text. An unambiguous state and the video
+    date are filled in only when Claude left them null; a filled-in date is
+    capped below the seeder's date threshold. A local date that matches
+    Claude's raises its confidence.
+    """
+    confidence = entry.confidence
+    coords = local.get("coordinates")
+    state = local.get("state")
+    video_date = local.get("videoDate")
+
+    location = entry.location
+    if coords is not None and location is not None:
+        if location.latitude is None or location.longitude is None:
+            location.latitude = coords["latitude"]
+            location.longitude = coords["longitude"]
+
+    if (
+        state is not None
+        and state["confidence"] > _STATE_MERGE_MIN_CONFIDENCE
+        and location is not None
+        and not location.state
+    ):
+        location.state = state["value"]
+
+    if video_date is not None:
+        if entry.videoDate is None:
+            entry.videoDate = video_date["value"]
+            confidence.videoDate = min(video_date["confidence"], _FILLED_DATE_MAX_CONFIDENCE)
+        elif entry.videoDate == video_date["value"]:
+            confidence.videoDate = max(confidence.videoDate or 0.0, video_date["confidence"])
+
+    return entry
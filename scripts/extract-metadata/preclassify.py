@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Deterministic local pre-classifier for youtube-data records.
+
+Scores each record with weighted keyword/phrase features over its title,
+description and transcript, so clearly non-accountability videos (vlogs, merch
+ads, Q&A streams) can be skipped before paying for a Claude call. Scoring is
+pure Python set lookups and substring searches, fast enough for thousands of
+records per second.
+
+Used by claude_extract.py --preclassify, or standalone to tune the threshold:
+
+Usage:
+    python preclassify.py --input youtube-data.json
+    python preclassify.py --input youtube-data.json --threshold 2 --report skipped.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from json_stream import iter_records
+
+# Skipping needs net negative evidence: a record with no matched features
+# (score 0) may be an accountability video worded in a way the feature lists
+# do not cover, so it is kept. A lone weak negative mention is not enough either.
+DEFAULT_THRESHOLD = -1.0
+
+# Where a feature appears matters: a title keyword is stronger evidence than a
+# passing mention in a long transcript.
+_FIELD_WEIGHTS = {"title": 3.0, "description": 2.0, "transcript": 1.0}
+
+# Only the start of very long transcripts is scanned; the encounter itself is
+# almost always established early.
+_MAX_TRANSCRIPT_CHARS = 20_000
+
+# Auto-captions are noisy, so the transcript can move the score by at most this
+# much in either direction. It also lets records whose title and description
+# already decide the outcome skip the (comparatively expensive) transcript scan.
+_TRANSCRIPT_SCORE_CAP = 6.0
+
+# Single-word features, matched against the record's token set.
+_WORD_FEATURES = {
+    # Law enforcement and government participants
+    "police": 2.0,
+    "officer": 2.0,
+    "officers": 2.0,
+    "cop": 2.0,
+    "cops": 2.0,
+    "deputy": 2.0,
+    "deputies": 2.0,
+    "sheriff": 2.0,
+    "trooper": 2.0,
+    "sergeant": 1.5,
+    "lieutenant": 1.5,
+    "detective": 1.5,
+    "chief": 0.5,
+    "security": 1.0,
+    "guard": 1.0,
+    "clerk": 1.0,
+    "mayor": 1.0,
+    "councilman": 1.0,
+    "supervisor": 0.5,
+    # Encounter and rights vocabulary
+    "audit": 2.5,
+    "auditor": 2.5,
+    "auditing": 2.5,
+    "detained": 2.0,
+    "detain": 2.0,
+    "arrest": 2.0,
+    "arrested": 2.0,
+    "trespass": 1.5,
+    "trespassed": 1.5,
+    "trespassing": 1.5,
+    "warrant": 1.5,
+    "constitution": 1.5,
+    "constitutional": 1.5,
+    "amendment": 2.0,
+    "rights": 1.0,
+    "filming": 1.0,
+    "tyrant": 1.5,
+    "tyranny": 1.5,
+    "owned": 0.5,
+    "lawsuit": 1.0,
+    "foia": 1.5,
+    "courthouse": 1.5,
+    "dmv": 1.0,
+    "1a": 1.5,
+    "2a": 1.0,
+    "4a": 1.5,
+    # Non-accountability content
+    "vlog": -3.0,
+    "merch": -3.0,
+    "merchandise": -3.0,
+    "giveaway": -3.0,
+    "unboxing": -3.0,
+    "podcast": -2.0,
+    "sponsored": -1.5,
+    "patreon": -0.5,
+    "vacation": -2.0,
+    "birthday": -2.0,
+    "recipe": -3.0,
+    "gameplay": -3.0,
+    "trailer": -1.5,
+}
+
+# Multi-word features, matched as substrings of the normalized text.
+_PHRASE_FEATURES = {
+    "first amendment": 3.0,
+    "1st amendment": 3.0,
+    "second amendment": 2.0,
+    "fourth amendment": 3.0,
+    "fifth amendment": 2.5,
+    "fourteenth amendment": 2.0,
+    "am i being detained": 3.0,
+    "am i free to go": 3.0,
+    "i don't answer questions": 3.0,
+    "refused to id": 2.5,
+    "refuse to id": 2.5,
+    "id refusal": 2.5,
+    "public property": 2.0,
+    "public place": 1.0,
+    "reasonable suspicion": 2.5,
+    "probable cause": 2.5,
+    "city hall": 1.5,
+    "post office": 1.5,
+    "police department": 2.0,
+    "police station": 2.0,
+    "sheriff's office": 2.0,
+    "civil rights": 2.0,
+    "open carry": 2.0,
+    "badge number": 2.0,
+    "press pass": 1.5,
+    "q&a": -3.0,
+    "q & a": -3.0,
+    "ask me anything": -3.0,
+    "channel update": -3.0,
+    "live chat": -1.0,
+    "super chat": -2.0,
+    "discount code": -3.0,
+    "promo code": -3.0,
+    "use code": -2.0,
+    "new merch": -3.0,
+    "shop now": -2.0,
+    "link in bio": -1.0,
+    "day in the life": -3.0,
+    "behind the scenes": -1.5,
+}
+
+_PUNCTUATION = "\"'.,:;!?()[]{}<>*#-_/|~`"
+_WHITESPACE_TABLE = str.maketrans("\n\r\t", "   ")
+
+# Phrases are only searched for when all their words appear as tokens, which
+# rules out nearly every phrase with a few set lookups instead of a text scan.
+_PHRASE_WORDS = {phrase: frozenset(phrase.split()) for phrase in _PHRASE_FEATURES}
+
+
+def _field_features(text: str) -> dict[str, float]:
+    """Return the distinct features present in one text field with their weights."""
+    text = text.lower().translate(_WHITESPACE_TABLE)
+    tokens = {token.strip(_PUNCTUATION) for token in set(text.split())}
+    found = {word: _WORD_FEATURES[word] for word in tokens.intersection(_WORD_FEATURES)}
+    for phrase, weight in _PHRASE_FEATURES.items():
+        if _PHRASE_WORDS[phrase] <= tokens and phrase in text:
+            found[phrase] = weight
+    return found
+
+
+def score_record(record: dict, threshold: float | None = None) -> tuple[float, list[str]]:
+    """Score a youtube-data record for likely accountability content.
+
+    Each distinct feature counts once per field, scaled by the field weight.
+    The transcript's contribution is clamped to +/- _TRANSCRIPT_SCORE_CAP.
+
+    Args:
+        record: Dictionary from fetch_youtube.py intermediate JSON.
+        threshold: If given, the transcript is not scanned when the title and
+            description alone already put the score beyond the cap's reach.
+
+    Returns:
+        Tuple of (score, matched features as "field:feature" strings).
+    """
+    score = 0.0
+    matched = []
+    for field, field_weight in _FIELD_WEIGHTS.items():
+        text = record.get(field) or ""
+        if field == "transcript":
+            if threshold is not None and abs(score - threshold) > _TRANSCRIPT_SCORE_CAP:
+                break
+            text = text[:_MAX_TRANSCRIPT_CHARS]
+        if not text:
+            continue
+        field_score = 0.0
+        for feature, weight in sorted(_field_features(text).items()):
+            field_score += weight * field_weight
+            matched.append(f"{field}:{feature}")
+        if field == "transcript":
+            field_score = max(-_TRANSCRIPT_SCORE_CAP, min(_TRANSCRIPT_SCORE_CAP, field_score))
+        score += field_score
+    return round(score, 2), matched
+
+
+def classify(record: dict, threshold: float = DEFAULT_THRESHOLD) -> dict | None:
+    """Return an audit entry if the record should be skipped, else None."""
+    score, matched = score_record(record, threshold)
+    if score >= threshold:
+        return None
+    return {
+        "url": record.get("url"),
+        "title": record.get("title"),
+        "score": score,
+        "threshold": threshold,
+        "features": matched,
+    }
+
+
+def write_report(path: Path, skipped: list[dict]) -> None:
+    """Write the skipped-record audit report as a JSON array."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(skipped, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Wrote {len(skipped)} skipped record(s) to {path}.", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score youtube-data records and report which the pre-classifier would skip.",
+    )
+    parser.add_argument(
+        "--input",
+        "-i",
+        type=str,
+        required=True,
+        help="Input JSON array or JSON Lines file from fetch_youtube.py.",
+    )
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Skip records scoring below this value (default: {DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--report",
+        "-r",
+        type=str,
+        default=None,
+        help="Write skipped records with their scores and features to this JSON file.",
+    )
+    args = parser.parse_args()
+
+    total = 0
+    skipped = []
+    for record in iter_records(Path(args.input)):
+        total += 1
+        audit = classify(record, args.threshold)
+        if audit is not None:
+            skipped.append(audit)
+            print(f"SKIP {audit['score']:7.2f}  {audit['url']}  {audit['title']}")
+
+    print(f"\n{len(skipped)} of {total} record(s) below threshold {args.threshold}.", file=sys.stderr)
+    if args.report:
+        write_report(Path(args.report), skipped)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Priority scoring for the list, fetch and extract queues.
+
+Long runs are often cut short by YouTube rate limits or an API budget, and
+whatever came first in the input has been processed by then. Scoring videos
+lets list_channel.py, fetch_youtube.py and claude_extract.py handle the most
+valuable ones first. A video's score is the sum of:
+
+- keywords: the pre-classifier's score (preclassify.py) of its title, and of
+  its description when known;
+- recency: up to RECENCY_POINTS for a video uploaded today, halving every
+  RECENCY_HALF_LIFE_DAYS;
+- duration: +1 for typical encounter lengths (4 to 60 minutes), -1 for very
+  short or very long videos (under 2 minutes or over 3 hours).
+
+A user-supplied score replaces the computed one. Score files have one video
+per line, a URL or video ID followed by its score, separated by whitespace or
+a comma; blank lines and # comments are ignored.
+"""
+
+import re
+import sys
+from collections.abc import Callable, Iterable
+from datetime import date, datetime
+from pathlib import Path
+
+import preclassify
+from shards import video_id
+
+RECENCY_POINTS = 3.0
+RECENCY_HALF_LIFE_DAYS = 365
+
+_GOOD_DURATION = (4 * 60, 60 * 60)
+_POOR_DURATION = (2 * 60, 3 * 60 * 60)
+
+
+def _recency_points(upload_date: str | None, today: date) -> float:
+    if not upload_date:
+        return 0.0
+    try:
+        uploaded = datetime.strptime(upload_date, "%Y%m%d").date()
+    except ValueError:
+        return 0.0
+    age_days = max(0, (today - uploaded).days)
+    return RECENCY_POINTS * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def _duration_points(duration) -> float:
+    if not duration:
+        return 0.0
+    if _GOOD_DURATION[0] <= duration <= _GOOD_DURATION[1]:
+        return 1.0
+    if duration < _POOR_DURATION[0] or duration > _POOR_DURATION[1]:
+        return -1.0
+    return 0.0
+
+
+def video_score(video: dict, today: date | None = None) -> float:
+    """Score a video from the signals it carries.
+
+    Args:
+        video: A list_channel.py video (title, duration, upload_date) or a
+            fetch_youtube.py record (title, description, duration, published).
+        today: Date to measure recency from (default: today).
+
+    Returns:
+        The score; higher is processed first.
+    """
+    today = today or date.today()
+    # Keywords only: the transcript scan is the pre-classifier's expensive part
+    keywords, _ = preclassify.score_record(
+        {"title": video.get("title"), "description": video.get("description")}
+    )
+    upload_date = video.get("upload_date") or video.get("published")
+    return round(
+        keywords + _recency_points(upload_date, today) + _duration_points(video.get("duration")),
+        2,
+    )
+
+
+def load_scores(path: Path) -> dict[str, float]:
+    """Read a user score file into a video ID -> score map. Exits on a malformed line."""
+    scores = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                parts = re.split(r"[\s,]+", line)
+                try:
+                    scores[video_id(parts[0])] = float(parts[1])
+                except (IndexError, ValueError):
+                    print(
+                        f"Error: {path}:{line_number}: expected a URL or video ID and a score, "
+                        f"got: {line}",
+                        file=sys.stderr,
+                    )
+                    sys.exit(1)
+    except OSError as e:
+        print(f"Error: Failed to read score file {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    return scores
+
+
+def by_priority(items: Iterable, score: Callable[[object], float]) -> list:
+    """Return items highest score first; items with equal scores keep their order."""
+    return sorted(items, key=score, reverse=True)
+
+
+def scorer(scores: dict[str, float] | None, computed: bool, today: date | None = None):
+    """Build a function scoring a video dict (or a URL string).
+
+    Args:
+        scores: User scores by video ID, which take precedence.
+        computed: Whether videos without a user score get video_score();
+            otherwise they score 0.
+        today: Date to measure recency from (default: today).
+    """
+    scores = scores or {}
+    today = today or date.today()
+
+    def score(video) -> float:
+        url = video if isinstance(video, str) else (video.get("url") or video.get("youtubeUrl") or "")
+        user_score = scores.get(video_id(url))
+        if user_score is not None:
+            return user_score
+        if computed and not isinstance(video, str):
+            return video_score(video, today)
+        return 0.0
+
+    return score
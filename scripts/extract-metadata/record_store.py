@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Indexed record store shared by fetch_youtube.py and claude_extract.py.
+
+The intermediate youtube-data file and the seed-data output are JSON arrays:
+looking up, updating or re-extracting one video means parsing and rewriting
+the whole file. A record store is a SQLite file with one row per video, keyed
+by video ID, holding its fetched YouTube record and its extracted seed-data
+entry as zlib-compressed JSON blobs. Either script accepts a store path
+(any path ending in .db, .sqlite or .sqlite3) wherever it takes a JSON file:
+
+    python fetch_youtube.py --file urls.txt --output videos.db --append
+    python claude_extract.py --input videos.db --output videos.db --append
+
+A video keeps its position when it is fetched or extracted again, so exports
+are in the order videos were first added. This script looks up, imports,
+exports and resets records:
+
+Usage:
+    python record_store.py videos.db get https://www.youtube.com/watch?v=abc123def45
+    python record_store.py videos.db export --youtube youtube-data.json --extracted seed-data/videos.json
+    python record_store.py videos.db import --youtube youtube-data.json --extracted videos.json
+    python record_store.py videos.db reset abc123def45      # re-extract on the next --append run
+    python record_store.py videos.db stats
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import video_record
+from json_stream import iter_records
+from shards import video_id
+from video_record import write_json_array
+
+STORE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# Records are written once and read many times; level 6 is within a few
+# percent of level 9's size at a fraction of its time.
+_COMPRESSION_LEVEL = 6
+_KINDS = ("youtube", "extracted")
+# The URL field of each kind of record
+_URL_FIELD = {"youtube": "url", "extracted": "youtubeUrl"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    video_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    youtube BLOB,
+    extracted BLOB,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_position ON records (position);
+"""
+
+
+def is_store_path(path: str | Path) -> bool:
+    """Return whether a file argument names a record store rather than a JSON file."""
+    return Path(path).suffix.lower() in STORE_SUFFIXES
+
+
+def _pack(record: dict) -> bytes:
+    return zlib.compress(video_record.dumps(record).encode("utf-8"), _COMPRESSION_LEVEL)
+
+
+def _unpack(blob: bytes) -> dict:
+    return video_record.loads(zlib.decompress(blob))
+
+
+class RecordStore:
+    """Per-video YouTube records and extracted entries in one SQLite file.
+
+    Use from one thread. Every write is committed immediately unless it is
+    made inside a `with store:` block, which commits once at the end.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.executescript(_SCHEMA)
+        self._batch = False
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RecordStore":
+        self._batch = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._batch = False
+        if exc_type is None:
+            self._conn.commit()
+        else:
+            self._conn.rollback()
+
+    def _commit(self) -> None:
+        if not self._batch:
+            self._conn.commit()
+
+    def get(self, kind: str, key: str) -> dict | None:
+        """Return a video's record of one kind ("youtube" or "extracted"), by URL or video ID."""
+        row = self._conn.execute(
+            f"SELECT {kind} FROM records WHERE video_id = ?", (video_id(key),)
+        ).fetchone()
+        return _unpack(row[0]) if row and row[0] is not None else None
+
+    def put(self, kind: str, record: dict) -> None:
+        """Insert or replace a video's record of one kind; its other record is kept."""
+        url = record.get(_URL_FIELD[kind]) or ""
+        self._conn.execute(
+            f"INSERT INTO records (video_id, url, position, {kind}, updated) "
+            "VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM records), ?, ?) "
+            f"ON CONFLICT (video_id) DO UPDATE SET {kind} = excluded.{kind}, "
+            "url = excluded.url, updated = excluded.updated",
+            (video_id(url), url, _pack(record), time.time()),
+        )
+        self._commit()
+
+    def put_many(self, kind: str, records: Iterable[dict]) -> int:
+        """Insert or replace many records in one transaction. Returns how many were written."""
+        count = 0
+        with self:
+            for record in records:
+                self.put(kind, record)
+                count += 1
+        return count
+
+    def clear(self, kind: str, keys: Iterable[str]) -> int:
+        """Remove the records of one kind for the given URLs or video IDs.
+
+        Returns:
+            Number of videos that had such a record.
+        """
+        cursor = self._conn.executemany(
+            f"UPDATE records SET {kind} = NULL, updated = ? WHERE video_id = ? AND {kind} IS NOT NULL",
+            ((time.time(), video_id(key)) for key in keys),
+        )
+        self._commit()
+        return cursor.rowcount
+
+    def iter(self, kind: str) -> Iterator[dict]:
+        """Yield every record of one kind, in the order videos were first added."""
+        rows = self._conn.execute(
+            f"SELECT {kind} FROM records WHERE {kind} IS NOT NULL ORDER BY position"
+        )
+        for (blob,) in rows:
+            yield _unpack(blob)
+
+    def urls(self, kind: str) -> list[str]:
+        """Return the URLs of the videos that have a record of one kind, in position order."""
+        rows = self._conn.execute(
+            f"SELECT url FROM records WHERE {kind} IS NOT NULL ORDER BY position"
+        )
+        return [url for (url,) in rows]
+
+    def stats(self) -> dict:
+        """Return record counts and stored (compressed) sizes per kind."""
+        row = self._conn.execute(
+            "SELECT COUNT(*), COUNT(youtube), COUNT(extracted), "
+            "COALESCE(SUM(LENGTH(youtube)), 0), COALESCE(SUM(LENGTH(extracted)), 0) FROM records"
+        ).fetchone()
+        return {
+            "videos": row[0],
+            "youtube": row[1],
+            "extracted": row[2],
+            "youtube_bytes": row[3],
+            "extracted_bytes": row[4],
+        }
+
+
+def _cmd_get(store: RecordStore, args) -> None:
+    found = False
+    for kind in _KINDS:
+        if getattr(args, kind) or not (args.youtube or args.extracted):
+            record = store.get(kind, args.key)
+            if record is not None:
+                found = True
+                print(video_record.dumps({kind: record}, indent=True))
+    if not found:
+        print(f"Error: No record for {args.key}.", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_export(store: RecordStore, args) -> None:
+    for kind in _KINDS:
+        path = getattr(args, kind)
+        if path:
+            count = write_json_array(Path(path), store.iter(kind), args.compact)
+            print(f"Wrote {count} {kind} record(s) to {path}.", file=sys.stderr)
+
+
+def _cmd_import(store: RecordStore, args) -> None:
+    for kind in _KINDS:
+        path = getattr(args, kind)
+        if path:
+            try:
+                count = store.put_many(kind, iter_records(Path(path)))
+            except (OSError, ValueError) as e:
+                print(f"Error: Failed to import {path}: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"Imported {count} {kind} record(s) from {path}.", file=sys.stderr)
+
+
+def _cmd_reset(store: RecordStore, args) -> None:
+    count = store.clear("extracted", args.keys)
+    print(
+        f"Cleared {count} extracted entry(ies); claude_extract.py --append will extract them again.",
+        file=sys.stderr,
+    )
+
+
+def _cmd_stats(store: RecordStore, args) -> None:
+    stats = store.stats()
+    print(f"Videos:              {stats['videos']}", file=sys.stderr)
+    print(
+        f"YouTube records:     {stats['youtube']} ({stats['youtube_bytes'] / 1e6:.1f} MB compressed)",
+        file=sys.stderr,
+    )
+    print(
+        f"Extracted entries:   {stats['extracted']} ({stats['extracted_bytes'] / 1e6:.1f} MB compressed)",
+        file=sys.stderr,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Look up, import, export and reset records in a fetch/extract record store.",
+    )
+    parser.add_argument("store", help="Record store file (.db, .sqlite or .sqlite3).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    get = commands.add_parser("get", help="Print one video's records as JSON.")
+    get.add_argument("key", help="Video URL or ID.")
+    get.add_argument("--youtube", action="store_true", help="Only the fetched YouTube record.")
+    get.add_argument("--extracted", action="store_true", help="Only the extracted entry.")
+
+    export = commands.add_parser("export", help="Write records back to JSON array files.")
+    export.add_argument("--youtube", metavar="FILE", help="Write fetched YouTube records (fetch_youtube.py format).")
+    export.add_argument("--extracted", metavar="FILE", help="Write extracted entries (seed-data format).")
+    export.add_argument("--compact", action="store_true", help="One record per line, without indentation.")
+
+    imp = commands.add_parser("import", help="Add records from JSON array or JSON Lines files.")
+    imp.add_argument("--youtube", metavar="FILE", help="fetch_youtube.py output to import.")
+    imp.add_argument("--extracted", metavar="FILE", help="claude_extract.py output to import.")
+
+    reset = commands.add_parser("reset", help="Clear extracted entries so they are extracted again.")
+    reset.add_argument("keys", nargs="+", help="Video URLs or IDs.")
+
+    commands.add_parser("stats", help="Print record counts and sizes.")
+
+    args = parser.parse_args()
+    if args.command in ("export", "import") and not (args.youtube or args.extracted):
+        parser.error(f"{args.command} needs --youtube and/or --extracted.")
+    if not is_store_path(args.store):
+        parser.error(f"store must end in {', '.join(STORE_SUFFIXES)}.")
+    if args.command != "import" and not Path(args.store).exists():
+        print(f"Error: Record store not found: {args.store}", file=sys.stderr)
+        sys.exit(1)
+
+    store = RecordStore(Path(args.store))
+    try:
+        {
+            "get": _cmd_get,
+            "export": _cmd_export,
+            "import": _cmd_import,
+            "reset": _cmd_reset,
+            "stats": _cmd_stats,
+        }[args.command](store, args)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
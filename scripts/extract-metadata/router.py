@@ -0,0 +1,127 @@
+"""
+Deadline-aware routing between the Message Batches API and real-time calls.
+
+Batch requests cost half as much but may take up to 24 hours; real-time calls
+finish in seconds but cost full price. Given a deadline, claude_extract.py
+--deadline sends as much of the workload as it can through the Batches API
+and uses real-time calls only for what the batch could not finish in time:
+
+- Up front, if even an all-real-time run would not fit before the deadline,
+  the real-time lane starts immediately on as many requests as it can finish
+  by then; only the rest go to the Batches API.
+- While batches are in flight (and the real-time lane runs alongside), the
+  router watches the estimated real-time cost of the unfinished requests
+  against the time the lane has not already claimed. Once waiting any longer
+  would leave too little time to finish them in real time, the batches are
+  canceled and the stragglers are sent as concurrent real-time calls. If they
+  no longer fit at all, canceling would only push them past the deadline, so
+  the batches are left to finish.
+
+Real-time durations are estimated from prompt size, so this module needs no
+API access. The estimates are deliberately pessimistic.
+"""
+
+import argparse
+import re
+from datetime import datetime
+
+# The Batches API guarantees results within 24 hours.
+BATCH_MAX_SECONDS = 24 * 3600
+
+# Time kept in reserve for canceling batches, retries and writing output.
+SAFETY_MARGIN_SECONDS = 300.0
+
+# Rough real-time cost model for one extraction call.
+_CHARS_PER_TOKEN = 4
+_CALL_OVERHEAD_SECONDS = 2.0
+_INPUT_TOKENS_PER_SECOND = 20_000
+_EXPECTED_OUTPUT_TOKENS = 1_500
+_OUTPUT_TOKENS_PER_SECOND = 100
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)([dhms])")
+_DURATION = re.compile(r"(?:\d+(?:\.\d+)?[dhms])+")
+_UNIT_SECONDS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+
+def parse_deadline(value: str, now: datetime | None = None) -> float:
+    """Parse a --deadline value into seconds from now.
+
+    Accepts a duration ("90m", "6h", "1h30m", or plain seconds) or an ISO 8601
+    timestamp ("2025-06-01T18:00", local time unless an offset is given).
+
+    Raises:
+        argparse.ArgumentTypeError: If the value cannot be parsed or is not in the future.
+    """
+    value = value.strip().lower()
+    if re.fullmatch(r"\d+(?:\.\d+)?", value):
+        seconds = float(value)
+    elif _DURATION.fullmatch(value):
+        seconds = sum(
+            float(amount) * _UNIT_SECONDS[unit] for amount, unit in _DURATION_PART.findall(value)
+        )
+    else:
+        try:
+            at = datetime.fromisoformat(value.upper())
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"invalid deadline {value!r}: use a duration like 6h or 90m, or an ISO timestamp"
+            ) from None
+        if now is None:
+            now = datetime.now(at.tzinfo)
+        seconds = (at - now).total_seconds()
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"deadline {value!r} is not in the future")
+    return seconds
+
+
+def estimate_call_seconds(prompt_chars: int) -> float:
+    """Estimate the wall-clock seconds of one real-time extraction call."""
+    input_tokens = prompt_chars / _CHARS_PER_TOKEN
+    return (
+        _CALL_OVERHEAD_SECONDS
+        + input_tokens / _INPUT_TOKENS_PER_SECOND
+        + _EXPECTED_OUTPUT_TOKENS / _OUTPUT_TOKENS_PER_SECOND
+    )
+
+
+def realtime_seconds(call_seconds: list[float], concurrency: int) -> float:
+    """Estimate the wall-clock seconds to run calls real-time `concurrency` at a time."""
+    if not call_seconds:
+        return 0.0
+    return max(sum(call_seconds) / concurrency, max(call_seconds))
+
+
+def plan_routes(call_seconds: list[float], concurrency: int, budget: float) -> int:
+    """Return how many requests (from the front) to send real-time immediately.
+
+    Everything goes to the Batches API when the whole workload could still be
+    finished in real time after giving up on the batch. Otherwise the
+    real-time lane takes as many requests as it can finish within `budget`
+    seconds, and the batch gets the rest.
+    """
+    if realtime_seconds(call_seconds, concurrency) <= budget:
+        return 0
+    total = 0.0
+    for count, seconds in enumerate(call_seconds):
+        if (total + seconds) / concurrency > budget:
+            return count
+        total += seconds
+    return len(call_seconds)
+
+
+def should_cut_over(
+    remaining_seconds: float, straggler_seconds: float, claimed_seconds: float = 0.0
+) -> bool:
+    """Whether to stop waiting on batches and send unfinished requests real-time.
+
+    True once the stragglers only just fit in the time the real-time lane has
+    not claimed, and while they still fit in it.
+
+    Args:
+        remaining_seconds: Seconds left until the deadline.
+        straggler_seconds: Estimated real-time duration of the unfinished requests.
+        claimed_seconds: Estimated real-time duration of the calls already
+            queued or running, which the stragglers would wait behind.
+    """
+    available = remaining_seconds - claimed_seconds
+    return straggler_seconds <= available <= straggler_seconds + SAFETY_MARGIN_SECONDS
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Sharding helpers and shard-output merge command for claude_extract.py.
+
+`claude_extract.py --shard i/N` keeps only the input records whose video ID
+hashes to shard i of N. A large backfill can then run as N processes, on
+different machines or API keys, over the same input file. Each shard writes
+its own output file and an error summary next to it (`<output>.errors.json`).
+
+This script merges the shard outputs into one seed-data file:
+
+- entries already in --output are kept first, in their existing order;
+- new entries are appended sorted by youtubeUrl, so the result does not
+  depend on shard order or on which shard finished first;
+- duplicates (by youtubeUrl) keep the first occurrence, with shard files
+  read in sorted path order;
+- each shard's error summary is reported, and missing shards are flagged.
+
+Usage:
+    python shards.py --output videos.json videos.shard-*.json
+    python shards.py --output videos.json --report merge-report.json videos.shard-*.json
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+_VIDEO_ID = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/live/|/embed/)([A-Za-z0-9_-]{11})")
+
+
+def video_id(url: str) -> str:
+    """Return the YouTube video ID in a URL, or the URL itself if none is found."""
+    match = _VIDEO_ID.search(url)
+    return match.group(1) if match else url
+
+
+def shard_of(url: str, count: int) -> int:
+    """Return the shard (0 to count - 1) a video belongs to.
+
+    Uses a cryptographic hash of the video ID rather than ``hash()``, which is
+    salted per process, so every machine assigns a video to the same shard.
+    """
+    digest = hashlib.sha256(video_id(url).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a --shard value "i/N" into (i, N).
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is malformed or i is not in 0..N-1.
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}: expected i/N, e.g. 0/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or index >= count:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}: i must be in 0..N-1")
+    return index, count
+
+
+def errors_path(output_path: Path) -> Path:
+    """Return the error-summary path written next to a shard output file."""
+    return output_path.with_name(output_path.stem + ".errors.json")
+
+
+def write_shard_summary(
+    output_path: Path, shard: tuple[int, int], processed: int, errors: list[str]
+) -> None:
+    """Write a shard's error summary next to its output file."""
+    index, count = shard
+    summary = {"shard": f"{index}/{count}", "processed": processed, "errors": errors}
+    path = errors_path(output_path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Wrote shard {index}/{count} summary to {path}.", file=sys.stderr)
+
+
+def _load_entries(path: Path) -> list[dict]:
+    """Load a seed-data JSON array.
+
+    Raises:
+        ValueError: If the file is not valid JSON or not a JSON array.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("does not contain a JSON array")
+    return data
+
+
+def _load_summary(path: Path) -> dict | None:
+    """Load a shard's error summary, or None if it has none."""
+    summary_path = errors_path(path)
+    if not summary_path.exists():
+        return None
+    with open(summary_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merge(
+    existing: list[dict], shard_paths: list[Path]
+) -> tuple[list[dict], list[dict], list[str]]:
+    """Merge shard outputs into the existing entries.
+
+    Args:
+        existing: Entries already in the output file (kept first, in order).
+        shard_paths: Shard output files.
+
+    Returns:
+        Tuple of (merged entries, per-shard report dicts, errors list).
+    """
+    seen = {entry.get("youtubeUrl") for entry in existing}
+    new_entries: list[dict] = []
+    reports: list[dict] = []
+    errors: list[str] = []
+
+    for path in sorted(shard_paths):
+        report = {"file": str(path), "entries": 0, "added": 0, "duplicates": 0}
+        try:
+            entries = _load_entries(path)
+            summary = _load_summary(path)
+        except (OSError, ValueError) as e:
+            error_msg = f"Failed to read shard output {path}: {e}"
+            print(f"Error: {error_msg}", file=sys.stderr)
+            errors.append(error_msg)
+            report["error"] = str(e)
+            reports.append(report)
+            continue
+
+        report["entries"] = len(entries)
+        for entry in entries:
+            url = entry.get("youtubeUrl")
+            if url in seen:
+                report["duplicates"] += 1
+                continue
+            seen.add(url)
+            new_entries.append(entry)
+            report["added"] += 1
+        if summary is not None:
+            report["shard"] = summary.get("shard")
+            report["errors"] = summary.get("errors", [])
+        reports.append(report)
+
+    new_entries.sort(key=lambda entry: entry.get("youtubeUrl") or "")
+    return existing + new_entries, reports, errors
+
+
+def _missing_shards(reports: list[dict]) -> list[str]:
+    """Return the shards of an i/N run that have no output, if N is known."""
+    shards = {r["shard"] for r in reports if r.get("shard")}
+    counts = {int(s.split("/")[1]) for s in shards}
+    if len(counts) != 1:
+        return []
+    count = counts.pop()
+    return [f"{i}/{count}" for i in range(count) if f"{i}/{count}" not in shards]
+
+
+def _print_report(reports: list[dict], merged: int, existing: int) -> None:
+    """Print a per-shard summary to stderr."""
+    print("\nShard summary:", file=sys.stderr)
+    for r in reports:
+        label = r.get("shard") or "?/?"
+        if "error" in r:
+            print(f"  {label:>7}  {r['file']}: unreadable ({r['error']})", file=sys.stderr)
+            continue
+        shard_errors = r.get("errors")
+        error_note = "no summary" if shard_errors is None else f"{len(shard_errors)} error(s)"
+        print(
+            f"  {label:>7}  {r['file']}: {r['entries']} entries, {r['added']} added, "
+            f"{r['duplicates']} duplicate(s), {error_note}",
+            file=sys.stderr,
+        )
+        for err in (shard_errors or [])[:5]:
+            print(f"             - {err}", file=sys.stderr)
+        if shard_errors and len(shard_errors) > 5:
+            print(f"             ... and {len(shard_errors) - 5} more", file=sys.stderr)
+
+    missing = _missing_shards(reports)
+    if missing:
+        print(f"  Missing shard(s): {', '.join(missing)}", file=sys.stderr)
+    print(f"\n{existing} existing + {merged - existing} new = {merged} entries.", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge claude_extract.py --shard outputs into one seed-data file.",
+    )
+    parser.add_argument(
+        "shards",
+        nargs="+",
+        help="Shard output files written by claude_extract.py --shard i/N --output FILE.",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        required=True,
+        help="Merged output file. Entries already in it are kept.",
+    )
+    parser.add_argument(
+        "--report",
+        "-r",
+        type=str,
+        default=None,
+        help="Write the per-shard summary (counts and errors) to this JSON file.",
+    )
+    args = parser.parse_args()
+
+    output_path = Path(args.output)
+    existing = []
+    if output_path.exists():
+        try:
+            existing = _load_entries(output_path)
+        except ValueError as e:
+            print(f"Error: Failed to parse existing file {output_path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Loaded {len(existing)} existing entries from {output_path}.", file=sys.stderr)
+
+    # A glob like videos.shard-*.json also matches the error summaries
+    shard_paths = [
+        Path(p)
+        for p in args.shards
+        if not p.endswith(".errors.json") and Path(p).resolve() != output_path.resolve()
+    ]
+    merged, reports, errors = merge(existing, shard_paths)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Wrote {len(merged)} entries to {output_path}.", file=sys.stderr)
+
+    _print_report(reports, len(merged), len(existing))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"shards": reports, "missing": _missing_shards(reports)}, f, indent=2)
+            f.write("\n")
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Per-call token, latency and cache telemetry for claude_extract.py.
+
+Every Claude call (sequential or batch) is recorded with its model, latency and
+the token counts reported in ``response.usage``. At the end of a run the
+collected calls are summarized into totals, latency percentiles and effective
+tokens/sec, printed as a report and optionally written to a JSON metrics file.
+"""
+
+import json
+import math
+import sys
+import threading
+import time
+from pathlib import Path
+
+_PERCENTILES = (50, 90, 95, 99)
+
+_USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens",
+)
+
+
+def _usage_counts(usage) -> dict:
+    """Read token counts from an Anthropic ``Usage`` object (or dict), defaulting to 0."""
+    counts = {}
+    for field in _USAGE_FIELDS:
+        if isinstance(usage, dict):
+            value = usage.get(field)
+        else:
+            value = getattr(usage, field, None)
+        counts[field] = int(value or 0)
+    return counts
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Return the nearest-rank percentile of a list of values, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+
+class ExtractionTelemetry:
+    """Collects one record per Claude call and summarizes them for a run."""
+
+    def __init__(self):
+        self.calls: list[dict] = []
+        # Per-run event counters (retries, hedges, ...) incremented by the request executor
+        self.counters: dict[str, int] = {}
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def increment(self, name: str) -> None:
+        """Increment a named per-run counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def record(
+        self,
+        url: str,
+        model: str,
+        usage,
+        latency: float | None,
+        mode: str,
+        ok: bool = True,
+    ) -> dict:
+        """Record a single Claude call.
+
+        Args:
+            url: Video URL the call was made for.
+            model: Claude model ID used for the call.
+            usage: ``response.usage`` from the Anthropic SDK (may be None).
+            latency: Wall-clock seconds for the call, or None when unknown (batch mode).
+            mode: "sequential", "batch", "realtime" (requests --deadline routed
+                away from the Batches API), or in --chunked mode "chunk" (per-segment
+                evidence) and "consolidate".
+            ok: Whether the response was parsed successfully.
+
+        Returns:
+            The stored call record.
+        """
+        call = {
+            "url": url,
+            "model": model,
+            "mode": mode,
+            "latency": round(latency, 4) if latency is not None else None,
+            "ok": ok,
+            **_usage_counts(usage),
+        }
+        with self._lock:
+            self.calls.append(call)
+        return call
+
+    def summary(self) -> dict:
+        """Aggregate recorded calls into totals, percentiles and throughput."""
+        wall = time.monotonic() - self._started
+        totals = {field: sum(c[field] for c in self.calls) for field in _USAGE_FIELDS}
+        latencies = [c["latency"] for c in self.calls if c["latency"] is not None]
+        total_latency = sum(latencies)
+
+        prompt_tokens = (
+            totals["input_tokens"]
+            + totals["cache_read_input_tokens"]
+            + totals["cache_creation_input_tokens"]
+        )
+        all_tokens = prompt_tokens + totals["output_tokens"]
+        timed_output = sum(c["output_tokens"] for c in self.calls if c["latency"] is not None)
+
+        models: dict[str, int] = {}
+        for c in self.calls:
+            models[c["model"]] = models.get(c["model"], 0) + 1
+
+        return {
+            "calls": len(self.calls),
+            "failed_calls": sum(1 for c in self.calls if not c["ok"]),
+            "counters": dict(sorted(self.counters.items())),
+            "models": models,
+            "wall_seconds": round(wall, 3),
+            "tokens": {**totals, "total": all_tokens},
+            "cache_hit_ratio": round(totals["cache_read_input_tokens"] / prompt_tokens, 4)
+            if prompt_tokens
+            else 0.0,
+            "latency_seconds": {
+                "total": round(total_latency, 3),
+                "mean": round(total_latency / len(latencies), 3) if latencies else None,
+                **{f"p{p}": percentile(latencies, p) for p in _PERCENTILES},
+                "max": max(latencies) if latencies else None,
+            },
+            "tokens_per_second": {
+                # Per-call generation speed: output tokens over time spent waiting on calls
+                "output_per_call_second": round(timed_output / total_latency, 2)
+                if total_latency
+                else None,
+                # Run throughput: all tokens over the run's wall-clock time
+                "total_per_wall_second": round(all_tokens / wall, 2) if wall else None,
+            },
+        }
+
+    def print_report(self) -> None:
+        """Print a human-readable end-of-run report to stderr."""
+        if not self.calls and not self.counters:
+            return
+        s = self.summary()
+        t = s["tokens"]
+        lat = s["latency_seconds"]
+        tps = s["tokens_per_second"]
+
+        def fmt(value, unit="s"):
+            return "n/a" if value is None else f"{value:.2f}{unit}"
+
+        print("\nClaude usage:", file=sys.stderr)
+        print(f"  Calls:          {s['calls']} ({s['failed_calls']} failed)", file=sys.stderr)
+        print(
+            "  Models:         " + ", ".join(f"{m} x{n}" for m, n in s["models"].items()),
+            file=sys.stderr,
+        )
+        print(f"  Input tokens:   {t['input_tokens']:,}", file=sys.stderr)
+        print(f"  Output tokens:  {t['output_tokens']:,}", file=sys.stderr)
+        print(
+            f"  Cache read:     {t['cache_read_input_tokens']:,} "
+            f"(hit ratio {s['cache_hit_ratio']:.1%})",
+            file=sys.stderr,
+        )
+        print(f"  Cache creation: {t['cache_creation_input_tokens']:,}", file=sys.stderr)
+        if s["counters"]:
+            print(
+                "  Events:         " + ", ".join(f"{n} {v}" for n, v in s["counters"].items()),
+                file=sys.stderr,
+            )
+        print(
+            f"  Latency:        p50 {fmt(lat['p50'])}, p95 {fmt(lat['p95'])}, "
+            f"p99 {fmt(lat['p99'])}, max {fmt(lat['max'])}",
+            file=sys.stderr,
+        )
+        print(
+            f"  Throughput:     {fmt(tps['output_per_call_second'], ' out tok/s')} per call, "
+            f"{fmt(tps['total_per_wall_second'], ' tok/s')} overall",
+            file=sys.stderr,
+        )
+
+    def write_json(self, path: Path) -> None:
+        """Write the summary and per-call records to a JSON metrics file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "calls": self.calls}, f, indent=2)
+            f.write("\n")
+        print(f"Wrote metrics for {len(self.calls)} call(s) to {path}.", file=sys.stderr)
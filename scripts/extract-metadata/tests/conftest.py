@@ -0,0 +1,6 @@
+"""Make the extract-metadata modules importable by their plain names, as the scripts do."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
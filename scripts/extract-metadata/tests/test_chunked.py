@@ -0,0 +1,66 @@
+"""Tests for chunked.py transcript splitting and evidence merging."""
+
+import chunked
+
+
+def _words(n: int) -> str:
+    return " ".join(f"w{i:05d}" for i in range(n))
+
+
+def test_needs_chunking_only_above_the_threshold():
+    assert not chunked.needs_chunking(None)
+    assert not chunked.needs_chunking("x" * 100, threshold=100)
+    assert chunked.needs_chunking("x" * 101, threshold=100)
+
+
+def test_short_transcript_is_one_segment():
+    assert chunked.split_transcript("  a short transcript ", chunk_chars=100) == ["a short transcript"]
+
+
+def test_segments_cut_at_word_boundaries_and_cover_everything():
+    transcript = _words(2000)  # 6-character words plus spaces
+    segments = chunked.split_transcript(transcript, chunk_chars=1000, overlap=100)
+    words = set(transcript.split())
+    assert len(segments) > 1
+    assert all(len(segment) <= 1000 for segment in segments)
+    # No word is cut in half, and none is lost
+    assert all(set(segment.split()) <= words for segment in segments)
+    assert set(" ".join(segments).split()) == words
+    assert segments[0].startswith("w00000") and segments[-1].endswith("w01999")
+
+
+def test_consecutive_segments_overlap():
+    segments = chunked.split_transcript(_words(2000), chunk_chars=1000, overlap=100)
+    for previous, following in zip(segments, segments[1:]):
+        shared = set(previous.split()) & set(following.split())
+        # About `overlap` characters of 7-character words are repeated
+        assert 10 <= len(shared) <= 15
+        assert previous.endswith(following.split()[len(shared) - 1])
+
+
+def test_split_without_spaces_still_terminates():
+    segments = chunked.split_transcript("x" * 2500, chunk_chars=1000, overlap=100)
+    assert [len(segment) for segment in segments] == [1000, 1000, 700]
+
+
+def test_merge_evidence_drops_duplicates_and_keeps_first_seen_order():
+    merged = chunked.merge_evidence([
+        {"location": ["City Hall", "Main St"], "date": ["yesterday"]},
+        {"location": [" city hall ", "Austin, TX"], "participants": ["two deputies"]},
+    ])
+    assert merged == {
+        "location": ["City Hall", "Main St", "Austin, TX"],
+        "date": ["yesterday"],
+        "participants": ["two deputies"],
+        "amendments": [],
+    }
+
+
+def test_merge_evidence_ignores_malformed_values_and_caps_quotes():
+    merged = chunked.merge_evidence([
+        {"location": "not a list", "date": [None, 3, "", "  "], "unknown": ["x"]},
+        {"amendments": [f"quote {i}" for i in range(20)]},
+    ])
+    assert merged["location"] == [] and merged["date"] == []
+    assert "unknown" not in merged
+    assert merged["amendments"] == [f"quote {i}" for i in range(12)]
@@ -0,0 +1,108 @@
+"""Tests for dedupe.py near-duplicate grouping and claude_extract's representative promotion."""
+
+import random
+from array import array
+
+import pytest
+
+import claude_extract
+import dedupe
+
+_VOCAB = [f"word{i}" for i in range(5000)]
+
+
+def _transcript(seed: int, words: int = 1500) -> str:
+    return " ".join(random.Random(seed).choices(_VOCAB, k=words))
+
+
+def _record(n: int, transcript: str, description: str = "") -> dict:
+    return {
+        "url": f"https://www.youtube.com/watch?v=vid{n:08d}",
+        "title": f"Title {n}",
+        "description": description,
+        "transcript": transcript,
+    }
+
+
+def test_reuploads_are_grouped_and_unrelated_videos_are_not():
+    original = _transcript(1)
+    # A re-upload trimmed at the start, with a new title
+    reupload = " ".join(original.split()[40:])
+    records = [
+        _record(0, original),
+        _record(1, _transcript(2)),
+        _record(2, reupload),
+        _record(3, _transcript(3)),
+        _record(4, original),
+    ]
+
+    groups = dedupe.find_groups(records)
+
+    assert groups == [[records[0]["url"], records[2]["url"], records[4]["url"]]]
+
+
+def test_short_transcripts_are_never_grouped():
+    boilerplate = "Subscribe and support the channel on Patreon. " * 20
+    records = [_record(n, "officer approaches", boilerplate) for n in range(3)]
+    assert dedupe.find_groups(records) == []
+
+
+def test_groups_are_ordered_by_first_member():
+    a, b = _transcript(10), _transcript(11)
+    records = [_record(0, b), _record(1, a), _record(2, a), _record(3, b)]
+    urls = [r["url"] for r in records]
+    assert dedupe.find_groups(records) == [[urls[0], urls[3]], [urls[1], urls[2]]]
+
+
+def _signature(bands: list[list[int]]) -> array:
+    values = [value for band in bands for value in band]
+    # Bins past the last band are not used by LSH; leave them empty
+    return array("q", values + [dedupe._EMPTY] * (dedupe._NUM_BINS - len(values)))
+
+
+def test_copies_sharing_a_bucket_with_an_unrelated_record_are_joined(monkeypatch):
+    """Two copies whose only shared buckets were first filled by a third, unrelated record."""
+    rows = dedupe._ROWS
+    shared = [[1000 * b + r for r in range(rows)] for b in range(3)]
+    # The copies agree on bands 0-2 and on 4 of 5 bins in every other band
+    copy_a = shared + [[10_000 + 10 * b + r for r in range(rows)] for b in range(3, dedupe._BANDS)]
+    copy_b = shared + [band[:-1] + [99_999 - b] for b, band in enumerate(copy_a[3:])]
+    # The unrelated record lands in the copies' bands 0-2 first and differs everywhere else
+    unrelated = shared + [[50_000 + 10 * b + r for r in range(rows)] for b in range(3, dedupe._BANDS)]
+    signatures = {"unrelated": unrelated, "a": copy_a, "b": copy_b}
+    monkeypatch.setattr(dedupe, "signature", lambda record: _signature(signatures[record["url"]]))
+
+    assert dedupe.similarity(_signature(copy_a), _signature(copy_b)) >= dedupe.DEFAULT_THRESHOLD
+    assert dedupe.similarity(_signature(copy_a), _signature(unrelated)) < dedupe.DEFAULT_THRESHOLD
+    groups = dedupe.find_groups([{"url": "unrelated"}, {"url": "a"}, {"url": "b"}])
+
+    assert groups == [["a", "b"]]
+
+
+@pytest.fixture
+def held_back():
+    return [
+        ("rep1", {"url": "copy1a"}),
+        ("rep2", {"url": "copy2a"}),
+        ("rep1", {"url": "copy1b"}),
+        ("rep1", {"url": "copy1c"}),
+    ]
+
+
+def test_failed_representative_is_replaced_by_its_next_copy(held_back):
+    remaining, promoted = claude_extract._promote_representatives(
+        held_back, lambda url: url == "rep2"
+    )
+
+    assert promoted == {"copy1a"}
+    assert remaining == [
+        ("rep2", {"url": "copy2a"}),
+        ("copy1a", {"url": "copy1b"}),
+        ("copy1a", {"url": "copy1c"}),
+    ]
+
+
+def test_nothing_is_promoted_when_every_representative_was_extracted(held_back):
+    remaining, promoted = claude_extract._promote_representatives(held_back, lambda url: True)
+    assert promoted == set()
+    assert remaining == held_back
@@ -0,0 +1,192 @@
+"""Tests for executor.py retries, backoff and hedging, using a fake client and fake SDK errors."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import executor
+from telemetry import ExtractionTelemetry
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FakeTimeoutError(Exception):
+    pass
+
+
+class FakeConnectionError(Exception):
+    pass
+
+
+FAKE_ANTHROPIC = SimpleNamespace(
+    APIStatusError=FakeStatusError,
+    APITimeoutError=FakeTimeoutError,
+    APIConnectionError=FakeConnectionError,
+)
+
+
+class FakeClient:
+    """Client whose messages.create runs `respond(call_number, timeout)`."""
+
+    def __init__(self, respond):
+        self._respond = respond
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.messages = SimpleNamespace(create=self._create)
+
+    def with_options(self, **_options):
+        return self
+
+    def _create(self, timeout=None, **_params):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        return self._respond(number, timeout)
+
+
+@pytest.fixture(autouse=True)
+def fake_sdk(monkeypatch):
+    monkeypatch.setattr(executor, "import_anthropic", lambda: FAKE_ANTHROPIC)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(executor.time, "sleep", recorded.append)
+    return recorded
+
+
+def _failing_then(errors, result="ok"):
+    def respond(number, _timeout):
+        if number <= len(errors):
+            raise errors[number - 1]
+        return result
+
+    return respond
+
+
+def test_retries_transient_errors_then_succeeds(sleeps):
+    telemetry = ExtractionTelemetry()
+    client = FakeClient(
+        _failing_then([FakeStatusError(429), FakeStatusError(529), FakeConnectionError()])
+    )
+    ex = executor.RequestExecutor(client, telemetry, max_retries=4)
+
+    assert ex.create_message(model="m") == "ok"
+    assert client.calls == 4
+    assert telemetry.counters == {"retries": 3}
+    assert len(sleeps) == 3
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 409])
+def test_non_transient_status_is_not_retried(sleeps, status):
+    client = FakeClient(_failing_then([FakeStatusError(status)]))
+    ex = executor.RequestExecutor(client)
+
+    with pytest.raises(FakeStatusError):
+        ex.create_message(model="m")
+    assert client.calls == 1
+    assert sleeps == []
+
+
+def test_gives_up_after_max_retries(sleeps):
+    client = FakeClient(_failing_then([FakeStatusError(500)] * 10))
+    ex = executor.RequestExecutor(client, max_retries=2)
+
+    with pytest.raises(FakeStatusError):
+        ex.create_message(model="m")
+    assert client.calls == 3
+
+
+def test_backoff_grows_exponentially_with_jitter(sleeps):
+    client = FakeClient(_failing_then([FakeStatusError(503)] * 4))
+    ex = executor.RequestExecutor(client, max_retries=4)
+
+    ex.create_message(model="m")
+    for attempt, delay in enumerate(sleeps):
+        base = min(executor._BACKOFF_MAX, executor._BACKOFF_BASE**attempt)
+        assert base * 0.5 <= delay <= base
+
+
+def test_retry_after_header_overrides_backoff(sleeps):
+    client = FakeClient(_failing_then([FakeStatusError(429, retry_after=7)]))
+    ex = executor.RequestExecutor(client)
+
+    ex.create_message(model="m")
+    assert sleeps == [7.0]
+
+
+def test_retry_that_would_pass_the_deadline_is_not_attempted(sleeps):
+    telemetry = ExtractionTelemetry()
+    client = FakeClient(_failing_then([FakeStatusError(429, retry_after=executor._REQUEST_DEADLINE)]))
+    ex = executor.RequestExecutor(client, telemetry)
+
+    with pytest.raises(FakeStatusError):
+        ex.create_message(model="m")
+    assert client.calls == 1
+    assert telemetry.counters == {"deadline_exceeded": 1}
+
+
+def _hedging_executor(client, telemetry, concurrency=1, p95=0.05):
+    ex = executor.RequestExecutor(client, telemetry, hedge=True, concurrency=concurrency)
+    ex._latencies.extend([p95] * executor._HEDGE_MIN_SAMPLES)
+    return ex
+
+
+def test_slow_call_is_hedged_and_duplicate_wins():
+    release = threading.Event()
+
+    def respond(number, _timeout):
+        if number == 1:
+            release.wait(5)
+            return "primary"
+        return "duplicate"
+
+    telemetry = ExtractionTelemetry()
+    ex = _hedging_executor(FakeClient(respond), telemetry)
+    try:
+        assert ex.create_message(model="m") == "duplicate"
+        assert telemetry.counters == {"hedges": 1, "hedge_wins": 1}
+    finally:
+        release.set()
+        ex.close()
+
+
+def test_hedge_slot_is_held_until_the_loser_finishes():
+    release = threading.Event()
+
+    def respond(number, _timeout):
+        # The first primary is stuck; every later call is slow but finishes
+        if number == 1:
+            release.wait(5)
+            return "stuck"
+        time.sleep(0.1)
+        return f"call {number}"
+
+    telemetry = ExtractionTelemetry()
+    ex = _hedging_executor(FakeClient(respond), telemetry, concurrency=1)
+    try:
+        assert ex.create_message(model="m") == "call 2"
+        # The stuck loser still holds the only hedge slot, so this call is not hedged
+        assert ex.create_message(model="m") == "call 3"
+        assert telemetry.counters["hedges"] == 1
+        assert telemetry.counters["hedges_skipped"] == 1
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while not ex._hedge_slots.acquire(blocking=False):
+            assert time.monotonic() < deadline, "hedge slot was never released"
+            time.sleep(0.01)
+        ex._hedge_slots.release()
+    finally:
+        release.set()
+        ex.close()
@@ -0,0 +1,103 @@
+"""Tests for json_stream.py incremental readers, including values split across read chunks."""
+
+import json
+
+import pytest
+
+import json_stream
+from json_stream import iter_records
+
+RECORDS = [
+    {"url": "https://www.youtube.com/watch?v=a", "title": "First, \"quoted\" ]", "duration": 12.5},
+    {"url": "https://www.youtube.com/watch?v=b", "transcript": "line one\nline two", "views": 1234567},
+    {"url": "https://www.youtube.com/watch?v=c", "nested": {"list": [1, 2, {"x": None}]}},
+]
+
+
+@pytest.fixture
+def tiny_chunks(monkeypatch):
+    """Force every value to straddle buffer refills."""
+    monkeypatch.setattr(json_stream, "_CHUNK_SIZE", 3)
+
+
+def _write(tmp_path, text: str):
+    path = tmp_path / "input.json"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_array_round_trips(tmp_path, indent):
+    path = _write(tmp_path, json.dumps(RECORDS, indent=indent))
+    assert list(iter_records(path)) == RECORDS
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_array_with_values_split_across_chunks(tmp_path, tiny_chunks, indent):
+    path = _write(tmp_path, json.dumps(RECORDS, indent=indent))
+    assert list(iter_records(path)) == RECORDS
+
+
+def test_number_at_a_chunk_edge_is_not_cut_short(tmp_path, tiny_chunks):
+    path = _write(tmp_path, "[12.5, 1234567, -0.25e3]")
+    assert list(iter_records(path)) == [12.5, 1234567, -250.0]
+
+
+@pytest.mark.parametrize("chunk_size", [7, 16, 61])
+def test_every_kind_of_value_survives_any_chunk_edge(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(json_stream, "_CHUNK_SIZE", chunk_size)
+    records = RECORDS + [
+        {"text": "caf\u00e9 \U0001f600 \\ \"q\"", "flags": [True, False, None], "n": -1.25e10},
+    ]
+    for ensure_ascii in (True, False):
+        path = _write(tmp_path, json.dumps(records, ensure_ascii=ensure_ascii))
+        assert list(iter_records(path)) == records
+
+
+def test_malformed_record_fails_without_reading_the_rest_of_the_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_stream, "_CHUNK_SIZE", 64)
+    filler = [{"url": f"https://www.youtube.com/watch?v={i}", "transcript": "x" * 200} for i in range(200)]
+    path = _write(tmp_path, '[{"url": "a", "title": oops}, ' + json.dumps(filler)[1:])
+    fills = []
+    original_fill = json_stream._CharReader.fill
+
+    def counting_fill(self):
+        fills.append(len(self.buf))
+        return original_fill(self)
+
+    monkeypatch.setattr(json_stream._CharReader, "fill", counting_fill)
+    with pytest.raises(ValueError):
+        list(iter_records(path))
+    assert len(fills) <= 2
+
+
+def test_json_lines_skip_blank_lines(tmp_path):
+    path = _write(tmp_path, "\n".join(json.dumps(r) for r in RECORDS[:2]) + "\n\n" + json.dumps(RECORDS[2]))
+    assert list(iter_records(path)) == RECORDS
+
+
+def test_empty_array(tmp_path):
+    assert list(iter_records(_write(tmp_path, "  [ ]\n"))) == []
+
+
+def test_records_are_yielded_before_a_later_parse_error(tmp_path):
+    path = _write(tmp_path, json.dumps(RECORDS)[:-1] + ", {broken}]")
+    records = iter_records(path)
+    assert [next(records) for _ in RECORDS] == RECORDS
+    with pytest.raises(ValueError):
+        next(records)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['"not an array"', "[1, 2", "[1 2]", '[{"a": 1}'],
+)
+def test_malformed_arrays_raise_value_error(tmp_path, text):
+    with pytest.raises(ValueError):
+        list(iter_records(_write(tmp_path, text)))
+
+
+def test_malformed_json_line_reports_its_line_number(tmp_path):
+    path = _write(tmp_path, '{"a": 1}\n{"b": \n')
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_records(path))
@@ -0,0 +1,141 @@
+"""Tests for local_extract.py: the coordinate, date and state patterns and merging into entries."""
+
+import pytest
+
+import local_extract
+from video_record import Confidence, Location, VideoEntry
+
+
+@pytest.mark.parametrize(
+    "text, lat, lng",
+    [
+        ("Meet-up spot 30.2672, -97.7431", 30.2672, -97.7431),
+        ("at 30.2672 N, 97.7431 W today", 30.2672, -97.7431),
+        ("GPS 30°16'2\"N 97°44'35\"W", 30.267222, -97.743056),
+    ],
+)
+def test_extract_coordinates_forms(text, lat, lng):
+    result = local_extract.extract_coordinates(text)
+    assert (result["latitude"], result["longitude"]) == (lat, lng)
+
+
+@pytest.mark.parametrize("text", ["version 1.2345, 6.7890", "Paris 48.8566, 2.3522", "no numbers"])
+def test_extract_coordinates_ignores_pairs_outside_the_us(text):
+    assert local_extract.extract_coordinates(text) is None
+
+
+@pytest.mark.parametrize(
+    "text, value",
+    [
+        ("Filmed 2024-03-15 downtown", "2024-03-15"),
+        ("Filmed 3/15/2024 downtown", "2024-03-15"),
+        ("Filmed on March 15, 2024", "2024-03-15"),
+        ("Filmed on the 15th of March 2024", "2024-03-15"),
+    ],
+)
+def test_extract_date_absolute_forms(text, value):
+    assert local_extract.extract_date(text, None)["value"] == value
+
+
+def test_extract_date_resolves_relative_and_yearless_dates_against_publication():
+    assert local_extract.extract_date("This happened yesterday", "20240316")["value"] == "2024-03-15"
+    assert local_extract.extract_date("three days ago", "20240318")["value"] == "2024-03-15"
+    # March 15 2024 was a Friday; published the following Monday
+    assert local_extract.extract_date("last Friday", "20240318")["value"] == "2024-03-15"
+    # A December date seen in January belongs to the previous year
+    assert local_extract.extract_date("Filmed Dec 30", "20240105")["value"] == "2023-12-30"
+
+
+def test_extract_date_rejects_implausible_dates():
+    assert local_extract.extract_date("Filmed 2030-01-01", "20240316") is None
+    assert local_extract.extract_date("Filmed 1985-01-01", None) is None
+    assert local_extract.extract_date("officers may 2 arrive", None) is None
+
+
+def test_extract_date_lowers_confidence_when_dates_conflict():
+    result = local_extract.extract_date("Filmed 2024-03-15, court date 2024-04-02", None)
+    assert result["value"] == "2024-03-15"
+    assert result["confidence"] == 0.5
+
+
+@pytest.mark.parametrize(
+    "text, code, confidence",
+    [
+        ("Audit in Texas", "TX", 0.85),
+        ("City Hall, Austin, TX", "TX", 0.85),
+        ("Mailing address TX 78701", "TX", 0.85),
+        ("Visiting Washington, D.C. today", "DC", 0.9),
+        ("COPS CALLED IN NY", "NY", 0.75),
+        ("Texas audit, Austin, TX", "TX", 0.9),
+        ("From Texas to Ohio", "TX", 0.4),
+    ],
+)
+def test_extract_state(text, code, confidence):
+    result = local_extract.extract_state(text)
+    assert (result["value"], result["confidence"]) == (code, confidence)
+
+
+def test_extract_state_skips_codes_that_are_common_words():
+    assert local_extract.extract_state("I WAS IN THE LOBBY OR THE HALL") is None
+    assert local_extract.extract_state("Springfield, IN")["value"] == "IN"
+
+
+def _entry(location=None, location_confidence=0.0, video_date=None, date_confidence=0.0):
+    return VideoEntry(
+        youtubeUrl="https://www.youtube.com/watch?v=abc",
+        videoDate=video_date,
+        location=location,
+        confidence=Confidence(location=location_confidence, videoDate=date_confidence),
+    )
+
+
+def _local(text, published=None):
+    return local_extract.extract({"title": "", "description": text, "published": published})
+
+
+def test_merge_attaches_coordinates_without_raising_location_confidence():
+    entry = _entry(Location(name="Town Hall"), location_confidence=0.3)
+    local_extract.merge(entry, _local("Meet-up spot 30.2672, -97.7431"))
+    assert (entry.location.latitude, entry.location.longitude) == (30.2672, -97.7431)
+    assert entry.confidence.location == 0.3
+
+
+def test_merge_keeps_claudes_coordinates_and_creates_no_location():
+    located = _entry(Location(name="Town Hall", latitude=1.0, longitude=2.0), 0.8)
+    local_extract.merge(located, _local("30.2672, -97.7431"))
+    assert (located.location.latitude, located.location.longitude) == (1.0, 2.0)
+
+    unlocated = _entry()
+    local_extract.merge(unlocated, _local("30.2672, -97.7431"))
+    assert unlocated.location is None
+
+
+def test_merge_fills_a_null_date_below_the_seeder_threshold():
+    entry = _entry()
+    local_extract.merge(entry, _local("Filmed 2024-03-15"))
+    assert entry.videoDate == "2024-03-15"
+    assert entry.confidence.videoDate < 0.5
+
+
+def test_merge_raises_confidence_of_a_matching_date_and_keeps_a_different_one():
+    matching = _entry(video_date="2024-03-15", date_confidence=0.6)
+    local_extract.merge(matching, _local("Filmed 2024-03-15"))
+    assert matching.confidence.videoDate == 0.9
+
+    different = _entry(video_date="2024-03-10", date_confidence=0.6)
+    local_extract.merge(different, _local("Filmed 2024-03-15"))
+    assert (different.videoDate, different.confidence.videoDate) == ("2024-03-10", 0.6)
+
+
+def test_merge_fills_state_only_above_the_bare_code_confidence():
+    named = _entry(Location(name="Town Hall"))
+    local_extract.merge(named, _local("Audit in Texas"))
+    assert named.location.state == "TX"
+
+    bare = _entry(Location(name="Town Hall"))
+    local_extract.merge(bare, _local("COPS CALLED IN NY"))
+    assert bare.location.state is None
+
+    kept = _entry(Location(name="Town Hall", state="OK"))
+    local_extract.merge(kept, _local("Audit in Texas"))
+    assert kept.location.state == "OK"
@@ -0,0 +1,53 @@
+"""Tests for preclassify.py scoring and the skip rule."""
+
+import preclassify
+from preclassify import DEFAULT_THRESHOLD
+
+
+def test_features_are_weighted_by_field():
+    assert preclassify.score_record({"title": "Police"}) == (6.0, ["title:police"])
+    assert preclassify.score_record({"description": "Police"}) == (4.0, ["description:police"])
+    assert preclassify.score_record({"transcript": "Police"}) == (2.0, ["transcript:police"])
+
+
+def test_each_feature_counts_once_per_field():
+    assert preclassify.score_record({"title": "Police! POLICE, police."})[0] == 6.0
+
+
+def test_phrases_count_alongside_their_words():
+    score, matched = preclassify.score_record({"title": "First Amendment audit"})
+    assert matched == ["title:amendment", "title:audit", "title:first amendment"]
+    assert score == 22.5
+
+
+def test_transcript_contribution_is_capped():
+    transcript = "police officer deputy sheriff trooper arrest audit warrant"
+    assert preclassify.score_record({"transcript": transcript})[0] == 6.0
+    assert preclassify.score_record({"transcript": "vlog merch giveaway recipe"})[0] == -6.0
+
+
+def test_transcript_is_not_scanned_when_title_and_description_decide():
+    record = {"title": "Police audit", "transcript": "vlog merch giveaway"}
+    score, matched = preclassify.score_record(record, threshold=DEFAULT_THRESHOLD)
+    assert score == 13.5
+    assert not any(feature.startswith("transcript:") for feature in matched)
+
+
+def test_default_threshold_needs_negative_evidence():
+    assert DEFAULT_THRESHOLD <= 0
+    # Nothing matched: possibly an accountability video worded unusually
+    assert preclassify.classify({"title": "A walk downtown"}) is None
+    # A lone weak negative mention is not enough
+    assert preclassify.classify({"description": "Support me on Patreon"}) is None
+
+
+def test_classify_returns_an_audit_entry_for_skipped_records():
+    record = {"url": "https://www.youtube.com/watch?v=abc", "title": "Beach vlog"}
+    assert preclassify.classify(record) == {
+        "url": "https://www.youtube.com/watch?v=abc",
+        "title": "Beach vlog",
+        "score": -9.0,
+        "threshold": DEFAULT_THRESHOLD,
+        "features": ["title:vlog"],
+    }
+    assert preclassify.classify(record, threshold=-10.0) is None
@@ -0,0 +1,76 @@
+"""Tests for router.py deadline parsing, route planning and the batch cut-over rule."""
+
+import argparse
+from datetime import datetime
+
+import pytest
+
+import router
+from router import SAFETY_MARGIN_SECONDS
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [("90", 90), ("90m", 5400), ("6h", 21600), ("1h30m", 5400), ("1d", 86400), (" 2H ", 7200)],
+)
+def test_parse_deadline_durations(value, seconds):
+    assert router.parse_deadline(value) == seconds
+
+
+def test_parse_deadline_timestamp():
+    now = datetime(2025, 6, 1, 12, 0)
+    assert router.parse_deadline("2025-06-01T18:00", now=now) == 6 * 3600
+
+
+@pytest.mark.parametrize("value", ["soon", "0", "2020-01-01T00:00"])
+def test_parse_deadline_rejects_invalid_or_past(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        router.parse_deadline(value)
+
+
+def test_estimate_grows_with_prompt_size():
+    assert router.estimate_call_seconds(400_000) > router.estimate_call_seconds(4_000) > 0
+
+
+def test_realtime_seconds_is_bounded_by_the_longest_call():
+    assert router.realtime_seconds([], 4) == 0.0
+    assert router.realtime_seconds([10, 10, 10, 10], 2) == 20
+    assert router.realtime_seconds([100, 1, 1], 8) == 100
+
+
+def test_plan_routes_batches_everything_when_real_time_would_fit():
+    assert router.plan_routes([10.0] * 10, concurrency=2, budget=50) == 0
+
+
+def test_plan_routes_fills_the_budget_from_the_front():
+    # 10 calls of 10s at concurrency 2 need 50s; 30s of budget fits 6 of them
+    assert router.plan_routes([10.0] * 10, concurrency=2, budget=30) == 6
+
+
+def test_plan_routes_with_no_requests():
+    assert router.plan_routes([], concurrency=4, budget=10) == 0
+
+
+def test_no_cut_over_while_there_is_plenty_of_time():
+    assert not router.should_cut_over(remaining_seconds=3600, straggler_seconds=600)
+
+
+def test_cut_over_once_stragglers_only_just_fit():
+    assert router.should_cut_over(remaining_seconds=600 + SAFETY_MARGIN_SECONDS, straggler_seconds=600)
+    assert router.should_cut_over(remaining_seconds=600, straggler_seconds=600)
+
+
+def test_no_cut_over_when_stragglers_no_longer_fit():
+    # Canceling would only send the stragglers past the deadline; the batch may still finish
+    assert not router.should_cut_over(remaining_seconds=60, straggler_seconds=600)
+
+
+def test_time_claimed_by_the_real_time_lane_is_not_available():
+    # Over budget: the lane has claimed nearly all the time left, so the batch is left running
+    assert not router.should_cut_over(
+        remaining_seconds=3600, straggler_seconds=600, claimed_seconds=3500
+    )
+    # Once the lane has caught up, the same stragglers fit and the cut-over happens
+    assert router.should_cut_over(
+        remaining_seconds=900, straggler_seconds=600, claimed_seconds=100
+    )
@@ -0,0 +1,103 @@
+"""Tests for shards.py shard assignment and shard-output merging."""
+
+import argparse
+import json
+from collections import Counter
+
+import pytest
+
+import shards
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ?t=42",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/live/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    ],
+)
+def test_video_id_url_forms(url):
+    assert shards.video_id(url) == "dQw4w9WgXcQ"
+
+
+def test_video_id_falls_back_to_the_url():
+    assert shards.video_id("not a youtube url") == "not a youtube url"
+
+
+def test_shard_of_is_fixed_across_processes_and_url_forms():
+    # Pinned values: a change would reassign videos between machines mid-backfill
+    assert shards.shard_of("https://www.youtube.com/watch?v=dQw4w9WgXcQ", 1000) == 142
+    assert shards.shard_of("https://youtu.be/jNQXAC9IVRw", 1000) == 333
+    assert shards.shard_of("https://www.youtube.com/shorts/9bZkp7q19f0", 1000) == 942
+    assert shards.shard_of("https://youtu.be/dQw4w9WgXcQ", 4) == 2
+
+
+def test_shard_of_spreads_videos_evenly():
+    counts = Counter(
+        shards.shard_of(f"https://www.youtube.com/watch?v=v{i:010d}", 4) for i in range(4000)
+    )
+    assert sorted(counts) == [0, 1, 2, 3]
+    assert all(900 <= n <= 1100 for n in counts.values())
+
+
+@pytest.mark.parametrize("value, parsed", [("0/4", (0, 4)), (" 3 / 4 ", (3, 4)), ("0/1", (0, 1))])
+def test_parse_shard(value, parsed):
+    assert shards.parse_shard(value) == parsed
+
+
+@pytest.mark.parametrize("value", ["4/4", "1/0", "-1/4", "a/b", "2"])
+def test_parse_shard_rejects_invalid(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        shards.parse_shard(value)
+
+
+def _entry(video: str) -> dict:
+    return {"youtubeUrl": f"https://www.youtube.com/watch?v={video}", "title": video}
+
+
+def _write_shard(path, entries, shard=None, errors=()):
+    path.write_text(json.dumps(entries), encoding="utf-8")
+    if shard is not None:
+        summary = {"shard": shard, "processed": len(entries), "errors": list(errors)}
+        shards.errors_path(path).write_text(json.dumps(summary), encoding="utf-8")
+    return path
+
+
+def test_merge_keeps_existing_first_and_sorts_new_entries(tmp_path):
+    existing = [_entry("zzz"), _entry("aaa")]
+    second = _write_shard(tmp_path / "out.shard-1.json", [_entry("ddd"), _entry("bbb")], "1/2")
+    first = _write_shard(tmp_path / "out.shard-0.json", [_entry("ccc")], "0/2", ["Failed x"])
+
+    merged, reports, errors = shards.merge(existing, [second, first])
+    assert [entry["title"] for entry in merged] == ["zzz", "aaa", "bbb", "ccc", "ddd"]
+    assert errors == []
+    assert [(r["shard"], r["added"], r["errors"]) for r in reports] == [
+        ("0/2", 1, ["Failed x"]),
+        ("1/2", 2, []),
+    ]
+
+
+def test_merge_drops_duplicates_keeping_the_first_occurrence(tmp_path):
+    duplicate = dict(_entry("bbb"), title="second copy")
+    first = _write_shard(tmp_path / "out.shard-0.json", [_entry("aaa"), _entry("bbb")])
+    second = _write_shard(tmp_path / "out.shard-1.json", [duplicate, _entry("ccc")])
+
+    merged, reports, _ = shards.merge([_entry("aaa")], [second, first])
+    assert [entry["title"] for entry in merged] == ["aaa", "bbb", "ccc"]
+    assert [(r["added"], r["duplicates"]) for r in reports] == [(1, 1), (1, 1)]
+
+
+def test_merge_reports_unreadable_shards_and_missing_ones(tmp_path):
+    good = _write_shard(tmp_path / "out.shard-0.json", [_entry("aaa")], "0/3")
+    bad = tmp_path / "out.shard-1.json"
+    bad.write_text("{not json", encoding="utf-8")
+
+    merged, reports, errors = shards.merge([], [good, bad])
+    assert [entry["title"] for entry in merged] == ["aaa"]
+    assert len(errors) == 1 and "out.shard-1.json" in errors[0]
+    assert "error" in reports[1]
+    assert shards._missing_shards(reports) == ["1/3", "2/3"]
@@ -0,0 +1,224 @@
+"""
+Shared record types and JSON serialization for the metadata pipeline.
+
+fetch_youtube.py writes youtube-data records and claude_extract.py writes
+seed-data entries. Both used to hold them as plain dicts, repeating every key
+in every record, and rewrote them with pretty-printed stdlib json. This
+module defines the two schemas as slotted dataclasses and serializes them
+through one JSON backend:
+
+- YouTubeRecord: a fetch_youtube.py record (the intermediate format).
+- VideoEntry (with Location and Confidence): a claude_extract.py entry (the
+  seed-data format).
+
+Fields a record carries beyond its schema are kept in `extra` and written
+back after the known ones, so older or hand-edited files round-trip.
+
+The backend is orjson when it is installed and the stdlib json module
+otherwise. Set METADATA_JSON_BACKEND=json (or orjson) to choose one. Both
+write the same layout; only the spelling of some floats (1e+16 vs 1e16)
+differs. Compact files hold one record per line and no indentation, and
+are still a JSON array that every reader of the indented format accepts.
+"""
+
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, fields
+from functools import cache
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+
+def _select_backend() -> str:
+    name = os.environ.get("METADATA_JSON_BACKEND", "auto")
+    if name not in JSON_BACKENDS:
+        raise ValueError(
+            f"METADATA_JSON_BACKEND must be one of {', '.join(JSON_BACKENDS)}, got {name!r}"
+        )
+    if name == "orjson" and orjson is None:
+        raise ValueError("METADATA_JSON_BACKEND=orjson, but orjson is not installed")
+    if name == "auto":
+        return "orjson" if orjson is not None else "json"
+    return name
+
+
+BACKEND = _select_backend()
+
+
+def dumps(obj, indent: bool = False) -> str:
+    """Serialize to JSON text: 2-space indented, or compact (no whitespace)."""
+    if BACKEND == "orjson":
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: str | bytes):
+    """Parse JSON text."""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json_array(path: Path) -> list:
+    """Read a whole JSON file (indented or compact).
+
+    Raises:
+        ValueError: If the file is not valid JSON (json.JSONDecodeError and
+            orjson.JSONDecodeError are both ValueError subclasses).
+    """
+    return loads(path.read_bytes())
+
+
+def _to_dict(record) -> dict:
+    return record.to_dict() if hasattr(record, "to_dict") else record
+
+
+def write_json_array(path: Path, records: Iterable, compact: bool = False) -> int:
+    """Write records (dataclasses or dicts) to a JSON array file, one at a time.
+
+    The indented layout is that of json.dump(records, indent=2); the compact
+    one puts each record on its own line.
+
+    Returns:
+        Number of records written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    separator, prefix = (",\n", "\n") if compact else (",\n  ", "\n  ")
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record in records:
+            f.write(separator if count else prefix)
+            text = dumps(_to_dict(record), indent=not compact)
+            f.write(text if compact else text.replace("\n", "\n  "))
+            count += 1
+        f.write("\n]\n" if count else "]\n")
+    return count
+
+
+@cache
+def _field_names(cls) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.name != "extra")
+
+
+def _split(cls, data: dict) -> tuple[dict, dict | None]:
+    """Split a dict into the dataclass's known fields and the rest."""
+    names = _field_names(cls)
+    known = {name: data[name] for name in names if name in data}
+    extra = {key: value for key, value in data.items() if key not in names}
+    return known, extra or None
+
+
+def _record_dict(record) -> dict:
+    data = {name: getattr(record, name) for name in _field_names(type(record))}
+    if record.extra:
+        data.update(record.extra)
+    return data
+
+
+@dataclass(slots=True)
+class YouTubeRecord:
+    """A video's YouTube metadata and transcript, as written by fetch_youtube.py."""
+
+    url: str
+    title: str = ""
+    description: str = ""
+    channel: str = ""
+    thumbnail: str | None = None
+    duration: int | None = None
+    published: str | None = None
+    transcript: str | None = None
+    fingerprint: str | None = None
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "YouTubeRecord":
+        known, extra = _split(cls, data)
+        return cls(**known, extra=extra)
+
+    def to_dict(self) -> dict:
+        return _record_dict(self)
+
+
+@dataclass(slots=True)
+class Location:
+    """Where an encounter took place (seed-data `location`)."""
+
+    name: str | None = None
+    streetAddress: str | None = None
+    city: str | None = None
+    state: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Location":
+        known, extra = _split(cls, data)
+        return cls(**known, extra=extra)
+
+    def to_dict(self) -> dict:
+        return _record_dict(self)
+
+
+@dataclass(slots=True)
+class Confidence:
+    """Claude's confidence in each extracted field (seed-data `confidence`)."""
+
+    amendments: float = 0.0
+    participants: float = 0.0
+    videoDate: float = 0.0
+    location: float = 0.0
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Confidence":
+        known, extra = _split(cls, data)
+        return cls(**known, extra=extra)
+
+    def to_dict(self) -> dict:
+        return _record_dict(self)
+
+
+@dataclass(slots=True)
+class VideoEntry:
+    """A seed-data entry, as written by claude_extract.py."""
+
+    youtubeUrl: str
+    title: str = ""
+    description: str = ""
+    channelName: str = ""
+    thumbnailUrl: str | None = None
+    durationSeconds: int | None = None
+    amendments: list | None = None
+    participants: list | None = None
+    videoDate: str | None = None
+    location: Location | None = None
+    confidence: Confidence | None = None
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VideoEntry":
+        known, extra = _split(cls, data)
+        if isinstance(known.get("location"), dict):
+            known["location"] = Location.from_dict(known["location"])
+        if isinstance(known.get("confidence"), dict):
+            known["confidence"] = Confidence.from_dict(known["confidence"])
+        return cls(**known, extra=extra)
+
+    def to_dict(self) -> dict:
+        data = _record_dict(self)
+        if self.location is not None:
+            data["location"] = self.location.to_dict()
+        if self.confidence is not None:
+            data["confidence"] = self.confidence.to_dict()
+        return data
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Warm yt-dlp daemon shared by list_channel.py and fetch_youtube.py.
+
+Every run of either script pays for interpreter startup, the yt-dlp import,
+extractor initialization and cookie loading, and cron jobs run them many
+times an hour. Concurrent runs also each keep their own pace, so together
+they can exceed what YouTube tolerates. This daemon keeps yt-dlp loaded and
+its YoutubeDL sessions (with their cookies) open, and runs every request
+through one rate limiter.
+
+Both scripts delegate to the daemon automatically while it is running;
+their output is the same either way. A request that gets HTTP 429 starts a
+cooldown during which every client's requests fail fast with a 429 error,
+so each script stops as it would on its own rate limit.
+
+The daemon listens on a Unix socket or, with --port, on a localhost TCP
+port. The default socket is ytdl-daemon.sock in $XDG_RUNTIME_DIR, or else in
+a ytdl-daemon-<uid> directory in the temp directory that only this user may
+enter; clients find it on their own. Clients only connect to a socket owned
+by their own user, since whoever answers sees every URL and cookie option
+and supplies the info the scripts write. Set YTDL_DAEMON to a socket path or
+host:port to use another daemon, or to "off" to never delegate. A TCP port
+cannot be checked that way, so only use one on a single-user machine.
+
+If the daemon stops answering (no reply within REPLY_TIMEOUT seconds, or the
+connection fails), clients warn and run yt-dlp in-process for the rest of
+the run.
+
+Usage:
+    python ytdl_daemon.py
+    python ytdl_daemon.py --rate 20 --burst 5 --cooldown 900
+    python ytdl_daemon.py --port 8765          # clients: YTDL_DAEMON=127.0.0.1:8765
+    python ytdl_daemon.py --status
+    python ytdl_daemon.py --stop
+"""
+
+import argparse
+import os
+import shutil
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack
+from functools import cache
+from pathlib import Path
+
+import video_record
+
+DEFAULT_RATE = 30.0
+DEFAULT_BURST = 5
+DEFAULT_COOLDOWN = 600.0
+
+# Listing entries sent per message; about one YouTube page, so a client that
+# stops early leaves at most one page requested in vain
+_ENTRY_CHUNK = 30
+_CONNECT_TIMEOUT = 1.0
+
+# Longest wait for any one reply: a request may queue behind the rate limiter
+# before yt-dlp runs, so this is generous, but a stuck daemon cannot hang a run
+REPLY_TIMEOUT = 600.0
+
+# Set once a daemon stops answering; the rest of the run uses yt-dlp in-process
+_daemon_failed = threading.Event()
+
+
+class DaemonError(Exception):
+    """A request failed in the daemon; the message is yt-dlp's error."""
+
+
+def default_address() -> str | tuple[str, int] | None:
+    """Return the daemon address clients use: YTDL_DAEMON, else the default socket.
+
+    Returns None when YTDL_DAEMON is "off", or unset where there are no Unix sockets.
+    """
+    value = os.environ.get("YTDL_DAEMON", "")
+    if value.lower() == "off":
+        return None
+    if value:
+        return _parse_address(value)
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    return default_socket()
+
+
+def default_socket() -> str:
+    """Return the default socket path, in a directory only this user may enter."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        directory = Path(runtime_dir)
+    else:
+        directory = Path(tempfile.gettempdir()) / f"ytdl-daemon-{os.getuid()}"
+    return str(directory / "ytdl-daemon.sock")
+
+
+def _make_private_dir(directory: Path) -> None:
+    """Create the default socket's directory (mode 0700), or check that an existing one is private.
+
+    Raises:
+        PermissionError: If the directory belongs to another user or others may enter it.
+    """
+    try:
+        directory.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{directory} is not a directory private to this user")
+
+
+def _check_owner(path: str) -> None:
+    """Refuse a Unix socket another user created.
+
+    Raises:
+        PermissionError: If the socket is owned by another user.
+        FileNotFoundError: If there is no socket at the path.
+    """
+    if os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+
+
+def _parse_address(value: str) -> str | tuple[str, int]:
+    """Parse "host:port" into a TCP address; anything else is a socket path."""
+    host, _, port = value.rpartition(":")
+    if host and port.isdigit() and "/" not in value:
+        return host, int(port)
+    return value
+
+
+def _connect(address: str | tuple[str, int], timeout: float | None = None) -> socket.socket:
+    if isinstance(address, tuple):
+        return socket.create_connection(address, timeout=timeout)
+    _check_owner(address)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+@cache
+def find_daemon() -> str | tuple[str, int] | None:
+    """Return the address of a running daemon, or None. Checked once per process."""
+    address = default_address()
+    if address is None or (isinstance(address, str) and not os.path.exists(address)):
+        return None
+    try:
+        _connect(address, _CONNECT_TIMEOUT).close()
+    except PermissionError as e:
+        print(f"Warning: Not using the fetch daemon: {e}", file=sys.stderr)
+        return None
+    except OSError:
+        return None
+    return address
+
+
+def import_yt_dlp():
+    """Import yt-dlp on first use and return the module.
+
+    Importing it takes most of list_channel.py's and fetch_youtube.py's
+    startup time, so --help, argument errors and runs with nothing to list or
+    fetch never load it, and neither does a client of a running daemon.
+    Exits with install instructions if the package is missing.
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        print(
+            "Error: 'yt-dlp' package is not installed. Run: pip install -r requirements.txt",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return yt_dlp
+
+
+def youtube_dl(ydl_opts: dict):
+    """Return a YoutubeDL for these options, run by the daemon when one is running."""
+    address = find_daemon()
+    if address is not None and not _daemon_failed.is_set():
+        return DaemonYoutubeDL(ydl_opts, address)
+    return import_yt_dlp().YoutubeDL(ydl_opts)
+
+
+def _send(wfile, message: dict) -> None:
+    wfile.write(video_record.dumps(message).encode("utf-8") + b"\n")
+    wfile.flush()
+
+
+def _receive(rfile) -> dict | None:
+    line = rfile.readline()
+    return video_record.loads(line) if line else None
+
+
+def _close(sock: socket.socket, *files) -> None:
+    # The socket stays open until its file objects are closed too
+    for f in files:
+        f.close()
+    sock.close()
+
+
+class DaemonYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that runs extract_info in the daemon.
+
+    Subtitle files the daemon downloads are written where `outtmpl` points,
+    as yt-dlp would. Lazy listings (process=False) keep their entries a
+    generator: the daemon pages through the channel as entries are consumed.
+    If the daemon cannot be reached or does not reply in time, the request
+    runs in-process instead.
+    """
+
+    def __init__(self, ydl_opts: dict, address: str | tuple[str, int]):
+        self._opts = dict(ydl_opts)
+        self._outtmpl = self._opts.pop("outtmpl", None)
+        self._address = address
+        self._local = None
+
+    def __enter__(self) -> "DaemonYoutubeDL":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._local is not None:
+            self._local.__exit__(exc_type, exc, tb)
+        return None
+
+    def _in_process(self, reason: str):
+        """Switch this run to an in-process YoutubeDL after the daemon failed."""
+        if not _daemon_failed.is_set():
+            _daemon_failed.set()
+            print(f"Warning: Fetch daemon {reason}; running yt-dlp in-process.", file=sys.stderr)
+        if self._local is None:
+            opts = dict(self._opts)
+            if self._outtmpl:
+                opts["outtmpl"] = self._outtmpl
+            self._local = import_yt_dlp().YoutubeDL(opts).__enter__()
+        return self._local
+
+    def extract_info(self, url: str, download: bool = True, process: bool = True) -> dict:
+        if _daemon_failed.is_set():
+            return self._in_process("").extract_info(url, download=download, process=process)
+        try:
+            sock = _connect(self._address, REPLY_TIMEOUT)
+        except OSError as e:
+            return self._in_process(f"unreachable ({e})").extract_info(
+                url, download=download, process=process
+            )
+        rfile, wfile = sock.makefile("rb"), sock.makefile("wb")
+        try:
+            _send(wfile, {
+                "op": "extract_info", "url": url, "opts": self._opts,
+                "download": download, "process": process,
+            })
+            reply = _receive(rfile)
+        except OSError as e:
+            _close(sock, rfile, wfile)
+            reason = "did not reply in time" if isinstance(e, TimeoutError) else f"failed ({e})"
+            return self._in_process(reason).extract_info(url, download=download, process=process)
+        except BaseException:
+            _close(sock, rfile, wfile)
+            raise
+        if reply is None:
+            _close(sock, rfile, wfile)
+            return self._in_process("closed the connection").extract_info(
+                url, download=download, process=process
+            )
+        if "error" in reply:
+            _close(sock, rfile, wfile)
+            raise DaemonError(reply["error"])
+
+        if self._outtmpl and reply.get("files"):
+            directory = Path(self._outtmpl).parent
+            for name, text in reply["files"].items():
+                (directory / Path(name).name).write_text(text, encoding="utf-8")
+        info = reply["info"]
+        if reply.get("entries"):
+            info["entries"] = self._iter_entries(sock, rfile, wfile)
+        else:
+            _close(sock, rfile, wfile)
+        return info
+
+    @staticmethod
+    def _iter_entries(sock: socket.socket, rfile, wfile) -> Iterator[dict]:
+        """Yield streamed listing entries, asking for the next chunk as each runs out."""
+        try:
+            while True:
+                try:
+                    reply = _receive(rfile)
+                except OSError as e:
+                    # Part of the listing was already consumed, so there is no falling back
+                    raise DaemonError(f"fetch daemon stopped answering: {e}") from e
+                if reply is None:
+                    raise DaemonError("fetch daemon closed the connection")
+                if "error" in reply:
+                    raise DaemonError(reply["error"])
+                yield from reply["entries"]
+                if not reply["more"]:
+                    return
+                _send(wfile, {"op": "next"})
+        finally:
+            # Closing early tells the daemon to stop paging
+            _close(sock, rfile, wfile)
+
+
+class RateLimiter:
+    """Token bucket shared by every request: `rate` per minute, bursts of `burst`."""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self._rate = rate_per_minute / 60.0
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is due. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # A negative balance reserves a future token, so waiters are served in order
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class _Sessions:
+    """Open YoutubeDL instances, pooled by their options.
+
+    Each instance is used by one request at a time and downloads into its
+    own directory, from which the request's files are collected.
+    """
+
+    def __init__(self, yt_dlp, workdir: Path):
+        self._yt_dlp = yt_dlp
+        self._workdir = workdir
+        self._idle: dict[str, list] = {}
+        self._stack = ExitStack()
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self, opts: dict) -> tuple[str, object, Path]:
+        key = video_record.dumps(dict(sorted(opts.items())))
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return (key, *idle.pop())
+            self.created += 1
+        outdir = Path(tempfile.mkdtemp(dir=self._workdir))
+        opts = dict(opts, outtmpl=str(outdir / "%(id)s.%(ext)s"))
+        if opts.get("cookiesfrombrowser"):
+            opts["cookiesfrombrowser"] = tuple(opts["cookiesfrombrowser"])
+        ydl = self._yt_dlp.YoutubeDL(opts)
+        with self._lock:
+            self._stack.enter_context(ydl)
+        return key, ydl, outdir
+
+    def release(self, key: str, ydl, outdir: Path) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append((ydl, outdir))
+
+    def close(self) -> None:
+        self._stack.close()
+
+
+class _Daemon:
+    """Request handling state: sessions, the rate limiter, the 429 cooldown and counters."""
+
+    def __init__(self, yt_dlp, workdir: Path, limiter: RateLimiter, cooldown: float):
+        self.sessions = _Sessions(yt_dlp, workdir)
+        self.limiter = limiter
+        self.cooldown = cooldown
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stats = {"requests": 0, "pages": 0, "errors": 0, "rate_limited": 0, "waited_seconds": 0.0}
+
+    def count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def throttle(self) -> None:
+        """Wait for the rate limiter, or fail fast while a 429 cooldown lasts."""
+        remaining = self._cooldown_until - time.monotonic()
+        if remaining > 0:
+            self.count("rate_limited")
+            raise DaemonError(
+                f"HTTP Error 429: fetch daemon cooling down after a rate limit ({remaining:.0f}s left)"
+            )
+        self.count("waited_seconds", self.limiter.acquire())
+
+    def failed(self, error: Exception) -> str:
+        """Record a failed request, starting the cooldown on a rate limit. Returns the message."""
+        self.count("errors")
+        if "429" in str(error) and not isinstance(error, DaemonError):
+            with self._lock:
+                self._cooldown_until = time.monotonic() + self.cooldown
+                self.stats["rate_limited"] += 1
+            print(f"Rate limited by YouTube; cooling down for {self.cooldown:g}s.", file=sys.stderr)
+        return str(error)
+
+    def status(self) -> dict:
+        with self._lock:
+            return dict(
+                self.stats,
+                uptime_seconds=round(time.time() - self.started),
+                sessions=self.sessions.created,
+                cooldown_seconds=max(0, round(self._cooldown_until - time.monotonic())),
+            )
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        request = _receive(self.rfile)
+        if request is None:
+            return
+        daemon: _Daemon = self.server.state
+        op = request.get("op")
+        if op == "status":
+            _send(self.wfile, daemon.status())
+        elif op == "stop":
+            _send(self.wfile, {"stopping": True})
+            threading.Thread(target=self.server.shutdown).start()
+        elif op == "extract_info":
+            self._extract_info(daemon, request)
+        else:
+            _send(self.wfile, {"error": f"unknown op {op!r}"})
+
+    def _extract_info(self, daemon: _Daemon, request: dict) -> None:
+        key, ydl, outdir = daemon.sessions.acquire(request.get("opts") or {})
+        try:
+            daemon.count("requests")
+            try:
+                daemon.throttle()
+                for leftover in outdir.iterdir():
+                    leftover.unlink()
+                info = ydl.extract_info(
+                    request["url"], download=request.get("download", True),
+                    process=request.get("process", True),
+                )
+                entries = info.pop("entries", None) if info else None
+                info = ydl.sanitize_info(info) if info else info
+            except Exception as e:
+                _send(self.wfile, {"error": daemon.failed(e)})
+                return
+            files = {}
+            for path in outdir.iterdir():
+                files[path.name] = path.read_text(encoding="utf-8", errors="replace")
+                path.unlink()
+            _send(self.wfile, {"info": info, "files": files, "entries": entries is not None})
+            if entries is not None:
+                self._stream_entries(daemon, ydl, entries)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            daemon.sessions.release(key, ydl, outdir)
+
+    def _stream_entries(self, daemon: _Daemon, ydl, entries) -> None:
+        """Send listing entries a chunk at a time, fetching the next only when asked."""
+        entries = iter(entries)
+        first = True
+        while True:
+            try:
+                if not first:
+                    daemon.throttle()
+                    daemon.count("pages")
+                first = False
+                chunk = [
+                    ydl.sanitize_info(entry) if entry is not None else None
+                    for entry in _take(entries, _ENTRY_CHUNK)
+                ]
+            except Exception as e:
+                _send(self.wfile, {"error": daemon.failed(e)})
+                return
+            more = len(chunk) == _ENTRY_CHUNK
+            _send(self.wfile, {"entries": chunk, "more": more})
+            if not more:
+                return
+            # The client closes the connection instead once it has enough
+            reply = _receive(self.rfile)
+            if reply is None or reply.get("op") != "next":
+                return
+
+
+def _take(iterator: Iterator, count: int) -> list:
+    chunk = []
+    for item in iterator:
+        chunk.append(item)
+        if len(chunk) == count:
+            break
+    return chunk
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _request(address: str | tuple[str, int], message: dict) -> dict:
+    sock = _connect(address, _CONNECT_TIMEOUT)
+    rfile, wfile = sock.makefile("rb"), sock.makefile("wb")
+    try:
+        _send(wfile, message)
+        return _receive(rfile) or {}
+    finally:
+        _close(sock, rfile, wfile)
+
+
+def _print_status(status: dict) -> None:
+    print(f"Uptime:          {status['uptime_seconds']}s", file=sys.stderr)
+    print(f"Requests:        {status['requests']} ({status['pages']} listing pages)", file=sys.stderr)
+    print(f"Errors:          {status['errors']} ({status['rate_limited']} rate limited)", file=sys.stderr)
+    print(f"Rate-limit wait: {status['waited_seconds']:.1f}s total", file=sys.stderr)
+    print(f"Sessions:        {status['sessions']}", file=sys.stderr)
+    if status["cooldown_seconds"]:
+        print(f"Cooling down:    {status['cooldown_seconds']}s left", file=sys.stderr)
+
+
+def _serve(address: str | tuple[str, int], args) -> None:
+    if isinstance(address, str) and address == default_socket():
+        try:
+            _make_private_dir(Path(address).parent)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    if isinstance(address, str) and os.path.exists(address):
+        try:
+            _connect(address, _CONNECT_TIMEOUT).close()
+        except PermissionError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except OSError:
+            os.unlink(address)  # Left behind by a daemon that did not shut down cleanly
+        else:
+            print(f"Error: A daemon is already running on {address}.", file=sys.stderr)
+            sys.exit(1)
+
+    yt_dlp = import_yt_dlp()
+    workdir = Path(tempfile.mkdtemp(prefix="ytdl-daemon-"))
+    daemon = _Daemon(yt_dlp, workdir, RateLimiter(args.rate, args.burst), args.cooldown)
+    if isinstance(address, str):
+        old_umask = os.umask(0o077)  # Only this user may connect
+        try:
+            server = _UnixServer(address, _Handler)
+        finally:
+            os.umask(old_umask)
+    else:
+        server = _TCPServer(address, _Handler)
+    server.state = daemon
+    where = address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+    print(
+        f"Serving yt-dlp on {where} ({args.rate:g} requests/min, bursts of {args.burst}).",
+        file=sys.stderr,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.sessions.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)
+    _print_status(daemon.status())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a warm, rate-limited yt-dlp daemon for list_channel.py and fetch_youtube.py.",
+    )
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Unix socket to listen on (default: YTDL_DAEMON, or ytdl-daemon.sock in "
+        "$XDG_RUNTIME_DIR or in a private ytdl-daemon-<uid> directory in the temp directory).",
+    )
+    where.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Listen on this localhost TCP port instead (e.g. on Windows). Clients need "
+        "YTDL_DAEMON=127.0.0.1:PORT.",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        metavar="PER_MINUTE",
+        help=f"Requests per minute across all clients (default: {DEFAULT_RATE:g}).",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=DEFAULT_BURST,
+        help=f"Requests allowed back to back before --rate applies (default: {DEFAULT_BURST}).",
+    )
+    parser.add_argument(
+        "--cooldown",
+        type=float,
+        default=DEFAULT_COOLDOWN,
+        metavar="SECONDS",
+        help="After YouTube answers HTTP 429, fail every request for this long "
+        f"(default: {DEFAULT_COOLDOWN:g}).",
+    )
+    parser.add_argument("--status", action="store_true", help="Print a running daemon's counters.")
+    parser.add_argument("--stop", action="store_true", help="Stop a running daemon.")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be positive.")
+    if args.burst < 1:
+        parser.error("--burst must be at least 1.")
+
+    if args.port is not None:
+        address = ("127.0.0.1", args.port)
+    elif args.socket:
+        address = args.socket
+    else:
+        address = default_address()
+        if address is None:
+            parser.error(
+                "No default socket (YTDL_DAEMON is off or Unix sockets are unavailable); "
+                "pass --socket or --port."
+            )
+    if isinstance(address, str) and not hasattr(socket, "AF_UNIX"):
+        parser.error("Unix sockets are not available on this platform; use --port.")
+
+    if args.status or args.stop:
+        try:
+            reply = _request(address, {"op": "status" if args.status else "stop"})
+        except OSError:
+            print(f"Error: No daemon is running on {address}.", file=sys.stderr)
+            sys.exit(1)
+        if args.status:
+            _print_status(reply)
+        else:
+            print("Daemon stopping.", file=sys.stderr)
+        return
+
+    _serve(address, args)
+
+
+if __name__ == "__main__":
+    main()
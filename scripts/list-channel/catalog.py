@@ -0,0 +1,120 @@
+"""
+Local SQLite catalog of channel listings for list_channel.py --catalog.
+
+A channel is listed from YouTube once, unfiltered, and its flat entries (id,
+title, duration, upload date, channel name) are stored with their listing
+position. Later runs with different --after/--before/--min-duration/-n values
+are answered with an indexed query instead of a new listing. Listings are
+only refreshed on request (--refresh).
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    channel_url TEXT PRIMARY KEY,
+    refreshed TEXT NOT NULL,
+    video_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS videos (
+    channel_url TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    upload_date TEXT NOT NULL,
+    channel TEXT,
+    PRIMARY KEY (channel_url, id)
+);
+CREATE INDEX IF NOT EXISTS videos_by_position ON videos (channel_url, position);
+CREATE INDEX IF NOT EXISTS videos_by_date ON videos (channel_url, upload_date);
+"""
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) a catalog database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Concurrent --channels-file workers each open their own connection
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def refreshed_at(conn: sqlite3.Connection, channel_url: str) -> str | None:
+    """Return when a channel was last listed into the catalog, or None if never."""
+    row = conn.execute(
+        "SELECT refreshed FROM channels WHERE channel_url = ?", (channel_url,)
+    ).fetchone()
+    return row["refreshed"] if row else None
+
+
+def replace_channel(conn: sqlite3.Connection, channel_url: str, videos: list[dict]) -> None:
+    """Replace a channel's cataloged videos with a fresh, unfiltered listing.
+
+    Args:
+        conn: Catalog connection.
+        channel_url: Normalized channel URL.
+        videos: Video dicts from list_channel.iter_channel_videos, newest first.
+    """
+    with conn:
+        conn.execute("DELETE FROM videos WHERE channel_url = ?", (channel_url,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO videos "
+            "(channel_url, id, position, url, title, duration, upload_date, channel) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    channel_url,
+                    video["id"],
+                    position,
+                    video["url"],
+                    video.get("title") or "",
+                    video.get("duration") or 0,
+                    video.get("upload_date") or "",
+                    video.get("channel"),
+                )
+                for position, video in enumerate(videos)
+            ),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO channels (channel_url, refreshed, video_count) VALUES (?, ?, ?)",
+            (channel_url, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), len(videos)),
+        )
+
+
+def query(
+    conn: sqlite3.Connection,
+    channel_url: str,
+    max_results: int | None = None,
+    after_date: str | None = None,
+    before_date: str | None = None,
+    min_duration: int = 61,
+) -> list[dict]:
+    """Return a channel's cataloged videos matching the filters, newest first.
+
+    Filters match list_channel._parse_entry: videos without an upload date are
+    never excluded by the date range.
+
+    Returns:
+        List of dicts with keys: id, url, title, duration, upload_date, channel.
+    """
+    sql = [
+        "SELECT id, url, title, duration, upload_date, channel FROM videos",
+        "WHERE channel_url = ? AND duration >= ?",
+    ]
+    params: list = [channel_url, min_duration]
+    if after_date:
+        sql.append("AND (upload_date = '' OR upload_date >= ?)")
+        params.append(after_date)
+    if before_date:
+        sql.append("AND (upload_date = '' OR upload_date <= ?)")
+        params.append(before_date)
+    sql.append("ORDER BY position")
+    if max_results is not None:
+        sql.append("LIMIT ?")
+        params.append(max_results)
+    return [dict(row) for row in conn.execute(" ".join(sql), params)]
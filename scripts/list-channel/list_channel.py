@@ -10,26 +10,36 @@ Usage:
     python list_channel.py "@ChannelName" -n 10
     python list_channel.py "@ChannelName" --after 2024-01-01 --before 2025-01-01
     python list_channel.py "https://www.youtube.com/@ChannelName" -o urls.txt
+    python list_channel.py "@ChannelName" --sync channel-state.json -o new-urls.txt
+    python list_channel.py --channels-file channels.txt --workers 8 -o urls.txt
+    python list_channel.py "@ChannelName" --catalog channels.db --after 2024-06-01
 """
 
 import argparse
+import importlib
+import itertools
+import json
+import os
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
+from pathlib import Path
 
-try:
-    import yt_dlp
-except ImportError:
-    print(
-        "Error: 'yt-dlp' package is not installed. "
-        "Run: pip install -r requirements.txt",
-        file=sys.stderr,
-    )
-    sys.exit(1)
-
+import catalog
 
 _CHANNEL_PATH_SUFFIXES = ("/videos", "/shorts", "/streams", "/playlists", "/community")
 
 
+def _shared(module: str):
+    """Import a module shared with the extract-metadata scripts (priority.py, ytdl_daemon.py)."""
+    shared_dir = str(Path(__file__).resolve().parent.parent / "extract-metadata")
+    if shared_dir not in sys.path:
+        sys.path.insert(0, shared_dir)
+    return importlib.import_module(module)
+
+
 def _strip_channel_path_suffix(url: str) -> str:
     """Strip known YouTube channel path suffixes from a URL."""
     url = url.rstrip("/")
@@ -68,9 +78,9 @@ def normalize_channel_url(channel: str) -> str:
     return f"https://www.youtube.com/@{channel}/videos"
 
 
-def _build_ydl_opts(max_results: int | None) -> dict:
+def _build_ydl_opts() -> dict:
     """Build yt-dlp options for channel video extraction."""
-    opts: dict = {
+    return {
         "quiet": True,
         "no_warnings": True,
         "skip_download": True,
@@ -78,12 +88,6 @@ def _build_ydl_opts(max_results: int | None) -> dict:
         "ignoreerrors": True,
     }
 
-    # Over-fetch to account for Shorts/date filtering that will remove entries
-    if max_results is not None:
-        opts["playlistend"] = max_results * 3
-
-    return opts
-
 
 def _is_outside_date_range(
     upload_date: str, after_date: str | None, before_date: str | None
@@ -126,52 +130,176 @@ def _parse_entry(
         video_url = f"https://www.youtube.com/watch?v={video_id}"
 
     return {
+        "id": video_id or video_url,
         "url": video_url,
         "title": entry.get("title", ""),
         "duration": duration,
         "upload_date": upload_date,
+        "channel": entry.get("channel") or entry.get("uploader"),
     }
 
 
+def _is_previously_synced(entry: dict, last_sync: dict) -> bool:
+    """Check if an entry is at or past the newest video recorded by the previous sync."""
+    if entry.get("id") and entry.get("id") == last_sync.get("newest_id"):
+        return True
+    # Fallback for when the recorded video has since been deleted or made private
+    upload_date = entry.get("upload_date")
+    newest_date = last_sync.get("newest_upload_date")
+    return bool(upload_date and newest_date and upload_date < newest_date)
+
+
+def iter_channel_videos(
+    channel_url: str,
+    after_date: str | None = None,
+    before_date: str | None = None,
+    min_duration: int = 61,
+    sync_state: dict | None = None,
+) -> Iterator[dict]:
+    """Yield filtered video metadata from a YouTube channel, newest first.
+
+    Entries are pulled from yt-dlp lazily (``process=False`` leaves the
+    channel's entries as a paged generator), so pages are only requested as
+    the caller consumes videos. Since the /videos tab lists newest first,
+    paging stops at the first entry older than `after_date`.
+
+    Args:
+        channel_url: Normalized YouTube channel URL (ending in /videos).
+        after_date: Only include videos published on/after this date (YYYYMMDD).
+        before_date: Only include videos published on/before this date (YYYYMMDD).
+        min_duration: Minimum duration in seconds (default 61, filters Shorts).
+        sync_state: This channel's entry in a sync state file, or None. If it
+            records a previous sync, paging stops at the newest video seen
+            then. It is updated in place with the newest video listed now.
+
+    Yields:
+        Dicts with keys: id, url, title, duration, upload_date, channel.
+    """
+    print(f"Fetching videos from: {channel_url}", file=sys.stderr)
+    last_sync = dict(sync_state) if sync_state else None
+
+    # Runs in the yt-dlp daemon (see extract-metadata/ytdl_daemon.py) when one is running
+    with _shared("ytdl_daemon").youtube_dl(_build_ydl_opts()) as ydl:
+        info = ydl.extract_info(channel_url, download=False, process=False)
+        if not info:
+            print("Error: Could not extract channel information.", file=sys.stderr)
+            return
+
+        first = True
+        for entry in info.get("entries") or []:
+            if entry is None:
+                continue
+            if first and sync_state is not None:
+                # The channel's newest video, whether or not it passes the filters
+                sync_state.update(
+                    newest_id=entry.get("id"),
+                    newest_upload_date=entry.get("upload_date"),
+                    synced=datetime.now().strftime("%Y-%m-%d"),
+                )
+            first = False
+            if last_sync and _is_previously_synced(entry, last_sync):
+                return
+            upload_date = entry.get("upload_date")
+            if after_date and upload_date and upload_date < after_date:
+                return
+            video = _parse_entry(entry, min_duration, after_date, before_date)
+            if video is not None:
+                yield video
+
+
 def fetch_channel_videos(
     channel_url: str,
     max_results: int | None = None,
     after_date: str | None = None,
     before_date: str | None = None,
     min_duration: int = 61,
+    sync_state: dict | None = None,
 ) -> list[dict]:
     """Fetch video metadata from a YouTube channel using yt-dlp.
 
+    Paging stops as soon as `max_results` videos pass the filters, or once
+    the listing passes `after_date` or the previous sync; see iter_channel_videos.
+
     Args:
         channel_url: Normalized YouTube channel URL (ending in /videos).
         max_results: Maximum number of videos to return after filtering.
         after_date: Only include videos published on/after this date (YYYYMMDD).
         before_date: Only include videos published on/before this date (YYYYMMDD).
         min_duration: Minimum duration in seconds (default 61, filters Shorts).
+        sync_state: This channel's sync state entry, updated in place; see iter_channel_videos.
 
     Returns:
-        List of dicts with keys: url, title, duration, upload_date.
+        List of dicts with keys: id, url, title, duration, upload_date, channel.
     """
-    ydl_opts = _build_ydl_opts(max_results)
+    videos = iter_channel_videos(channel_url, after_date, before_date, min_duration, sync_state)
+    return list(itertools.islice(videos, max_results))
 
-    print(f"Fetching videos from: {channel_url}", file=sys.stderr)
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(channel_url, download=False)
+def fetch_from_catalog(
+    catalog_path: Path,
+    channel_url: str,
+    refresh: bool = False,
+    max_results: int | None = None,
+    after_date: str | None = None,
+    before_date: str | None = None,
+    min_duration: int = 61,
+) -> list[dict]:
+    """Answer a listing query from the local catalog, listing the channel first if needed.
 
-    if not info:
-        print("Error: Could not extract channel information.", file=sys.stderr)
-        return []
+    The channel is listed from YouTube (unfiltered, so any later filters can be
+    answered) only if it is not cataloged yet or `refresh` is set.
 
-    videos = []
-    for entry in info.get("entries") or []:
-        video = _parse_entry(entry, min_duration, after_date, before_date)
-        if video is not None:
-            videos.append(video)
-            if max_results is not None and len(videos) >= max_results:
-                break
+    Args:
+        catalog_path: SQLite catalog file.
+        channel_url: Normalized YouTube channel URL (ending in /videos).
+        refresh: Re-list the channel even if it is already cataloged.
+        max_results: Maximum number of videos to return after filtering.
+        after_date: Only include videos published on/after this date (YYYYMMDD).
+        before_date: Only include videos published on/before this date (YYYYMMDD).
+        min_duration: Minimum duration in seconds (default 61, filters Shorts).
 
-    return videos
+    Returns:
+        List of dicts with keys: id, url, title, duration, upload_date, channel.
+    """
+    with closing(catalog.connect(catalog_path)) as conn:
+        refreshed = catalog.refreshed_at(conn, channel_url)
+        if refresh or refreshed is None:
+            videos = list(iter_channel_videos(channel_url, min_duration=0))
+            # An empty listing is more likely a failed fetch than an empty channel
+            if videos:
+                catalog.replace_channel(conn, channel_url, videos)
+            print(f"Cataloged {len(videos)} videos from {channel_url}.", file=sys.stderr)
+        else:
+            print(
+                f"Using catalog listing of {channel_url} from {refreshed} (--refresh to update).",
+                file=sys.stderr,
+            )
+        return catalog.query(conn, channel_url, max_results, after_date, before_date, min_duration)
+
+
+def load_sync_state(path: Path) -> dict:
+    """Load the sync state file (normalized channel URL -> newest seen video)."""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"Error: Failed to parse sync state {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not isinstance(state, dict):
+        print(f"Error: Sync state {path} does not contain a JSON object.", file=sys.stderr)
+        sys.exit(1)
+    return state
+
+
+def save_sync_state(path: Path, state: dict) -> None:
+    """Write the sync state file atomically, so an interrupted run never corrupts it."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
 
 
 def format_output(videos: list[dict], channel_name: str) -> str:
@@ -196,6 +324,181 @@ def format_output(videos: list[dict], channel_name: str) -> str:
     return "\n".join(lines) + "\n"
 
 
+def read_channels_file(path: Path) -> list[str]:
+    """Read channel identifiers, one per line; blank lines and # comments are ignored.
+
+    Channels that normalize to the same URL are only returned once.
+    """
+    channels = []
+    seen_urls = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            channel_url = normalize_channel_url(line)
+            if channel_url not in seen_urls:
+                seen_urls.add(channel_url)
+                channels.append(line)
+    return channels
+
+
+def list_channels(
+    channels: list[str],
+    workers: int = 4,
+    max_results: int | None = None,
+    after_date: str | None = None,
+    before_date: str | None = None,
+    min_duration: int = 61,
+    sync: dict | None = None,
+    catalog_path: Path | None = None,
+    refresh: bool = False,
+) -> tuple[list[tuple[str, list[dict]]], list[str]]:
+    """List several channels concurrently and deduplicate videos across them.
+
+    A failed channel is reported in the errors list and does not stop the
+    others. A video that appears on several channels (e.g. a mirror) is kept
+    only under the first channel that lists it, in `channels` order.
+
+    Args:
+        channels: Channel identifiers (URL, @handle or UCxxxx ID).
+        workers: Maximum number of channels listed at once.
+        max_results: Maximum number of videos per channel.
+        after_date: Only include videos published on/after this date (YYYYMMDD).
+        before_date: Only include videos published on/before this date (YYYYMMDD).
+        min_duration: Minimum duration in seconds (default 61, filters Shorts).
+        sync: Whole sync state (normalized channel URL -> entry), or None.
+            Entries of failed channels are left as they were.
+        catalog_path: Answer from this SQLite catalog instead; see fetch_from_catalog.
+        refresh: Re-list every channel into the catalog.
+
+    Returns:
+        Tuple of ((channel, videos) list in input order, errors list).
+    """
+
+    def list_one(channel: str) -> list[dict]:
+        channel_url = normalize_channel_url(channel)
+        if catalog_path is not None:
+            return fetch_from_catalog(
+                catalog_path, channel_url, refresh, max_results, after_date, before_date,
+                min_duration,
+            )
+        if sync is None:
+            return fetch_channel_videos(
+                channel_url, max_results, after_date, before_date, min_duration
+            )
+        previous = dict(sync.get(channel_url, {}))
+        sync_state = sync.setdefault(channel_url, {})
+        try:
+            return fetch_channel_videos(
+                channel_url, max_results, after_date, before_date, min_duration, sync_state
+            )
+        except Exception:
+            # Never advance past videos that were not listed
+            if previous:
+                sync[channel_url] = previous
+            else:
+                sync.pop(channel_url, None)
+            raise
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(channel, pool.submit(list_one, channel)) for channel in channels]
+
+    results = []
+    errors = []
+    seen_ids = set()
+    for channel, future in futures:
+        try:
+            videos = future.result()
+        except Exception as e:
+            error_msg = f"Failed to list {channel}: {e}"
+            print(f"Error: {error_msg}", file=sys.stderr)
+            errors.append(error_msg)
+            continue
+        unique = [video for video in videos if video["id"] not in seen_ids]
+        seen_ids.update(video["id"] for video in unique)
+        if len(unique) < len(videos):
+            print(
+                f"Skipped {len(videos) - len(unique)} video(s) of {channel} already listed "
+                "under another channel.",
+                file=sys.stderr,
+            )
+        results.append((channel, unique))
+    return results, errors
+
+
+def _prioritize(videos: list[dict], scores_path: str | None) -> list[dict]:
+    """Order videos highest priority first (see extract-metadata/priority.py).
+
+    Fetching the output in file order then handles the most valuable videos
+    first, before any rate limit stops the run.
+    """
+    # The scoring is shared with fetch_youtube.py and claude_extract.py
+    priority = _shared("priority")
+    scores = priority.load_scores(Path(scores_path)) if scores_path else None
+    return priority.by_priority(videos, priority.scorer(scores, computed=True))
+
+
+def _write_output(output_arg: str | None, output: str, count: int) -> None:
+    """Write formatted output to a file or stdout."""
+    if output_arg:
+        with open(output_arg, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(
+            f"Wrote {count} URLs to {output_arg}",
+            file=sys.stderr,
+        )
+    else:
+        print(output, end="")
+
+
+def _main_channels_file(args, after_date: str | None, before_date: str | None) -> None:
+    """List every channel in --channels-file into one merged output."""
+    channels = read_channels_file(Path(args.channels_file))
+    if not channels:
+        print(f"Error: No channels found in {args.channels_file}.", file=sys.stderr)
+        sys.exit(1)
+    print(f"Listing {len(channels)} channel(s) with {args.workers} worker(s).", file=sys.stderr)
+
+    sync_path = Path(args.sync) if args.sync else None
+    state = load_sync_state(sync_path) if sync_path else None
+
+    results, errors = list_channels(
+        channels,
+        workers=args.workers,
+        max_results=args.max_results,
+        after_date=after_date,
+        before_date=before_date,
+        min_duration=args.min_duration,
+        sync=state,
+        catalog_path=Path(args.catalog) if args.catalog else None,
+        refresh=args.refresh,
+    )
+
+    if sync_path:
+        save_sync_state(sync_path, {url: entry for url, entry in state.items() if entry})
+
+    total = sum(len(videos) for _, videos in results)
+    if total and args.priority:
+        # One list across channels, so priority is not limited to each channel's section
+        videos = _prioritize([v for _, channel_videos in results for v in channel_videos], args.scores)
+        output = format_output(videos, f"{len(results)} channels, highest priority first")
+        _write_output(args.output, output, total)
+    elif total:
+        output = "\n".join(format_output(videos, channel) for channel, videos in results if videos)
+        _write_output(args.output, output, total)
+
+    print(
+        f"Found {total} videos across {len(results)} of {len(channels)} channel(s).",
+        file=sys.stderr,
+    )
+    if errors:
+        print(f"\n{len(errors)} channel(s) failed:", file=sys.stderr)
+        for err in errors:
+            print(f"  - {err}", file=sys.stderr)
+        sys.exit(1 if not results else 0)
+
+
 def _parse_date_arg(parser, value: str | None, name: str) -> str | None:
     """Validate a YYYY-MM-DD date argument and convert to YYYYMMDD."""
     if value is None:
@@ -214,8 +517,24 @@ def main():
     )
     parser.add_argument(
         "channel",
+        nargs="?",
         help="Channel URL, @handle, or UCxxxx channel ID.",
     )
+    parser.add_argument(
+        "-f",
+        "--channels-file",
+        type=str,
+        default=None,
+        help="File of channels to list, one per line (# comments allowed), instead of a channel "
+        "argument. Output is merged, with a header per channel.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=4,
+        help="Channels listed concurrently with --channels-file (default: 4).",
+    )
     parser.add_argument(
         "-n",
         "--max-results",
@@ -241,6 +560,41 @@ def main():
         default=61,
         help="Minimum video duration in seconds (default: 61, filters Shorts).",
     )
+    parser.add_argument(
+        "--sync",
+        type=str,
+        default=None,
+        metavar="STATE_FILE",
+        help="Only list videos newer than the previous sync recorded in this JSON state file, "
+        "then record the channel's newest video in it.",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default=None,
+        metavar="DB",
+        help="Answer from this local SQLite catalog of channel listings; a channel is listed "
+        "from YouTube only the first time it is queried (or with --refresh).",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-list the channel(s) from YouTube into --catalog before answering.",
+    )
+    parser.add_argument(
+        "--priority",
+        action="store_true",
+        help="Order the output highest priority first (title keywords, recency, duration) "
+        "instead of newest first; with --channels-file, across all channels.",
+    )
+    parser.add_argument(
+        "--scores",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="User scores (URL or video ID and a score per line) that override the computed "
+        "priority. Implies --priority.",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -250,38 +604,72 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.scores:
+        args.priority = True
+
+    if bool(args.channel) == bool(args.channels_file):
+        parser.error("Provide either a channel argument or --channels-file, not both.")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+    if args.refresh and not args.catalog:
+        parser.error("--refresh requires --catalog.")
+    if args.sync and args.catalog:
+        parser.error("--sync cannot be combined with --catalog.")
+    # A partial listing would advance the sync state past videos never emitted
+    if args.sync and (args.max_results is not None or args.before):
+        parser.error("--sync cannot be combined with -n/--max-results or --before.")
 
     # Validate date formats and convert to YYYYMMDD for yt-dlp comparison
     after_yyyymmdd = _parse_date_arg(parser, args.after, "--after")
     before_yyyymmdd = _parse_date_arg(parser, args.before, "--before")
 
+    if args.channels_file:
+        _main_channels_file(args, after_yyyymmdd, before_yyyymmdd)
+        return
+
     channel_url = normalize_channel_url(args.channel)
 
-    videos = fetch_channel_videos(
-        channel_url=channel_url,
-        max_results=args.max_results,
-        after_date=after_yyyymmdd,
-        before_date=before_yyyymmdd,
-        min_duration=args.min_duration,
-    )
+    sync_path = Path(args.sync) if args.sync else None
+    state = load_sync_state(sync_path) if sync_path else {}
+    sync_state = state.setdefault(channel_url, {}) if sync_path else None
+
+    if args.catalog:
+        videos = fetch_from_catalog(
+            Path(args.catalog),
+            channel_url,
+            refresh=args.refresh,
+            max_results=args.max_results,
+            after_date=after_yyyymmdd,
+            before_date=before_yyyymmdd,
+            min_duration=args.min_duration,
+        )
+    else:
+        videos = fetch_channel_videos(
+            channel_url=channel_url,
+            max_results=args.max_results,
+            after_date=after_yyyymmdd,
+            before_date=before_yyyymmdd,
+            min_duration=args.min_duration,
+            sync_state=sync_state,
+        )
+
+    if sync_path and sync_state:
+        save_sync_state(sync_path, state)
 
     if not videos:
-        print("No videos found matching the criteria.", file=sys.stderr)
+        if sync_path:
+            print("No new videos since the last sync.", file=sys.stderr)
+        else:
+            print("No videos found matching the criteria.", file=sys.stderr)
         sys.exit(0)
 
+    if args.priority:
+        videos = _prioritize(videos, args.scores)
+
     # Try to extract channel name from the first video or use the input
     channel_name = args.channel
     output = format_output(videos, channel_name)
-
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output)
-        print(
-            f"Wrote {len(videos)} URLs to {args.output}",
-            file=sys.stderr,
-        )
-    else:
-        print(output, end="")
+    _write_output(args.output, output, len(videos))
 
     print(f"Found {len(videos)} videos.", file=sys.stderr)
 
@@ -3,6 +3,11 @@
 Gathers commit counts, lines added/removed, Claude co-authorship stats,
 merged PR counts, and issue counts for each repository.
 
+Repos are collected concurrently: git commands (local disk and CPU) and gh
+calls (network) run in separate bounded thread pools, so a slow repo or API
+call no longer holds up the others. Results are written in REPOS order with
+per-repo timings.
+
 Usage:
     python scripts/metrics/collect_metrics.py
 
@@ -14,6 +19,8 @@ import subprocess
 import json
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 sys.stdout.reconfigure(encoding="utf-8")
@@ -35,6 +42,10 @@ REPOS = [
 
 OUTPUT_FILE = os.path.join(BASE, "scripts", "metrics", "git_metrics.json")
 
+# Concurrent repos per pool: git work is bound by local disk/CPU, gh work by the network
+GIT_WORKERS = 4
+GITHUB_WORKERS = 4
+
 
 def run(cmd, shell=True):
     try:
@@ -125,29 +136,45 @@ def collect_github_metrics(gh_repo):
     return metrics
 
 
+def timed(collect, arg):
+    """Run a collector and return (metrics, elapsed seconds)."""
+    start = time.perf_counter()
+    metrics = collect(arg)
+    elapsed = round(time.perf_counter() - start, 2)
+    print(f"  done {arg} ({collect.__name__.removeprefix('collect_')}) in {elapsed}s")
+    return metrics, elapsed
+
+
 def main():
+    started = time.perf_counter()
     all_metrics = {
         "collected_at": datetime.now(timezone.utc).isoformat(),
+        "elapsed_seconds": None,
         "repos": {},
         "totals": {},
     }
 
-    for repo_path, gh_repo in REPOS:
-        repo_name = os.path.basename(repo_path)
-        sep = "=" * 60
-        print(f"\n{sep}")
-        print(f"Processing: {repo_name}")
-        print(sep)
-
-        git_data = collect_git_metrics(repo_path)
-        gh_data = collect_github_metrics(gh_repo)
-
-        all_metrics["repos"][repo_name] = {
-            "path": repo_path,
-            "github_repo": gh_repo,
-            "git": git_data,
-            "github": gh_data,
-        }
+    with ThreadPoolExecutor(GIT_WORKERS) as git_pool, ThreadPoolExecutor(GITHUB_WORKERS) as gh_pool:
+        futures = [
+            (
+                repo_path,
+                gh_repo,
+                git_pool.submit(timed, collect_git_metrics, repo_path),
+                gh_pool.submit(timed, collect_github_metrics, gh_repo),
+            )
+            for repo_path, gh_repo in REPOS
+        ]
+        # Gather in REPOS order so the output does not depend on completion order
+        for repo_path, gh_repo, git_future, gh_future in futures:
+            git_data, git_seconds = git_future.result()
+            gh_data, gh_seconds = gh_future.result()
+            all_metrics["repos"][os.path.basename(repo_path)] = {
+                "path": repo_path,
+                "github_repo": gh_repo,
+                "git": git_data,
+                "github": gh_data,
+                "timing": {"git_seconds": git_seconds, "github_seconds": gh_seconds},
+            }
 
     totals = {
         "total_commits": 0,
@@ -187,6 +214,7 @@ def main():
 
     totals["total_net_lines"] = totals["total_lines_added"] - totals["total_lines_removed"]
     all_metrics["totals"] = totals
+    all_metrics["elapsed_seconds"] = round(time.perf_counter() - started, 2)
 
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(all_metrics, f, indent=2, ensure_ascii=False)
@@ -207,6 +235,7 @@ def main():
     print(f"  Total issues:       {t['total_issues']} (open: {t['total_open_issues']}, closed: {t['total_closed_issues']})")
     print(f"  Earliest commit:    {t['earliest_commit_date']}")
     print(f"  Latest commit:      {t['latest_commit_date']}")
+    print(f"  Collection time:    {all_metrics['elapsed_seconds']}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Seed-data pipeline orchestrator for AccountabilityAtlas: list → fetch → extract → seed.
+
+Runs list_channel.py, fetch_youtube.py, claude_extract.py and the seeding
+flow of seed_videos.py as one command. Every video's progress is tracked in
+a local SQLite stage store (see stage_store.py) instead of whole JSON files
+passed between scripts, so:
+
+- the fetch, extract and seed stages run at the same time, each with its own
+  worker limit: a video is extracted as soon as it is fetched, and seeded as
+  soon as it is extracted;
+- a failed stage is recorded against its video without stopping the others;
+- an interrupted run resumes exactly where it stopped (rerun with no channels);
+- per-stage throughput is reported at the end of each run, and with --status.
+
+Usage:
+    python pipeline.py "@ChannelName" --after 2024-01-01
+    python pipeline.py --channels-file channels.txt --fetch-workers 2 --extract-workers 8
+    python pipeline.py --urls-file urls.txt --until extract --export videos.json
+    python pipeline.py                     # resume the stored pipeline
+    python pipeline.py --retry-failed
+    python pipeline.py --status
+
+Environment variables:
+    ANTHROPIC_API_KEY              - Required for the extract stage
+    ADMIN_EMAIL, ADMIN_PASSWORD    - Required for the seed stage
+    API_URL                        - API base URL (default: http://localhost:8080/api/v1)
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+_SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+for _tool in ("list-channel", "extract-metadata", "seed-videos"):
+    sys.path.insert(0, str(_SCRIPTS_DIR / _tool))
+
+import claude_extract  # noqa: E402
+import fetch_youtube  # noqa: E402
+import list_channel  # noqa: E402
+import seed_videos  # noqa: E402
+import shards  # noqa: E402
+import video_record  # noqa: E402
+from executor import RequestExecutor, import_anthropic  # noqa: E402
+from geocode_cache import GeocodeCache  # noqa: E402
+from seed_ledger import SeedLedger, input_hash  # noqa: E402
+from stage_store import DONE, STAGES, StageStore  # noqa: E402
+from telemetry import ExtractionTelemetry  # noqa: E402
+
+DEFAULT_STORE = _SCRIPTS_DIR.parent / "seed-data" / "pipeline.db"
+DEFAULT_WORKERS = {"fetch": 2, "extract": 4, "seed": 4}
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class _RateLimited(Exception):
+    """YouTube answered HTTP 429; fetching pauses for the rest of the run."""
+
+
+# --- Stage runners (called in worker threads; they never touch the store) ---
+
+
+def _fetch(row, include_transcript: bool, cookies_from_browser: str | None) -> dict:
+    try:
+        return fetch_youtube.fetch_youtube_metadata(
+            row["url"],
+            include_transcript=include_transcript,
+            cookies_from_browser=cookies_from_browser,
+        ).to_dict()
+    except Exception as e:
+        if fetch_youtube.is_rate_limited(e):
+            raise _RateLimited(str(e)) from e
+        raise
+
+
+def _extract(row, client, model: str, executor, telemetry, local_mode: str) -> dict:
+    record = json.loads(row["record"])
+    return claude_extract.process_single(
+        record, client, model, telemetry, local_mode, executor
+    ).to_dict()
+
+
+def _seed(
+    row,
+    api,
+    cache: GeocodeCache,
+    ledger: SeedLedger,
+    seeded: dict,
+    existing: seed_videos.ExistingVideos,
+) -> str:
+    """Seed one extracted entry the way seed_videos.py does, minus location clustering.
+
+    Returns:
+        The outcome: "created", "updated", "skipped" or "filtered".
+
+    Raises:
+        RuntimeError: If the video could not be seeded.
+    """
+    entry = json.loads(row["entry"])
+    if seed_videos.filter_reason(entry):
+        return "filtered"
+    url = entry.get("youtubeUrl")
+    entry_hash = input_hash(entry)
+    ledger_row = seeded.get(url)
+    if ledger_row is not None and ledger_row["input_hash"] == entry_hash:
+        return "skipped"
+
+    location_id = None
+    location = entry.get("location")
+    if location is not None:
+        pin = seed_videos.resolve_pin(api, location, cache)
+        if pin is not None:
+            location_id, _ = seed_videos.create_location(api, location, pin)
+    outcome, status, lines, video_id = seed_videos.create_video(
+        api, entry, location_id, ledger_row["video_id"] if ledger_row is not None else None
+    )
+    if outcome == "failed":
+        detail = " ".join(line.strip() for line in lines) or status
+        raise RuntimeError(_ANSI.sub("", detail))
+    if video_id is None and outcome == "skipped":
+        video_id = existing.get(url)
+    # Without a video ID a later edit could not be sent as an update
+    if video_id:
+        ledger.record(url, video_id, location_id, entry_hash)
+    return outcome
+
+
+def _describe(stage: str, output) -> str:
+    if stage == "seed":
+        return output
+    return output.get("title") or output.get("url") or ""
+
+
+# --- Scheduling ---
+
+
+def run_stages(store: StageStore, runners: dict, limits: dict[str, int]) -> list[str]:
+    """Run the given stages concurrently until no stage has pending videos.
+
+    The store is only used from this (the calling) thread. Each stage keeps up
+    to its limit of videos in flight; finished stages are committed to the
+    store one by one, which makes their videos eligible for the next stage.
+
+    Args:
+        store: The stage store.
+        runners: Stage -> function taking a store row and returning the stage output.
+        limits: Stage -> maximum videos in flight.
+
+    Returns:
+        Errors list.
+    """
+    errors: list[str] = []
+    pools = {stage: ThreadPoolExecutor(max_workers=limits[stage]) for stage in runners}
+    inflight: dict[Future, tuple[str, str, float]] = {}
+    paused: set[str] = set()
+    try:
+        while True:
+            # Downstream stages first, so finished work leaves the pipeline early
+            for stage in reversed(STAGES):
+                if stage not in runners or stage in paused:
+                    continue
+                busy = sum(1 for s, _, _ in inflight.values() if s == stage)
+                for row in store.claim(stage, limits[stage] - busy):
+                    future = pools[stage].submit(runners[stage], row)
+                    inflight[future] = (stage, row["video_id"], time.time())
+            if not inflight:
+                break
+
+            finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, video_id, started = inflight.pop(future)
+                try:
+                    output = future.result()
+                except _RateLimited:
+                    store.release(video_id)
+                    if stage not in paused:
+                        paused.add(stage)
+                        message = "Rate limited by YouTube (HTTP 429). Fetching paused for this run."
+                        print(f"  {message}", file=sys.stderr)
+                        errors.append(message)
+                except Exception as e:
+                    store.fail(video_id, stage, str(e), started)
+                    error_msg = f"{stage} failed for {video_id}: {e}"
+                    print(f"  Error: {error_msg}", file=sys.stderr)
+                    errors.append(error_msg)
+                else:
+                    store.complete(video_id, stage, output, started)
+                    print(f"  {stage:<7} {video_id}  {_describe(stage, output)}", file=sys.stderr)
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+    return errors
+
+
+# --- Reporting ---
+
+
+def print_throughput(store: StageStore, since: float = 0.0, title: str = "Stage throughput") -> None:
+    """Print per-stage completions, failures and rates."""
+    stats = store.throughput(since)
+    print(f"\n{title}:", file=sys.stderr)
+    print(
+        f"  {'Stage':<8} {'Done':>6} {'Failed':>7} {'Wall (s)':>9} {'Videos/min':>11} {'Avg (s)':>8}",
+        file=sys.stderr,
+    )
+    for stage in STAGES:
+        s = stats.get(stage)
+        if not s:
+            continue
+        runs = s["ok"] + s["failed"]
+        rate = s["ok"] / s["wall_seconds"] * 60 if s["wall_seconds"] > 0 else 0.0
+        print(
+            f"  {stage:<8} {s['ok']:>6} {s['failed']:>7} {s['wall_seconds']:>9.1f} "
+            f"{rate:>11.1f} {s['busy_seconds'] / runs:>8.2f}",
+            file=sys.stderr,
+        )
+
+
+def print_status(store: StageStore) -> None:
+    """Print where every video is in the pipeline."""
+    counts = store.counts()
+    print("Videos by stage:", file=sys.stderr)
+    print(f"  {'Stage':<8} {'Pending':>8} {'Running':>8} {'Failed':>7}", file=sys.stderr)
+    for stage in STAGES:
+        print(
+            f"  {stage:<8} {counts.get((stage, 'pending'), 0):>8} "
+            f"{counts.get((stage, 'running'), 0):>8} {counts.get((stage, 'failed'), 0):>7}",
+            file=sys.stderr,
+        )
+    print(f"  {DONE:<8} {counts.get((DONE, 'pending'), 0):>8}", file=sys.stderr)
+    failures = store.failures()
+    if failures:
+        print("\nRecent failures:", file=sys.stderr)
+        for row in failures:
+            print(f"  {row['stage']:<8} {row['url']}: {row['error']}", file=sys.stderr)
+
+
+# --- Setup ---
+
+
+def _read_urls_file(path: Path) -> list[str]:
+    """Read video URLs, one per line; blank lines and # comments are ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _add_listed_videos(store: StageStore, args, after: str | None, before: str | None) -> None:
+    """List the requested channels and URL file into the store."""
+    channels = list(args.channels)
+    if args.channels_file:
+        channels += list_channel.read_channels_file(Path(args.channels_file))
+    if channels:
+        print(f"Listing {len(channels)} channel(s)...", file=sys.stderr)
+        listed, errors = list_channel.list_channels(
+            channels,
+            max_results=args.max_results,
+            after_date=after,
+            before_date=before,
+            min_duration=args.min_duration,
+        )
+        for error in errors:
+            print(f"  Error: {error}", file=sys.stderr)
+        for channel, videos in listed:
+            added = store.add_videos(
+                [(v["id"], v["url"]) for v in videos], channel
+            )
+            print(f"  {channel}: {len(videos)} listed, {added} new.", file=sys.stderr)
+    if args.urls_file:
+        urls = _read_urls_file(Path(args.urls_file))
+        added = store.add_videos([(shards.video_id(url), url) for url in urls], args.urls_file)
+        print(f"  {args.urls_file}: {len(urls)} URLs, {added} new.", file=sys.stderr)
+
+
+def _export(path: Path, entries: list[dict]) -> None:
+    """Write extracted entries as a seed-data JSON file (the claude_extract.py output format)."""
+    video_record.write_json_array(path, entries)
+    print(f"\nWrote {len(entries)} entries to {path}.", file=sys.stderr)
+
+
+def _date_arg(parser, value: str | None, name: str) -> str | None:
+    """Validate a YYYY-MM-DD argument and return it as YYYYMMDD."""
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y%m%d")
+    except ValueError:
+        parser.error(f"{name} must be a date in YYYY-MM-DD format.")
+
+
+def _build_runners(args, closers: list) -> dict:
+    """Create the clients each active stage needs and return its runner."""
+    active = STAGES[: STAGES.index(args.until) + 1]
+    runners = {}
+    runners["fetch"] = lambda row: _fetch(row, not args.no_transcript, args.cookies_from_browser)
+
+    if "extract" in active:
+        anthropic = import_anthropic()
+        try:
+            client = anthropic.Anthropic()
+        except anthropic.AuthenticationError:
+            print(
+                "Error: ANTHROPIC_API_KEY environment variable is not set or invalid.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        telemetry = ExtractionTelemetry()
+        executor = RequestExecutor(client, telemetry, concurrency=args.extract_workers)
+        closers.append(executor.close)
+        runners["extract"] = lambda row: _extract(
+            row, client, args.model, executor, telemetry, args.local_extract
+        )
+
+    if "seed" in active:
+        email = os.environ.get("ADMIN_EMAIL")
+        password = os.environ.get("ADMIN_PASSWORD")
+        if not email or not password:
+            print(
+                "Error: ADMIN_EMAIL and ADMIN_PASSWORD are required for the seed stage "
+                "(or stop earlier with --until extract).",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        api_url = os.environ.get("API_URL", seed_videos.DEFAULT_API_URL)
+        api = seed_videos.authenticate(api_url, email, password)
+        cache = GeocodeCache(Path(args.geocode_cache))
+        ledger = SeedLedger(Path(args.ledger), api_url)
+        closers.extend([cache.close, ledger.close])
+        seeded = ledger.load()
+        existing = seed_videos.ExistingVideos(api, args.seed_workers)
+        runners["seed"] = lambda row: _seed(row, api, cache, ledger, seeded, existing)
+    return runners
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the list → fetch → extract → seed pipeline with a resumable per-video stage store.",
+        epilog="The extract stage requires ANTHROPIC_API_KEY; the seed stage requires ADMIN_EMAIL and "
+        "ADMIN_PASSWORD (API_URL defaults to " + seed_videos.DEFAULT_API_URL + ").",
+    )
+    parser.add_argument(
+        "channels",
+        nargs="*",
+        help="Channels to list (URL, @handle or UCxxxx ID). Omit to resume the stored pipeline.",
+    )
+    parser.add_argument(
+        "-f",
+        "--channels-file",
+        type=str,
+        default=None,
+        help="File of channels to list, one per line (# comments allowed).",
+    )
+    parser.add_argument(
+        "--urls-file",
+        type=str,
+        default=None,
+        help="File of video URLs to add, one per line (# comments allowed).",
+    )
+    parser.add_argument(
+        "-n",
+        "--max-results",
+        type=int,
+        default=None,
+        help="Maximum number of videos to list per channel (default: no limit).",
+    )
+    parser.add_argument("--after", type=str, default=None, help="Only list videos published on/after this date (YYYY-MM-DD).")
+    parser.add_argument("--before", type=str, default=None, help="Only list videos published on/before this date (YYYY-MM-DD).")
+    parser.add_argument(
+        "--min-duration",
+        type=int,
+        default=61,
+        help="Minimum video duration in seconds when listing (default: 61, filters Shorts).",
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=str(DEFAULT_STORE),
+        metavar="FILE",
+        help="SQLite stage store (default: seed-data/pipeline.db).",
+    )
+    parser.add_argument(
+        "--until",
+        choices=STAGES,
+        default="seed",
+        help="Last stage to run (default: seed). Later stages stay pending for a later run.",
+    )
+    for stage in STAGES:
+        parser.add_argument(
+            f"--{stage}-workers",
+            type=int,
+            default=DEFAULT_WORKERS[stage],
+            metavar="N",
+            help=f"Videos in the {stage} stage at once (default: {DEFAULT_WORKERS[stage]}).",
+        )
+    parser.add_argument(
+        "--no-transcript",
+        action="store_true",
+        help="Skip transcript fetching (faster, uses only title + description).",
+    )
+    parser.add_argument(
+        "--cookies-from-browser",
+        type=str,
+        default=None,
+        metavar="BROWSER",
+        help="Browser to read YouTube cookies from (e.g., firefox, chrome).",
+    )
+    parser.add_argument(
+        "--model",
+        "-m",
+        type=str,
+        default=claude_extract.DEFAULT_MODEL,
+        help=f"Claude model to use (default: {claude_extract.DEFAULT_MODEL}).",
+    )
+    parser.add_argument(
+        "--local-extract",
+        choices=claude_extract.LOCAL_EXTRACT_MODES,
+        default="off",
+        help="Rule-based extraction alongside Claude, as in claude_extract.py (default: off).",
+    )
+    parser.add_argument(
+        "--geocode-cache",
+        type=str,
+        default=str(seed_videos.DEFAULT_GEOCODE_CACHE),
+        metavar="FILE",
+        help="Geocode cache shared with seed_videos.py (default: seed-data/geocode-cache.db).",
+    )
+    parser.add_argument(
+        "--ledger",
+        type=str,
+        default=str(seed_videos.DEFAULT_LEDGER),
+        metavar="FILE",
+        help="Seeding ledger shared with seed_videos.py (default: seed-data/seed-ledger.db).",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Retry videos whose last attempt at a stage failed.",
+    )
+    parser.add_argument(
+        "--export",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write every extracted entry to this seed-data JSON file after the run.",
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Print the stage store's status and all-time throughput, then exit.",
+    )
+    args = parser.parse_args()
+
+    for stage in STAGES:
+        if getattr(args, f"{stage}_workers") < 1:
+            parser.error(f"--{stage}-workers must be at least 1.")
+    after = _date_arg(parser, args.after, "--after")
+    before = _date_arg(parser, args.before, "--before")
+
+    store = StageStore(Path(args.store))
+    if args.status:
+        print_status(store)
+        print_throughput(store, title="All-time stage throughput")
+        store.close()
+        return
+
+    interrupted = store.reset_interrupted()
+    if interrupted:
+        print(f"Resuming {interrupted} stage(s) interrupted in the last run.", file=sys.stderr)
+    if args.retry_failed:
+        print(f"Retrying {store.retry_failed()} failed stage(s).", file=sys.stderr)
+    _add_listed_videos(store, args, after, before)
+
+    closers: list = []
+    runners = _build_runners(args, closers)
+    limits = {stage: getattr(args, f"{stage}_workers") for stage in STAGES}
+    run_started = time.time()
+    errors: list[str] = []
+    try:
+        errors = run_stages(store, runners, limits)
+    except KeyboardInterrupt:
+        print("\nInterrupted. Rerun to resume where this run stopped.", file=sys.stderr)
+        errors = ["interrupted"]
+    finally:
+        for close in closers:
+            close()
+
+    print_throughput(store, since=run_started, title="Stage throughput (this run)")
+    print("", file=sys.stderr)
+    print_status(store)
+    if args.export:
+        _export(Path(args.export), store.entries())
+    store.close()
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+SQLite stage store for pipeline.py.
+
+One row per video records the next stage it needs (fetch, extract, seed or
+done), whether that stage is pending, running or failed, and the output of
+every stage it has finished: the fetch_youtube.py record, the
+claude_extract.py entry and the seeding outcome. Each stage result is
+committed as soon as it is known, so an interrupted run resumes exactly
+where it stopped. A log of finished stage runs backs the throughput report.
+
+All access goes through one connection owned by the orchestrator's main
+thread; stage workers never touch the store.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+STAGES = ("fetch", "extract", "seed")
+DONE = "done"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    source TEXT,
+    position INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    record TEXT,
+    entry TEXT,
+    outcome TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_by_stage ON videos (stage, state, position);
+CREATE TABLE IF NOT EXISTS stage_log (
+    video_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    started REAL NOT NULL,
+    finished REAL NOT NULL
+);
+"""
+
+
+class StageStore:
+    """Per-video stage status and stage outputs."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add_videos(self, videos: list[tuple[str, str]], source: str | None) -> int:
+        """Add (video ID, URL) pairs at the fetch stage; known videos are left as they are.
+
+        Returns:
+            Number of videos added.
+        """
+        with self._conn:
+            start = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM videos").fetchone()[0]
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO videos (video_id, url, source, position, stage, state, updated) "
+                "VALUES (?, ?, ?, ?, 'fetch', 'pending', ?)",
+                (
+                    (video_id, url, source, start + i, time.time())
+                    for i, (video_id, url) in enumerate(videos)
+                ),
+            )
+            return self._conn.total_changes - before
+
+    def reset_interrupted(self) -> int:
+        """Return stages left running by an interrupted run to pending."""
+        with self._conn:
+            return self._conn.execute(
+                "UPDATE videos SET state = 'pending' WHERE state = 'running'"
+            ).rowcount
+
+    def retry_failed(self, stage: str | None = None) -> int:
+        """Make failed stages (optionally of one stage only) pending again."""
+        sql = "UPDATE videos SET state = 'pending', error = NULL WHERE state = 'failed'"
+        params: tuple = ()
+        if stage:
+            sql += " AND stage = ?"
+            params = (stage,)
+        with self._conn:
+            return self._conn.execute(sql, params).rowcount
+
+    def claim(self, stage: str, limit: int) -> list[sqlite3.Row]:
+        """Mark up to `limit` pending videos of a stage as running and return them, oldest first."""
+        rows = self._conn.execute(
+            "SELECT * FROM videos WHERE stage = ? AND state = 'pending' ORDER BY position LIMIT ?",
+            (stage, limit),
+        ).fetchall()
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE videos SET state = 'running', attempts = attempts + 1, updated = ? "
+                    "WHERE video_id = ?",
+                    ((time.time(), row["video_id"]) for row in rows),
+                )
+        return rows
+
+    def complete(self, video_id: str, stage: str, output, started: float) -> None:
+        """Store a stage's output and move the video to the next stage.
+
+        Args:
+            video_id: Video whose stage finished.
+            stage: The finished stage.
+            output: The fetch record, the extracted entry, or the seed outcome string.
+            started: When the stage started (time.time()), for the throughput log.
+        """
+        column = {"fetch": "record", "extract": "entry", "seed": "outcome"}[stage]
+        value = output if stage == "seed" else json.dumps(output, ensure_ascii=False)
+        index = STAGES.index(stage)
+        next_stage = STAGES[index + 1] if index + 1 < len(STAGES) else DONE
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                f"UPDATE videos SET {column} = ?, stage = ?, state = 'pending', error = NULL, "
+                "attempts = 0, updated = ? WHERE video_id = ?",
+                (value, next_stage, now, video_id),
+            )
+            self._log(video_id, stage, True, started, now)
+
+    def fail(self, video_id: str, stage: str, error: str, started: float) -> None:
+        """Record a failed stage; the video stays at that stage until retried."""
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "UPDATE videos SET state = 'failed', error = ?, updated = ? WHERE video_id = ?",
+                (error, now, video_id),
+            )
+            self._log(video_id, stage, False, started, now)
+
+    def release(self, video_id: str) -> None:
+        """Return a running stage to pending without counting an attempt (e.g. rate limited)."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE videos SET state = 'pending', attempts = MAX(attempts - 1, 0) "
+                "WHERE video_id = ?",
+                (video_id,),
+            )
+
+    def _log(self, video_id: str, stage: str, ok: bool, started: float, finished: float) -> None:
+        self._conn.execute(
+            "INSERT INTO stage_log VALUES (?, ?, ?, ?, ?)", (video_id, stage, ok, started, finished)
+        )
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """Return the number of videos per (stage, state)."""
+        rows = self._conn.execute(
+            "SELECT stage, state, COUNT(*) FROM videos GROUP BY stage, state"
+        ).fetchall()
+        return {(stage, state): count for stage, state, count in rows}
+
+    def failures(self, limit: int = 20) -> list[sqlite3.Row]:
+        """Return the most recent failed videos."""
+        return self._conn.execute(
+            "SELECT video_id, url, stage, error FROM videos WHERE state = 'failed' "
+            "ORDER BY updated DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def throughput(self, since: float = 0.0) -> dict[str, dict]:
+        """Summarize logged stage runs finished after `since`, per stage.
+
+        Returns:
+            Stage -> dict with ok, failed, busy_seconds (summed stage time) and
+            wall_seconds (first start to last finish).
+        """
+        rows = self._conn.execute(
+            "SELECT stage, SUM(ok), SUM(1 - ok), SUM(finished - started), MIN(started), MAX(finished) "
+            "FROM stage_log WHERE finished >= ? GROUP BY stage",
+            (since,),
+        ).fetchall()
+        return {
+            stage: {
+                "ok": ok,
+                "failed": failed,
+                "busy_seconds": busy,
+                "wall_seconds": last - first,
+            }
+            for stage, ok, failed, busy, first, last in rows
+        }
+
+    def entries(self) -> list[dict]:
+        """Return every extracted entry, in the order videos were added."""
+        rows = self._conn.execute(
+            "SELECT entry FROM videos WHERE entry IS NOT NULL ORDER BY position"
+        ).fetchall()
+        return [json.loads(row["entry"]) for row in rows]
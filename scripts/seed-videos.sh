@@ -10,6 +10,9 @@
 #   ADMIN_PASSWORD  - Admin user password (required)
 #   API_URL         - API base URL (default: http://localhost:8080/api/v1)
 #
+# For large files, scripts/seed-videos/seed_videos.py does the same with
+# pooled connections and concurrent workers.
+#
 
 set -euo pipefail
 
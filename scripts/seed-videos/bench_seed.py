@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmark seed_videos.py against scripts/seed-videos.sh on a local stub API.
+
+Starts an in-process stub of the endpoints the seeders use (login, geocode,
+locations, videos) with a fixed per-request latency, generates a synthetic
+seed file, and runs each seeder against a fresh stub. Reports wall time,
+requests and TCP connections per run, and checks that both seeders reach the
+same summary counts.
+
+Usage:
+    python bench_seed.py
+    python bench_seed.py --entries 1000 --latency-ms 10 --workers 1 8 32
+    python bench_seed.py --skip-bash
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from seed_ledger import youtube_id
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BASH_SEEDER = SCRIPT_DIR.parent / "seed-videos.sh"
+PY_SEEDER = SCRIPT_DIR / "seed_videos.py"
+
+_SUMMARY_LINE = re.compile(r"^\s+(Created|Skipped|Filtered|Failed):\s+(?:\x1b\[[0-9;]*m)?(\d+)", re.M)
+
+
+class StubApi(ThreadingHTTPServer):
+    """Stub of the API endpoints used by the seeders, with request/connection counters."""
+
+    daemon_threads = True
+    # The default backlog of 5 drops connects when many workers start at once
+    request_queue_size = 128
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.geocodes = 0
+        self.locations: dict[tuple, str] = {}
+        self.videos: dict[str, str] = {}
+
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v1"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle's algorithm
+    # and delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+    server: StubApi
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        parts = urlsplit(self.path)
+        path = parts.path
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        time.sleep(server.latency)
+
+        if path.endswith("/auth/login"):
+            self._reply(200, {"tokens": {"accessToken": "stub-token"}})
+        elif path.endswith("/locations/geocode"):
+            with server.lock:
+                server.geocodes += 1
+            # A stable pin per address, a few blocks apart
+            spot = zlib.crc32(urlsplit(self.path).query.encode("utf-8")) % 10_000
+            self._reply(200, {"coordinates": {"latitude": 40 + spot / 1000, "longitude": -75 - spot / 1000}})
+        elif path.endswith("/locations"):
+            coords = body.get("coordinates", {})
+            key = (coords.get("latitude"), coords.get("longitude"), body.get("displayName"))
+            with server.lock:
+                existing = server.locations.get(key)
+                if existing is None:
+                    server.locations[key] = str(uuid.uuid4())
+            if existing:
+                self._reply(409, {"existingLocationId": existing})
+            else:
+                self._reply(201, {"id": server.locations[key]})
+        elif path.endswith("/videos") and self.command == "GET":
+            query = parse_qs(parts.query)
+            page, size = int(query["page"][0]), int(query["size"][0])
+            with server.lock:
+                videos = sorted(server.videos.items())
+            data = [{"id": vid, "youtubeId": youtube_id(url)} for url, vid in videos]
+            self._reply(200, {
+                "data": data[page * size : (page + 1) * size],
+                "pagination": {
+                    "page": page,
+                    "size": size,
+                    "totalElements": len(data),
+                    "totalPages": -(-len(data) // size),
+                },
+            })
+        elif path.endswith("/videos"):
+            with server.lock:
+                duplicate = body.get("youtubeUrl") in server.videos
+                if not duplicate:
+                    server.videos[body.get("youtubeUrl")] = str(uuid.uuid4())
+                video_id = server.videos[body.get("youtubeUrl")]
+            self._reply(409 if duplicate else 201, {"id": video_id})
+        elif "/videos/" in path and self.command == "PUT":
+            video_id = path.rsplit("/", 1)[1]
+            with server.lock:
+                exists = video_id in server.videos.values()
+            self._reply(200 if exists else 404, {"id": video_id})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    do_GET = do_POST = do_PUT = _handle
+
+
+def generate_entries(count: int, seed: int = 0) -> list[dict]:
+    """Generate claude_extract.py-style entries with a realistic mix of outcomes.
+
+    About 10% are filtered by confidence, 20% need geocoding, 5% repeat an
+    earlier video and each place (about 100 m apart) is shared by several videos.
+    """
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        video = i if rng.random() > 0.05 or i == 0 else rng.randrange(i)
+        place = rng.randrange(max(count // 4, 1))
+        location = {
+            "name": f"City Hall {place}",
+            "streetAddress": f"{place} Main St",
+            "city": "Springfield",
+            "state": "IL",
+            "latitude": 39.0 + place / 1000,
+            "longitude": -89.0 - place / 1000,
+        }
+        if rng.random() < 0.2:
+            location["latitude"] = location["longitude"] = None
+        entries.append({
+            "youtubeUrl": f"https://www.youtube.com/watch?v={video:011d}",
+            "title": f"First Amendment audit {video}",
+            "amendments": ["FIRST"],
+            "participants": ["POLICE"],
+            "videoDate": "2024-05-01",
+            "location": location,
+            "confidence": {
+                "location": 0.4 if rng.random() < 0.1 else 0.9,
+                "amendments": 0.9,
+                "participants": 0.9,
+                "videoDate": 0.8,
+            },
+        })
+    return entries
+
+
+def run_seeder(name: str, command: list[str], latency: float) -> dict:
+    """Run one seeder against a fresh stub API and return its measurements."""
+    server = StubApi(latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    env = dict(os.environ, ADMIN_EMAIL="admin@example.com", ADMIN_PASSWORD="stub",
+               API_URL=server.api_url)
+    start = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+    if result.returncode not in (0, 1):
+        print(result.stdout[-2000:], result.stderr[-2000:], file=sys.stderr)
+        raise RuntimeError(f"{name} exited with {result.returncode}")
+    counts = {k.lower(): int(v) for k, v in _SUMMARY_LINE.findall(result.stdout)}
+    return {
+        "seeder": name,
+        "seconds": round(elapsed, 2),
+        "requests": server.requests,
+        "connections": server.connections,
+        "geocodes": server.geocodes,
+        "counts": counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark seed_videos.py against seed-videos.sh on a local stub API.",
+    )
+    parser.add_argument("--entries", type=int, default=300, help="Synthetic entries (default: 300).")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=5.0,
+        help="Stub API latency per request in milliseconds (default: 5).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 8],
+        help="seed_videos.py worker counts to run (default: 1 8).",
+    )
+    parser.add_argument("--skip-bash", action="store_true", help="Do not run seed-videos.sh.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_file = Path(tmp) / "videos.json"
+        seed_file.write_text(json.dumps(generate_entries(args.entries), indent=2), encoding="utf-8")
+        latency = args.latency_ms / 1000
+
+        runs = []
+        if not args.skip_bash:
+            runs.append(run_seeder(
+                "seed-videos.sh", ["bash", str(BASH_SEEDER), "--file", str(seed_file)], latency
+            ))
+        for workers in args.workers:
+            # A fresh geocode cache and ledger per run, so every run starts cold
+            cache_file = Path(tmp) / f"geocode-{workers}.db"
+            ledger_file = Path(tmp) / f"ledger-{workers}.db"
+            runs.append(run_seeder(
+                f"seed_videos.py -w {workers}",
+                [
+                    sys.executable, str(PY_SEEDER), "--file", str(seed_file),
+                    "--workers", str(workers), "--geocode-cache", str(cache_file),
+                    "--ledger", str(ledger_file),
+                ],
+                latency,
+            ))
+
+    print(f"{args.entries} entries, {args.latency_ms:g} ms stub latency\n")
+    print(
+        f"{'seeder':<22} {'seconds':>8} {'entries/s':>10} {'requests':>9} {'connections':>12} "
+        f"{'geocodes':>9}  counts"
+    )
+    for run in runs:
+        rate = args.entries / run["seconds"] if run["seconds"] else 0.0
+        counts = " ".join(f"{k}={v}" for k, v in run["counts"].items())
+        print(
+            f"{run['seeder']:<22} {run['seconds']:>8.2f} {rate:>10.1f} {run['requests']:>9} "
+            f"{run['connections']:>12} {run['geocodes']:>9}  {counts}"
+        )
+
+    if len({json.dumps(run["counts"], sort_keys=True) for run in runs}) > 1:
+        print("\nWarning: seeders reached different summary counts.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Persistent geocode cache for seed_videos.py.
+
+Maps normalized addresses to coordinates in a local SQLite file, so videos
+that share an address (and repeated or overlapping seed runs) geocode it
+once. Addresses the API could not geocode are cached too, as negative
+results, but expire sooner: a miss may be fixed upstream. Positive results
+expire after 30 days, matching the location service's own geocode cache.
+
+Only definitive answers are cached. Connection errors, rate limiting and
+server errors are not, so the next run retries them.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+POSITIVE_TTL_SECONDS = 30 * 86400
+DEFAULT_NEGATIVE_TTL_HOURS = 24.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocodes (
+    address TEXT PRIMARY KEY,
+    latitude REAL,
+    longitude REAL,
+    fetched REAL NOT NULL
+);
+"""
+
+_ABBREVIATIONS = {
+    "street": "st",
+    "avenue": "ave",
+    "road": "rd",
+    "boulevard": "blvd",
+    "drive": "dr",
+    "lane": "ln",
+    "court": "ct",
+    "place": "pl",
+    "highway": "hwy",
+    "parkway": "pkwy",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+    "suite": "ste",
+}
+_NON_WORD = re.compile(r"[^\w#]+")
+
+_MISS = object()
+
+
+def normalize_address(address: str) -> str:
+    """Normalize an address for use as a cache key.
+
+    Case, punctuation, whitespace and common street-suffix and direction
+    spellings are ignored, so "800 East Monroe Street, Springfield" and
+    "800 E. Monroe St Springfield" share an entry.
+    """
+    words = _NON_WORD.sub(" ", address.casefold()).split()
+    return " ".join(_ABBREVIATIONS.get(word, word) for word in words)
+
+
+class GeocodeCache:
+    """Thread-safe persistent address -> coordinates cache.
+
+    Concurrent lookups of the same address wait for the first one instead of
+    each calling the API.
+    """
+
+    def __init__(self, path: Path, negative_ttl_hours: float = DEFAULT_NEGATIVE_TTL_HOURS):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._negative_ttl = negative_ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._inflight: dict[str, threading.Event] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.lookups = 0
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _get(self, key: str):
+        """Return cached (lat, lng), None for a cached miss, or _MISS. Call with the lock held."""
+        row = self._conn.execute(
+            "SELECT latitude, longitude, fetched FROM geocodes WHERE address = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return _MISS
+        latitude, longitude, fetched = row
+        found = latitude is not None and longitude is not None
+        ttl = POSITIVE_TTL_SECONDS if found else self._negative_ttl
+        if time.time() - fetched > ttl:
+            return _MISS
+        return (latitude, longitude) if found else None
+
+    def resolve(
+        self,
+        address: str,
+        geocode: Callable[[str], tuple[tuple[float, float] | None, bool]],
+    ) -> tuple[float, float] | None:
+        """Return an address's coordinates from the cache, or geocode and cache them.
+
+        Args:
+            address: Address to geocode.
+            geocode: Called on a cache miss with the address. Returns a tuple of
+                (coordinates or None, whether the answer is definitive). Only
+                definitive answers are cached.
+
+        Returns:
+            (latitude, longitude), or None if the address could not be geocoded.
+        """
+        key = normalize_address(address)
+        while True:
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    cached = self._get(key)
+                    if cached is not _MISS:
+                        self.hits += 1
+                        self.negative_hits += cached is None
+                        return cached
+                    pending = self._inflight[key] = threading.Event()
+                    break
+            # Another worker is geocoding this address; use its answer
+            pending.wait()
+
+        try:
+            coordinates, definitive = geocode(address)
+            with self._lock:
+                self.lookups += 1
+                if definitive:
+                    latitude, longitude = coordinates or (None, None)
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?)",
+                            (key, latitude, longitude, time.time()),
+                        )
+            return coordinates
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.set()
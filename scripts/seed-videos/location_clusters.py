@@ -0,0 +1,118 @@
+"""
+Client-side location clustering for seed_videos.py.
+
+Many seeded videos are filmed at the same place: the same city hall or post
+office, often with slightly different pins or spellings. Rather than POST a
+location per video and rely on the API's 409 to find the existing one, the
+seeder clusters the resolved locations first, creates each cluster's
+location once, and links every video in the cluster to it.
+
+Two locations join the same cluster when:
+
+- a pin is within the cluster radius (default 25 m) of the pin that started
+  a cluster. Comparing with that first pin, rather than with any member,
+  keeps a row of nearby pins from chaining a whole block into one place; or
+- they have the same normalized name or street address in the same city and
+  state, and their pins are within 500 m (geocoding the same place by name
+  and by address can land a block apart).
+
+Cluster-starting pins are bucketed in a spatial grid with cells as tall as the
+radius, so each pin is only compared with those in its own and adjacent cells.
+"""
+
+import math
+
+from geocode_cache import normalize_address
+
+DEFAULT_RADIUS_METERS = 25.0
+NAME_MATCH_RADIUS_METERS = 500.0
+
+_EARTH_RADIUS_METERS = 6_371_000.0
+_METERS_PER_DEGREE = math.pi * _EARTH_RADIUS_METERS / 180
+
+
+def distance_meters(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Great-circle distance in meters between two (latitude, longitude) pins."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (*a, *b))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _place_keys(location: dict) -> list[str]:
+    """Normalized name and street-address keys of a location, scoped to its city and state."""
+    scope = "|".join(normalize_address(location.get(k) or "") for k in ("city", "state"))
+    keys = []
+    for field in ("name", "streetAddress"):
+        value = normalize_address(location.get(field) or "")
+        if value:
+            keys.append(f"{field}|{value}|{scope}")
+    return keys
+
+
+def cluster_locations(
+    locations: list[dict],
+    pins: list[tuple[float, float]],
+    radius_meters: float = DEFAULT_RADIUS_METERS,
+) -> list[list[int]]:
+    """Group locations that refer to the same place.
+
+    Args:
+        locations: Location objects from claude_extract.py output.
+        pins: Resolved (latitude, longitude) of each location.
+        radius_meters: Pins this close to a cluster's first pin join the cluster.
+
+    Returns:
+        Clusters as lists of indices into `locations`, each in input order,
+        ordered by their first member. Every index is in exactly one cluster.
+    """
+    parent = list(range(len(locations)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    # Pin proximity: join the nearest cluster-starting pin within the radius,
+    # found through a grid of cells radius_meters tall. A cell is narrower in
+    # meters away from the equator, so scan enough columns to cover the radius.
+    cell = max(radius_meters, 1.0) / _METERS_PER_DEGREE
+    leaders: dict[tuple[int, int], list[int]] = {}
+    for i, (lat, lng) in enumerate(pins):
+        row, col = math.floor(lat / cell), math.floor(lng / cell)
+        columns = math.ceil(1 / max(math.cos(math.radians(lat)), 0.01))
+        nearest, nearest_distance = None, radius_meters
+        for r in (row - 1, row, row + 1):
+            for c in range(col - columns, col + columns + 1):
+                for j in leaders.get((r, c), ()):
+                    distance = distance_meters(pins[i], pins[j])
+                    if distance <= nearest_distance:
+                        nearest, nearest_distance = j, distance
+        if nearest is None:
+            leaders.setdefault((row, col), []).append(i)
+        else:
+            union(i, nearest)
+
+    # Same name or street address in the same city, nearby
+    by_key: dict[str, list[int]] = {}
+    for i, location in enumerate(locations):
+        for key in _place_keys(location):
+            members = by_key.setdefault(key, [])
+            for j in members:
+                if distance_meters(pins[i], pins[j]) <= NAME_MATCH_RADIUS_METERS:
+                    union(i, j)
+                    break
+            members.append(i)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(locations)):
+        clusters.setdefault(find(i), []).append(i)
+    return [members for _, members in sorted(clusters.items())]
@@ -0,0 +1,123 @@
+"""
+Local seeding ledger for seed_videos.py.
+
+Records every video the seeder has created (or found already created): its
+YouTube URL, video ID, location ID and a hash of the input entry it was
+seeded from. On a rerun over a growing seed file, entries whose hash is
+unchanged are skipped without any API call, and changed entries are updated
+in place instead of re-created.
+
+Rows are scoped to the API base URL, so seeding a local stack and a deployed
+one from the same ledger file does not mix them up. `seed_videos.py --verify`
+reconciles the ledger with the videos the API actually has (e.g. after a
+database reset).
+"""
+
+import hashlib
+import importlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seeded (
+    api_url TEXT NOT NULL,
+    youtube_url TEXT NOT NULL,
+    youtube_id TEXT NOT NULL,
+    video_id TEXT,
+    location_id TEXT,
+    input_hash TEXT NOT NULL,
+    seeded REAL NOT NULL,
+    PRIMARY KEY (api_url, youtube_url)
+);
+"""
+
+def _shared(module: str):
+    """Import a module shared with the extract-metadata scripts (shards.py)."""
+    shared_dir = str(Path(__file__).resolve().parent.parent / "extract-metadata")
+    if shared_dir not in sys.path:
+        sys.path.insert(0, shared_dir)
+    return importlib.import_module(module)
+
+
+def youtube_id(url: str) -> str:
+    """Return the YouTube video ID in a URL, or the URL itself if none is found.
+
+    This is shards.video_id, which also keys shards and near-duplicate groups,
+    so ledger rows always agree with them.
+    """
+    return _shared("shards").video_id(url)
+
+
+def input_hash(entry: dict) -> str:
+    """Hash an input entry, so a rerun can tell whether it changed since it was seeded."""
+    canonical = json.dumps(entry, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SeedLedger:
+    """Thread-safe ledger of seeded videos for one API."""
+
+    def __init__(self, path: Path, api_url: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        self._api_url = api_url.rstrip("/")
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def load(self) -> dict[str, sqlite3.Row]:
+        """Return this API's ledger rows keyed by YouTube URL."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM seeded WHERE api_url = ?", (self._api_url,)
+            ).fetchall()
+        return {row["youtube_url"]: row for row in rows}
+
+    def record(
+        self, youtube_url: str, video_id: str, location_id: str | None, entry_hash: str
+    ) -> None:
+        """Record (or update) a seeded video. Committed immediately.
+
+        The video ID is required: without it a changed entry could not be
+        updated in place, so seed_videos.py does not record the entry at all.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO seeded VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (api_url, youtube_url) DO UPDATE SET "
+                "video_id = excluded.video_id, "
+                "location_id = excluded.location_id, "
+                "input_hash = excluded.input_hash, seeded = excluded.seeded",
+                (
+                    self._api_url,
+                    youtube_url,
+                    youtube_id(youtube_url),
+                    video_id,
+                    location_id,
+                    entry_hash,
+                    time.time(),
+                ),
+            )
+
+    def forget(self, youtube_urls: list[str]) -> None:
+        """Remove videos from the ledger, so the next run seeds them again."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM seeded WHERE api_url = ? AND youtube_url = ?",
+                ((self._api_url, url) for url in youtube_urls),
+            )
+
+    def set_video_ids(self, video_ids: dict[str, str]) -> None:
+        """Fill in video IDs (keyed by YouTube URL) learned from the API."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE seeded SET video_id = ? WHERE api_url = ? AND youtube_url = ?",
+                ((video_id, self._api_url, url) for url, video_id in video_ids.items()),
+            )
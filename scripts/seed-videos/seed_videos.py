@@ -0,0 +1,756 @@
+#!/usr/bin/env python3
+"""
+Seed videos from a claude_extract.py output file into AccountabilityAtlas via the API.
+
+A Python port of scripts/seed-videos.sh for large seed files. It applies the
+same confidence filters and the same location -> video creation flow, but:
+
+- the input file is parsed once, instead of once per entry;
+- requests go over keep-alive connections (one per worker) instead of a new
+  curl process and connection per request;
+- up to --workers entries are seeded concurrently;
+- geocode results are cached across entries and runs (see geocode_cache.py);
+- locations are clustered before any are created, so each distinct place is
+  POSTed once (see location_clusters.py);
+- a local ledger records what has been seeded, so reruns only send new or
+  changed entries (see seed_ledger.py).
+
+Usage:
+    python seed_videos.py
+    python seed_videos.py --file seed-data/videos.json --workers 16
+    python seed_videos.py --no-geocode-cache --cluster-radius 50
+    python seed_videos.py --verify
+
+Environment variables:
+    ADMIN_EMAIL     - Admin user email (required)
+    ADMIN_PASSWORD  - Admin user password (required)
+    API_URL         - API base URL (default: http://localhost:8080/api/v1)
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from geocode_cache import DEFAULT_NEGATIVE_TTL_HOURS, GeocodeCache
+from location_clusters import DEFAULT_RADIUS_METERS, cluster_locations
+from seed_ledger import SeedLedger, input_hash, youtube_id
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_INPUT = ROOT_DIR / "seed-data" / "videos.json"
+DEFAULT_GEOCODE_CACHE = ROOT_DIR / "seed-data" / "geocode-cache.db"
+DEFAULT_LEDGER = ROOT_DIR / "seed-data" / "seed-ledger.db"
+DEFAULT_API_URL = "http://localhost:8080/api/v1"
+DEFAULT_WORKERS = 8
+
+_TIMEOUT_SECONDS = 60
+_VERIFY_PAGE_SIZE = 100
+
+# Geocode responses that will not change on retry (cached, even without coordinates)
+_DEFINITIVE_GEOCODE_STATUSES = {200, 400, 404, 422}
+
+# Same colors as scripts/lib/common.sh, dropped when stdout is not a terminal
+_COLOR = sys.stdout.isatty()
+RED = "\033[0;31m" if _COLOR else ""
+GREEN = "\033[0;32m" if _COLOR else ""
+YELLOW = "\033[1;33m" if _COLOR else ""
+BLUE = "\033[0;34m" if _COLOR else ""
+NC = "\033[0m" if _COLOR else ""
+
+_print_lock = threading.Lock()
+
+
+def _emit(*lines: str) -> None:
+    """Print lines together, so concurrent workers do not interleave them."""
+    with _print_lock:
+        print("\n".join(lines), flush=True)
+
+
+def info(message: str) -> str:
+    return f"{BLUE}[INFO]{NC} {message}"
+
+
+def success(message: str) -> str:
+    return f"{GREEN}[OK]{NC} {message}"
+
+
+def warn(message: str) -> str:
+    return f"{YELLOW}[WARN]{NC} {message}"
+
+
+def error(message: str) -> str:
+    return f"{RED}[ERROR]{NC} {message}"
+
+
+class ApiClient:
+    """Minimal JSON client for the AccountabilityAtlas API.
+
+    Each thread keeps one keep-alive connection, so a pool of N workers holds
+    at most N connections open however many requests it makes.
+    """
+
+    def __init__(self, api_url: str, access_token: str | None = None):
+        parts = urlsplit(api_url)
+        self._https = parts.scheme == "https"
+        self._netloc = parts.netloc
+        self._base_path = parts.path.rstrip("/")
+        self.access_token = access_token
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            conn = conn_class(self._netloc, timeout=_TIMEOUT_SECONDS)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method: str, path: str, body: dict | None = None) -> tuple[int, str]:
+        """Send a request and return (HTTP status, response body).
+
+        A request that fails because the server closed an idle keep-alive
+        connection is retried once on a new connection. Other connection
+        errors return status 0 with the error as the body, like `curl -s`.
+        """
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, self._base_path + path, body=payload, headers=headers)
+                response = conn.getresponse()
+                text = response.read().decode("utf-8", errors="replace")
+                if response.will_close:
+                    self._reset()
+                return response.status, text
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                self._reset()
+                if attempt:
+                    return 0, str(e)
+            except (OSError, http.client.HTTPException) as e:
+                self._reset()
+                return 0, str(e)
+        return 0, "unreachable"
+
+
+def _json_or_empty(text: str) -> dict:
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _or(value, default):
+    """jq's `value // default`: fall back on null and false."""
+    return default if value is None or value is False else value
+
+
+def _jq_str(value) -> str:
+    """Format a number the way jq string interpolation does."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def filter_reason(entry: dict) -> str | None:
+    """Return why an entry fails the confidence filters, or None if it passes."""
+    conf = _or(entry.get("confidence"), {})
+    loc = _or(entry.get("location"), {})
+    loc_conf = _or(conf.get("location"), 1)
+    amend_conf = _or(conf.get("amendments"), 1)
+    part_conf = _or(conf.get("participants"), 1)
+    if loc_conf < 0.55:
+        return f"location confidence {_jq_str(loc_conf)}"
+    if loc_conf < 0.6 and (not loc.get("name") or not loc.get("streetAddress")):
+        return f"location confidence {_jq_str(loc_conf)} without street address"
+    if amend_conf < 0.5 and part_conf < 0.8:
+        return (
+            f"amendments {_jq_str(amend_conf)} and participants {_jq_str(part_conf)}"
+            " — likely not accountability content"
+        )
+    return None
+
+
+def _request_geocode(client: ApiClient, address: str) -> tuple[tuple[float, float] | None, bool]:
+    """Call the geocode endpoint.
+
+    Returns:
+        Tuple of (coordinates or None, whether the answer is definitive).
+    """
+    status, text = client.request("GET", f"/locations/geocode?address={quote(address, safe='')}")
+    definitive = status in _DEFINITIVE_GEOCODE_STATUSES
+    if status != 200:
+        return None, definitive
+    coordinates = _or(_json_or_empty(text).get("coordinates"), {})
+    lat, lng = coordinates.get("latitude"), coordinates.get("longitude")
+    if lat is None or lng is None:
+        return None, definitive
+    return (lat, lng), definitive
+
+
+def _geocode(
+    client: ApiClient, location: dict, cache: GeocodeCache | None
+) -> tuple[float | None, float | None]:
+    """Geocode a location's street address, city and state; (None, None) on failure."""
+    address = ", ".join(
+        part for part in (location.get("streetAddress"), location.get("city"), location.get("state"))
+        if part
+    )
+    if cache is None:
+        coordinates, _ = _request_geocode(client, address)
+    else:
+        coordinates = cache.resolve(address, lambda a: _request_geocode(client, a))
+    return coordinates or (None, None)
+
+
+def resolve_pin(
+    client: ApiClient, location: dict, cache: GeocodeCache | None = None
+) -> tuple[float, float] | None:
+    """Return a location's (latitude, longitude), geocoding it if needed.
+
+    Args:
+        client: Authenticated API client.
+        location: The entry's location object.
+        cache: Geocode cache, or None to always call the geocode endpoint.
+
+    Returns:
+        The pin, or None if the location has no coordinates and could not be geocoded.
+    """
+    lat, lng = location.get("latitude"), location.get("longitude")
+    # If no lat/lng, try geocoding from streetAddress (requires a street address)
+    if (lat is None or lng is None) and location.get("streetAddress"):
+        lat, lng = _geocode(client, location, cache)
+    if lat is None or lng is None:
+        return None
+    return lat, lng
+
+
+def create_location(
+    client: ApiClient, location: dict, pin: tuple[float, float]
+) -> tuple[str | None, list[str]]:
+    """Create (or find the existing) location at a pin.
+
+    Returns:
+        Tuple of (location ID or None, warning lines).
+    """
+    lat, lng = pin
+    body = {
+        "coordinates": {"latitude": lat, "longitude": lng},
+        "displayName": location.get("name") or location.get("city") or "Unknown",
+        "city": location.get("city") or None,
+        "state": location.get("state") or None,
+    }
+    status, text = client.request("POST", "/locations", body)
+    if status == 201:
+        return _json_or_empty(text).get("id"), []
+    if status == 409:
+        # Location already exists — use the existing one
+        existing = _json_or_empty(text).get("existingLocationId")
+        if not existing:
+            return None, [warn("  Location 409 but no existingLocationId in response")]
+        return existing, []
+    return None, []
+
+
+def build_video_body(entry: dict, location_id: str) -> dict:
+    """Build the POST /videos request for an entry."""
+    body = {
+        "youtubeUrl": entry.get("youtubeUrl"),
+        "amendments": _or(entry.get("amendments"), []),
+        "participants": _or(entry.get("participants"), []),
+        "locationId": location_id,
+    }
+    # Nullify date if confidence is too low
+    video_date = entry.get("videoDate")
+    if video_date is not None and _or(_or(entry.get("confidence"), {}).get("videoDate"), 1) >= 0.5:
+        body["videoDate"] = video_date
+    return body
+
+
+def create_video(
+    client: ApiClient, entry: dict, location_id: str | None, video_id: str | None = None
+) -> tuple[str, str, list[str], str | None]:
+    """Create an entry's video at its location, or update it if its ID is known.
+
+    Args:
+        client: Authenticated API client.
+        entry: Entry from claude_extract.py output.
+        location_id: The entry's location, or None if none could be created.
+        video_id: ID of the video seeded from an earlier version of the entry.
+            It is updated in place; if it no longer exists, it is re-created.
+
+    Returns:
+        Tuple of (outcome, status text, extra output lines, video ID if known),
+        where outcome is one of "created", "updated", "skipped" or "failed".
+    """
+    # Skip video if no location could be created (locationId is required by the API)
+    if not location_id:
+        lines = [warn("  Could not create or geocode location — locationId is required")]
+        return "failed", f"{RED}failed (no location){NC}", lines, None
+
+    body = build_video_body(entry, location_id)
+    if video_id:
+        status, text = client.request("PUT", f"/videos/{quote(video_id, safe='')}", body)
+        if status in (200, 204):
+            return "updated", f"{GREEN}updated{NC}", [], video_id
+        if status != 404:
+            return "failed", f"{RED}failed (HTTP {status:03d}){NC}", [warn(f"  Response: {text}")], None
+
+    status, text = client.request("POST", "/videos", body)
+    if status == 201:
+        return "created", f"{GREEN}created{NC}", [], _json_or_empty(text).get("id")
+    if status == 409:
+        return "skipped", f"{YELLOW}already exists (skipped){NC}", [], None
+    return "failed", f"{RED}failed (HTTP {status:03d}){NC}", [warn(f"  Response: {text}")], None
+
+
+def list_videos(client: ApiClient, workers: int) -> dict[str, str]:
+    """List every video the API has, in pages fetched concurrently.
+
+    Returns:
+        Video IDs keyed by YouTube video ID.
+
+    Raises:
+        RuntimeError: If a page cannot be listed.
+    """
+
+    def fetch_page(page: int) -> dict:
+        status, text = client.request("GET", f"/videos?page={page}&size={_VERIFY_PAGE_SIZE}")
+        if status != 200:
+            raise RuntimeError(f"Failed to list videos (HTTP {status:03d}): {text}")
+        return _json_or_empty(text)
+
+    first = fetch_page(0)
+    pages = [first]
+    total_pages = _or(first.get("pagination"), {}).get("totalPages") or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages += pool.map(fetch_page, range(1, total_pages))
+
+    video_ids: dict[str, str] = {}
+    for page in pages:
+        for video in _or(page.get("data"), []):
+            if video.get("youtubeId") and video.get("id"):
+                video_ids[video["youtubeId"]] = video["id"]
+    return video_ids
+
+
+class ExistingVideos:
+    """Looks up the IDs of videos the API reported as already existing.
+
+    The API's 409 carries no video ID, so the first lookup lists every video
+    (see list_videos) and later ones reuse that listing.
+    """
+
+    def __init__(self, client: ApiClient, workers: int):
+        self._client = client
+        self._workers = workers
+        self._video_ids: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def get(self, youtube_url: str) -> str | None:
+        with self._lock:
+            if self._video_ids is None:
+                try:
+                    self._video_ids = list_videos(self._client, self._workers)
+                except RuntimeError as e:
+                    _emit(warn(f"  Could not look up existing video IDs: {e}"))
+                    self._video_ids = {}
+        return self._video_ids.get(youtube_id(youtube_url))
+
+
+def authenticate(api_url: str, email: str, password: str) -> ApiClient:
+    """Log in as admin and return a client that sends the access token.
+
+    Exits the process if authentication fails.
+    """
+    client = ApiClient(api_url)
+    _emit(info(f"Authenticating as {email}..."))
+    status, text = client.request("POST", "/auth/login", {"email": email, "password": password})
+    if status != 200:
+        _emit(error(f"Authentication failed (HTTP {status:03d}): {text}"))
+        sys.exit(1)
+    token = _or(_json_or_empty(text).get("tokens"), {}).get("accessToken")
+    if not token:
+        _emit(error("Failed to extract access token from auth response"))
+        sys.exit(1)
+    _emit(success("Authenticated successfully"))
+    client.access_token = token
+    return client
+
+
+def seed(
+    client: ApiClient,
+    entries: list[dict],
+    workers: int,
+    cache: GeocodeCache | None = None,
+    cluster_radius: float | None = DEFAULT_RADIUS_METERS,
+    ledger: SeedLedger | None = None,
+) -> dict[str, int]:
+    """Seed entries concurrently and return counts per outcome.
+
+    After filtering, runs in three passes, each spread over the worker pool:
+    resolve the entries' pins, create each distinct location once, then
+    create the videos.
+
+    With a ledger, entries seeded before from identical input are skipped
+    without any request, entries that changed since are updated in place,
+    and every created, updated or already-existing video is recorded with
+    its ID. The IDs of already-existing videos are looked up in the API's
+    video listing; an entry whose video ID stays unknown is not recorded, so
+    a later edit is not mistaken for one already sent.
+
+    Each entry's status line is printed when its video is done, so with more
+    than one worker lines may appear out of input order; the [i/N] prefix
+    keeps its position.
+
+    Args:
+        client: Authenticated API client.
+        entries: Entries from claude_extract.py output.
+        workers: Maximum concurrent requests.
+        cache: Geocode cache, or None to always call the geocode endpoint.
+        cluster_radius: Radius in meters for clustering locations, or None to
+            create a location per entry.
+        ledger: Seeding ledger, or None to send every entry.
+    """
+    total = len(entries)
+    reasons: list[str | None] = [None] * total
+    pins: list[tuple[float, float] | None] = [None] * total
+    errors: dict[int, str] = {}
+
+    for index, entry in enumerate(entries):
+        try:
+            reasons[index] = filter_reason(entry)
+        except Exception as e:  # keep going with the other entries
+            errors[index] = str(e)
+
+    # Ledger decisions: unchanged entries are skipped, changed ones updated
+    hashes: list[str | None] = [None] * total
+    unchanged: set[int] = set()
+    known_ids: dict[int, str] = {}
+    if ledger is not None:
+        seeded = ledger.load()
+        first_seen: set[str] = set()
+        for index, entry in enumerate(entries):
+            if reasons[index] or index in errors:
+                continue
+            url = entry.get("youtubeUrl")
+            row = seeded.get(url)
+            repeat = url in first_seen
+            first_seen.add(url)
+            # Only a URL's first seedable entry is recorded; later repeats follow it
+            hashes[index] = None if repeat else input_hash(entry)
+            if row is None:
+                continue
+            if repeat or row["input_hash"] == hashes[index]:
+                unchanged.add(index)
+            elif row["video_id"]:
+                known_ids[index] = row["video_id"]
+        if seeded:
+            _emit(
+                info(
+                    f"Ledger: {len(unchanged)} entries unchanged since they were seeded, "
+                    f"{len(known_ids)} changed"
+                ),
+                "",
+            )
+
+    def prepare(index: int) -> None:
+        entry = entries[index]
+        if index in unchanged or reasons[index] or index in errors:
+            return
+        try:
+            if entry.get("location") is not None:
+                pins[index] = resolve_pin(client, _or(entry.get("location"), {}), cache)
+        except Exception as e:  # keep the other workers going
+            errors[index] = str(e)
+
+    location_ids: list[str | None] = [None] * total
+    location_lines: dict[int, list[str]] = {}
+
+    def create_cluster_location(members: list[int]) -> None:
+        first = members[0]
+        location_id, lines = create_location(client, _or(entries[first].get("location"), {}), pins[first])
+        for index in members:
+            location_ids[index] = location_id
+        location_lines[first] = lines
+
+    counts = {"created": 0, "updated": 0, "skipped": 0, "filtered": 0, "failed": 0}
+    existing = ExistingVideos(client, workers)
+
+    def seed_one(index: int) -> str:
+        entry = entries[index]
+        prefix = f"[{index + 1}/{total}] {entry.get('title')}... "
+        if index in unchanged:
+            outcome, status, lines = "skipped", f"{YELLOW}already seeded (skipped){NC}", []
+        elif index in errors:
+            outcome, status, lines = "failed", f"{RED}failed ({errors[index]}){NC}", []
+        elif reasons[index]:
+            outcome, status, lines = "filtered", f"{YELLOW}filtered ({reasons[index]}){NC}", []
+        else:
+            try:
+                outcome, status, lines, video_id = create_video(
+                    client, entry, location_ids[index], known_ids.get(index)
+                )
+                if ledger is not None and hashes[index] and outcome != "failed":
+                    if video_id is None and outcome == "skipped":
+                        video_id = existing.get(entry.get("youtubeUrl"))
+                    if video_id:
+                        ledger.record(entry.get("youtubeUrl"), video_id, location_ids[index], hashes[index])
+            except Exception as e:
+                outcome, status, lines = "failed", f"{RED}failed ({e}){NC}", []
+        _emit(prefix + status, *location_lines.get(index, []), *lines)
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(prepare, range(total)))
+
+        located = [i for i in range(total) if pins[i] is not None]
+        if cluster_radius is None:
+            clusters = [[i] for i in located]
+        else:
+            groups = cluster_locations(
+                [_or(entries[i].get("location"), {}) for i in located],
+                [pins[i] for i in located],
+                cluster_radius,
+            )
+            clusters = [[located[k] for k in group] for group in groups]
+            _emit(info(f"Clustered {len(located)} locations into {len(clusters)} distinct places"), "")
+        list(pool.map(create_cluster_location, clusters))
+
+        for outcome in pool.map(seed_one, range(total)):
+            counts[outcome] += 1
+    return counts
+
+
+def verify(client: ApiClient, ledger: SeedLedger, workers: int) -> None:
+    """Reconcile the ledger with the videos the API has.
+
+    Lists every video in pages (fetched concurrently), then removes ledger
+    rows whose video no longer exists, so the next run seeds them again, and
+    fills in video IDs the ledger did not know. Exits the process if the
+    videos cannot be listed.
+    """
+
+    _emit(info("Listing videos from the API..."))
+    try:
+        api_ids = list_videos(client, workers)
+    except RuntimeError as e:
+        _emit(error(str(e)))
+        sys.exit(1)
+
+    seeded = ledger.load()
+    missing = [url for url, row in seeded.items() if row["youtube_id"] not in api_ids]
+    filled = {
+        url: api_ids[row["youtube_id"]]
+        for url, row in seeded.items()
+        if row["youtube_id"] in api_ids and row["video_id"] != api_ids[row["youtube_id"]]
+    }
+    ledger.forget(missing)
+    ledger.set_video_ids(filled)
+
+    ledgered = {row["youtube_id"] for row in seeded.values()}
+    for url in missing[:20]:
+        _emit(warn(f"  Not in the API, will be seeded again: {url}"))
+    if len(missing) > 20:
+        _emit(warn(f"  ... and {len(missing) - 20} more"))
+    _emit(
+        "",
+        "============================================",
+        "  Ledger Verification",
+        "============================================",
+        f"  API videos:  {len(api_ids)}",
+        f"  Ledger:      {len(seeded)}",
+        f"  Confirmed:   {GREEN}{len(seeded) - len(missing)}{NC}",
+        f"  Missing:     {RED}{len(missing)}{NC}",
+        f"  IDs fixed:   {YELLOW}{len(filled)}{NC}",
+        f"  Unledgered:  {len(set(api_ids) - ledgered)}",
+        "============================================",
+    )
+
+
+def print_summary(total: int, counts: dict[str, int]) -> None:
+    updated = [f"  Updated:  {GREEN}{counts['updated']}{NC}"] if counts.get("updated") else []
+    _emit(
+        "",
+        "============================================",
+        "  Seed Summary",
+        "============================================",
+        f"  Total:    {total}",
+        f"  Created:  {GREEN}{counts['created']}{NC}",
+        *updated,
+        f"  Skipped:  {YELLOW}{counts['skipped']}{NC}",
+        f"  Filtered: {YELLOW}{counts['filtered']}{NC}",
+        f"  Failed:   {RED}{counts['failed']}{NC}",
+        "============================================",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Seed videos from a claude_extract.py output file into AccountabilityAtlas.",
+        epilog="Requires ADMIN_EMAIL and ADMIN_PASSWORD; API_URL defaults to " + DEFAULT_API_URL,
+    )
+    parser.add_argument(
+        "--file",
+        type=str,
+        default=str(DEFAULT_INPUT),
+        help="Seed data JSON file (default: seed-data/videos.json).",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Entries seeded concurrently, each over its own keep-alive connection "
+        f"(default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument(
+        "--geocode-cache",
+        type=str,
+        default=str(DEFAULT_GEOCODE_CACHE),
+        metavar="FILE",
+        help="SQLite cache of geocoded addresses, shared across runs "
+        "(default: seed-data/geocode-cache.db).",
+    )
+    parser.add_argument(
+        "--no-geocode-cache",
+        action="store_true",
+        help="Call the geocode endpoint for every entry that needs it.",
+    )
+    parser.add_argument(
+        "--negative-ttl-hours",
+        type=float,
+        default=DEFAULT_NEGATIVE_TTL_HOURS,
+        metavar="HOURS",
+        help="Hours before an address that could not be geocoded is tried again "
+        f"(default: {DEFAULT_NEGATIVE_TTL_HOURS:g}).",
+    )
+    parser.add_argument(
+        "--cluster-radius",
+        type=float,
+        default=DEFAULT_RADIUS_METERS,
+        metavar="METERS",
+        help="Locations whose pins are this close are created once and shared "
+        f"(default: {DEFAULT_RADIUS_METERS:g}).",
+    )
+    parser.add_argument(
+        "--no-location-clustering",
+        action="store_true",
+        help="Create a location per entry and let the API deduplicate them (like seed-videos.sh).",
+    )
+    parser.add_argument(
+        "--ledger",
+        type=str,
+        default=str(DEFAULT_LEDGER),
+        metavar="FILE",
+        help="SQLite ledger of seeded videos; reruns skip unchanged entries and update changed "
+        "ones (default: seed-data/seed-ledger.db).",
+    )
+    parser.add_argument(
+        "--no-ledger",
+        action="store_true",
+        help="Send every entry and let the API skip existing videos (like seed-videos.sh).",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Reconcile the ledger with the videos the API has, then exit without seeding.",
+    )
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+    if args.cluster_radius < 0:
+        parser.error("--cluster-radius cannot be negative.")
+    if args.verify and args.no_ledger:
+        parser.error("--verify cannot be combined with --no-ledger.")
+
+    email = os.environ.get("ADMIN_EMAIL")
+    password = os.environ.get("ADMIN_PASSWORD")
+    api_url = os.environ.get("API_URL", DEFAULT_API_URL)
+    if args.verify:
+        if not email or not password:
+            _emit(error("ADMIN_EMAIL and ADMIN_PASSWORD environment variables are required"))
+            sys.exit(1)
+        ledger = SeedLedger(Path(args.ledger), api_url)
+        try:
+            verify(authenticate(api_url, email, password), ledger, args.workers)
+        finally:
+            ledger.close()
+        return
+
+    input_path = Path(args.file)
+    if not input_path.is_file():
+        _emit(error(f"Input file not found: {input_path}"))
+        sys.exit(1)
+
+    if not email or not password:
+        _emit(error("ADMIN_EMAIL and ADMIN_PASSWORD environment variables are required"))
+        sys.exit(1)
+
+    try:
+        with open(input_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except ValueError as e:
+        _emit(error(f"Failed to parse {input_path}: {e}"))
+        sys.exit(1)
+    if not isinstance(entries, list):
+        _emit(error(f"{input_path} does not contain a JSON array"))
+        sys.exit(1)
+
+    client = authenticate(api_url, email, password)
+
+    cache = None
+    if not args.no_geocode_cache:
+        cache = GeocodeCache(Path(args.geocode_cache), args.negative_ttl_hours)
+    ledger = None if args.no_ledger else SeedLedger(Path(args.ledger), api_url)
+
+    _emit(info(f"Processing {len(entries)} videos from {input_path}..."), "")
+    try:
+        counts = seed(
+            client,
+            entries,
+            args.workers,
+            cache,
+            None if args.no_location_clustering else args.cluster_radius,
+            ledger,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+        if ledger is not None:
+            ledger.close()
+    if cache is not None and (cache.hits or cache.lookups):
+        _emit(
+            "",
+            info(
+                f"Geocode cache: {cache.hits} hit(s) ({cache.negative_hits} negative), "
+                f"{cache.lookups} geocode request(s)"
+            ),
+        )
+    print_summary(len(entries), counts)
+
+    if counts["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()